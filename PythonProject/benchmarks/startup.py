@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+启动性能基准
+测量 `main.py --help` 与命中分析缓存时重新生成的墙钟时间，
+并输出 -X importtime 的导入耗时明细；超出预算时以非零状态退出
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+MAIN = PROJECT_DIR / 'main.py'
+
+# 默认预算 (毫秒)，以中位数比较
+DEFAULT_HELP_BUDGET_MS = 150.0
+DEFAULT_REGENERATE_BUDGET_MS = 400.0
+
+
+def run_command(args: List[str], env: Dict[str, str] = None) -> float:
+  """运行命令并返回耗时 (毫秒)"""
+  start = time.perf_counter()
+  subprocess.run([sys.executable] + args,
+                 cwd=PROJECT_DIR,
+                 env=env,
+                 stdout=subprocess.DEVNULL,
+                 stderr=subprocess.DEVNULL,
+                 check=True)
+  return (time.perf_counter() - start) * 1000
+
+
+def wall_clock(args: List[str], runs: int) -> Dict[str, float]:
+  """多次运行命令，返回耗时统计"""
+  run_command(args)  # 预热文件系统缓存
+  samples = [run_command(args) for _ in range(runs)]
+  return {
+      'median_ms': statistics.median(samples),
+      'min_ms': min(samples),
+      'max_ms': max(samples)
+  }
+
+
+def importtime_breakdown(args: List[str],
+                         top: int = 15) -> List[Tuple[str, int, int]]:
+  """解析 -X importtime 输出，返回耗时最多的顶层导入 (模块, 自身 us, 累计 us)"""
+  result = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                          cwd=PROJECT_DIR,
+                          stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE,
+                          text=True,
+                          check=True)
+  rows = []
+  for line in result.stderr.splitlines():
+    if not line.startswith('import time:') or 'self [us]' in line:
+      continue
+    self_us, cumulative_us, name = line[len('import time:'):].split('|')
+    # 只统计顶层导入（嵌套导入的名称前有额外缩进）
+    if name[1:2] != ' ':
+      rows.append((name.strip(), int(self_us), int(cumulative_us)))
+  rows.sort(key=lambda row: row[2], reverse=True)
+  return rows[:top]
+
+
+def make_project(root: Path) -> Path:
+  """创建用于测量重新生成的小项目及配置文件"""
+  (root / 'pkg').mkdir()
+  (root / 'pkg' / '__init__.py').write_text('"""示例包"""\n', encoding='utf-8')
+  (root / 'setup.py').write_text(
+      'from setuptools import setup\n'
+      'setup(name="startup-bench", description="启动基准示例",\n'
+      '      install_requires=["click>=8.0"])\n',
+      encoding='utf-8')
+  config = {
+      'project_root': str(root),
+      'output_path': str(root / 'README.md'),
+      'cache_dir': str(root / '.readme_cache'),
+      'exclude_files': ['.git', '__pycache__', '.readme_cache']
+  }
+  config_path = root / 'bench-config.json'
+  config_path.write_text(json.dumps(config), encoding='utf-8')
+  return config_path
+
+
+def main(argv: List[str] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--runs', type=int, default=10, help='每个场景的运行次数')
+  parser.add_argument('--help-budget-ms',
+                      type=float,
+                      default=DEFAULT_HELP_BUDGET_MS)
+  parser.add_argument('--regenerate-budget-ms',
+                      type=float,
+                      default=DEFAULT_REGENERATE_BUDGET_MS)
+  parser.add_argument('--json', help='将结果写入 JSON 文件')
+  args = parser.parse_args(argv)
+
+  results = {}
+  with tempfile.TemporaryDirectory() as tmp:
+    config_path = make_project(Path(tmp))
+    scenarios = {
+        'help': ([str(MAIN), '--help'], args.help_budget_ms),
+        'cached_regenerate': ([str(MAIN), '-c',
+                               str(config_path)], args.regenerate_budget_ms)
+    }
+
+    failed = False
+    for name, (command, budget) in scenarios.items():
+      stats = wall_clock(command, args.runs)
+      stats['budget_ms'] = budget
+      stats['imports'] = [{
+          'module': module,
+          'self_us': self_us,
+          'cumulative_us': cumulative_us
+      } for module, self_us, cumulative_us in importtime_breakdown(command)]
+      results[name] = stats
+
+      status = 'OK' if stats['median_ms'] <= budget else 'OVER BUDGET'
+      failed = failed or stats['median_ms'] > budget
+      print(f"{name}: median {stats['median_ms']:.1f} ms "
+            f"(min {stats['min_ms']:.1f}, max {stats['max_ms']:.1f}, "
+            f"budget {budget:.0f}) {status}")
+      for row in stats['imports']:
+        print(f"    {row['cumulative_us'] / 1000:8.1f} ms  {row['module']}")
+
+  if args.json:
+    with open(args.json, 'w', encoding='utf-8') as f:
+      json.dump(results, f, indent=2, ensure_ascii=False)
+
+  return 1 if failed else 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
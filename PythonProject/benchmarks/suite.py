@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+分析与生成性能基准
+在合成项目上分别测量冷启动（空分析缓存与模板缓存）和热启动（缓存已填充）下
+结构树、依赖、入口点、项目信息收集、模板渲染与端到端生成的耗时；
+结果写入 JSON，compare 子命令与基线结果比较并在性能退化时以非零状态退出
+
+  python benchmarks/suite.py run --files 100000 --output current.json
+  python benchmarks/suite.py compare baseline.json current.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import synthetic
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from readme_generator import templates  # noqa: E402
+from readme_generator.config import Config  # noqa: E402
+from readme_generator.core import ReadmeGenerator  # noqa: E402
+
+RESULT_VERSION = 1
+MODES = ('cold', 'warm')
+
+# 默认的退化阈值：中位数相对增长超过 10% 且绝对增长超过 1 毫秒
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+def _structure(generator: ReadmeGenerator) -> Callable[[], Any]:
+  return generator.project_analyzer.get_structure
+
+
+def _dependencies(generator: ReadmeGenerator) -> Callable[[], Any]:
+  return generator.project_analyzer.get_dependencies
+
+
+def _entry_points(generator: ReadmeGenerator) -> Callable[[], Any]:
+  return generator.project_analyzer.get_entry_points
+
+
+def _collect(generator: ReadmeGenerator) -> Callable[[], Any]:
+  return generator._collect_project_info
+
+
+def _render(generator: ReadmeGenerator) -> Callable[[], Any]:
+  project_info = generator._collect_project_info()
+
+  def run():
+    # 冷启动时包括模板编译
+    generator._setup_template_environment()
+    return generator._render(project_info)
+
+  return run
+
+
+def _generate(generator: ReadmeGenerator) -> Callable[[], Any]:
+  config = generator.config
+  return lambda: ReadmeGenerator(config).generate()
+
+
+# 场景名称 -> 准备函数；准备函数不计时，返回计时的调用
+SCENARIOS: Dict[str, Callable[[ReadmeGenerator], Callable[[], Any]]] = {
+    'structure': _structure,
+    'dependencies': _dependencies,
+    'entry_points': _entry_points,
+    'collect': _collect,
+    'render': _render,
+    'generate': _generate
+}
+
+
+def make_config(project: Path, work_dir: Path) -> Config:
+  """基准使用的配置：缓存与输出放在工作目录中，不写入合成项目"""
+  return Config({
+      'project_root': str(project),
+      'output_path': str(work_dir / 'README.md'),
+      'cache_dir': str(work_dir / 'cache'),
+      'template_cache_dir': str(work_dir / 'templates'),
+      'exclude_files': ['.git', '__pycache__', synthetic.MARKER_FILE],
+      'git_auto_detect': False,
+      'deterministic_output': True
+  })
+
+
+def _clear_process_caches():
+  """清空进程内共享的模板缓存，模拟新进程"""
+  templates._ENV_CACHE.clear()
+  templates._TEMPLATE_CACHE.clear()
+
+
+def _timed(call: Callable[[], Any]) -> float:
+  gc.collect()
+  start = time.perf_counter()
+  call()
+  return (time.perf_counter() - start) * 1000
+
+
+def run_scenario(name: str, mode: str, project: Path, runs: int) -> Dict[str, Any]:
+  """运行一个场景，返回耗时统计 (毫秒)
+
+  冷启动的每次运行都使用新的分析缓存、模板字节码缓存与输出文件；
+  热启动先运行一次填充缓存，之后每次运行都创建新的生成器，只复用磁盘缓存。
+  """
+  prepare = SCENARIOS[name]
+  samples: List[float] = []
+  with tempfile.TemporaryDirectory(prefix='readme-bench-') as tmp:
+    work_dir = Path(tmp)
+    if mode == 'warm':
+      prepare(ReadmeGenerator(make_config(project, work_dir)))()
+    for _ in range(runs):
+      if mode == 'cold':
+        shutil.rmtree(work_dir, ignore_errors=True)
+        work_dir.mkdir()
+        _clear_process_caches()
+      call = prepare(ReadmeGenerator(make_config(project, work_dir)))
+      samples.append(_timed(call))
+  _clear_process_caches()
+  return {
+      'median_ms': statistics.median(samples),
+      'min_ms': min(samples),
+      'max_ms': max(samples),
+      'samples_ms': samples
+  }
+
+
+def run(args: argparse.Namespace) -> int:
+  spec = synthetic.spec_from_args(args)
+  scenarios = args.scenario or list(SCENARIOS)
+  modes = [args.mode] if args.mode else list(MODES)
+
+  with tempfile.TemporaryDirectory(prefix='readme-bench-project-') as tmp:
+    project = Path(args.project) if args.project else Path(tmp) / 'project'
+    start = time.perf_counter()
+    try:
+      generated = synthetic.generate_project(project, spec, args.force)
+    except ValueError as e:
+      print(f"错误: {e}", file=sys.stderr)
+      return 1
+    if generated:
+      print(f"已生成合成项目: {project} ({spec['files']} 个文件, "
+            f"{time.perf_counter() - start:.1f} s)")
+
+    results = {}
+    for name in scenarios:
+      for mode in modes:
+        key = f"{name}.{mode}"
+        stats = run_scenario(name, mode, project, args.runs)
+        results[key] = stats
+        print(f"{key:<24} median {stats['median_ms']:10.2f} ms  "
+              f"(min {stats['min_ms']:.2f}, max {stats['max_ms']:.2f})")
+
+  report = {
+      'version': RESULT_VERSION,
+      'meta': {
+          'python': platform.python_version(),
+          'platform': platform.platform(),
+          'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+          'runs': args.runs,
+          'spec': spec
+      },
+      'results': results
+  }
+  if args.output:
+    with open(args.output, 'w', encoding='utf-8') as f:
+      json.dump(report, f, indent=2, ensure_ascii=False)
+
+  if args.baseline:
+    return compare_reports(load_report(args.baseline), report, args.threshold, args.min_delta_ms)
+  return 0
+
+
+def load_report(path: str) -> Dict[str, Any]:
+  with open(path, 'r', encoding='utf-8') as f:
+    report = json.load(f)
+  if report.get('version') != RESULT_VERSION:
+    raise ValueError(f"不支持的结果文件版本: {path}")
+  return report
+
+
+def compare_reports(baseline: Dict[str, Any],
+                    current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD,
+                    min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> int:
+  """按中位数比较两次结果，打印对比表；存在退化时返回 1"""
+  if baseline['meta'].get('spec') != current['meta'].get('spec'):
+    print("警告: 两次结果的合成项目参数不同，对比可能没有意义")
+
+  regressions = []
+  for key, stats in current['results'].items():
+    base = baseline['results'].get(key)
+    if base is None:
+      print(f"{key:<24} {'-':>12} {stats['median_ms']:12.2f} ms  (基线中没有)")
+      continue
+    old, new = base['median_ms'], stats['median_ms']
+    change = (new - old) / old if old else 0.0
+    regressed = new - old > min_delta_ms and change > threshold
+    status = '退化' if regressed else ('改进' if old - new > min_delta_ms and -change > threshold
+                                       else '')
+    print(f"{key:<24} {old:12.2f} {new:12.2f} ms  {change:+7.1%}  {status}")
+    if regressed:
+      regressions.append(key)
+
+  if regressions:
+    print(f"性能退化 ({len(regressions)} 项): {', '.join(regressions)}")
+    return 1
+  print("没有性能退化")
+  return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+  try:
+    baseline, current = load_report(args.baseline), load_report(args.current)
+  except (OSError, ValueError) as e:
+    print(f"错误: {e}", file=sys.stderr)
+    return 1
+  return compare_reports(baseline, current, args.threshold, args.min_delta_ms)
+
+
+def _add_threshold_arguments(parser: argparse.ArgumentParser):
+  parser.add_argument('--threshold',
+                      type=float,
+                      default=DEFAULT_THRESHOLD,
+                      help='判定退化的中位数相对增长 (默认 0.10)')
+  parser.add_argument('--min-delta-ms',
+                      type=float,
+                      default=DEFAULT_MIN_DELTA_MS,
+                      help='判定退化的最小绝对增长 (毫秒，默认 1.0)')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__,
+                                   formatter_class=argparse.RawDescriptionHelpFormatter)
+  subparsers = parser.add_subparsers(dest='command', required=True)
+
+  run_parser = subparsers.add_parser('run', help='运行基准')
+  run_parser.add_argument('--scenario',
+                          action='append',
+                          choices=list(SCENARIOS),
+                          help='只运行指定场景（可重复）')
+  run_parser.add_argument('--mode', choices=MODES, help='只运行冷启动或热启动')
+  run_parser.add_argument('--runs', type=int, default=5, help='每个场景的运行次数')
+  run_parser.add_argument('--project', help='合成项目目录（参数一致时复用，默认使用临时目录）')
+  run_parser.add_argument('--force', action='store_true', help='合成项目参数不同时重新生成')
+  run_parser.add_argument('--output', help='将结果写入 JSON 文件')
+  run_parser.add_argument('--baseline', help='运行后与基线结果比较')
+  synthetic.add_spec_arguments(run_parser)
+  _add_threshold_arguments(run_parser)
+  run_parser.set_defaults(func=run)
+
+  compare_parser = subparsers.add_parser('compare', help='与基线结果比较')
+  compare_parser.add_argument('baseline', help='基线结果 JSON')
+  compare_parser.add_argument('current', help='当前结果 JSON')
+  _add_threshold_arguments(compare_parser)
+  compare_parser.set_defaults(func=compare)
+
+  args = parser.parse_args(argv)
+  return args.func(args)
+
+
+if __name__ == '__main__':
+  sys.exit(main())
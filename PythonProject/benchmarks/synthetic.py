@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+合成项目生成器
+按给定的文件数、目录深度、扇出、清单大小与源文件大小生成确定性的大型项目，
+相同参数总是生成相同的目录与文件内容（最多支持百万级文件）
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+# 记录生成参数的标记文件；参数一致时直接复用已生成的项目
+MARKER_FILE = '.synthetic.json'
+GENERATOR_VERSION = 1
+
+DEFAULT_SPEC = {
+    'files': 1000,
+    'depth': 4,
+    'fanout': 8,
+    'dependencies': 50,
+    'lock_packages': 200,
+    'file_size': 2048,
+    'seed': 0
+}
+
+# 源文件扩展名及权重
+EXTENSION_WEIGHTS = [('.py', 6), ('.md', 1), ('.txt', 1), ('.js', 1), ('.json', 1)]
+
+
+def make_spec(**overrides: Any) -> Dict[str, int]:
+  """合并默认参数，返回完整的生成参数"""
+  spec = dict(DEFAULT_SPEC)
+  for key, value in overrides.items():
+    if key not in spec:
+      raise ValueError(f"未知的生成参数: {key}")
+    if value is not None:
+      spec[key] = int(value)
+  if spec['files'] < 0 or spec['depth'] < 0 or spec['fanout'] < 1:
+    raise ValueError(f"生成参数无效: {spec}")
+  return spec
+
+
+def iter_directories(depth: int, fanout: int) -> Iterator[str]:
+  """按广度优先顺序返回相对目录路径（不含根目录）"""
+  level = ['']
+  for d in range(depth):
+    next_level = []
+    for parent in level:
+      for i in range(fanout):
+        path = os.path.join(parent, f"pkg_{d}_{i}")
+        next_level.append(path)
+        yield path
+    level = next_level
+
+
+def _body(extension: str, size: int) -> str:
+  """生成至少 size 字节的文件主体，按行截断时保证语法完整"""
+  lines: List[str] = []
+  total = 0
+  i = 0
+  while total < size:
+    if extension == '.py':
+      block = (f"def function_{i}(value):\n"
+               f"  \"\"\"返回 value 与 {i} 的和\"\"\"\n"
+               f"  return value + {i}\n\n\n")
+    elif extension == '.md':
+      block = f"## 第 {i} 节\n\n示例文档内容，用于基准测试。\n\n"
+    elif extension == '.js':
+      block = f"function f{i}(x) {{\n  return x + {i};\n}}\n\n"
+    elif extension == '.json':
+      block = f"  \"key_{i}\": {i},\n"
+    else:
+      block = f"第 {i} 行示例文本 lorem ipsum dolor sit amet\n"
+    lines.append(block)
+    total += len(block.encode('utf-8'))
+    i += 1
+  return ''.join(lines)
+
+
+class _Contents:
+  """按扩展名预先生成文件主体，每个文件截取不同长度，避免逐文件构造内容"""
+
+  def __init__(self, file_size: int):
+    self.file_size = file_size
+    self.bodies = {ext: _body(ext, file_size * 2) for ext, _ in EXTENSION_WEIGHTS}
+
+  def content(self, extension: str, index: int, size: int) -> str:
+    body = self.bodies[extension]
+    cut = body.rfind('\n', 0, size)
+    body = body[:cut + 1] if cut >= 0 else ''
+    if extension == '.py':
+      return f'"""合成模块 {index}"""\n\n' + body
+    if extension == '.json':
+      return '{\n' + body + f'  "index": {index}\n}}\n'
+    return f"# {index}\n" + body
+
+
+def write_manifests(root: Path, spec: Dict[str, int], rng: random.Random):
+  """生成 setup.py、requirements 文件、pyproject.toml 与 poetry.lock"""
+  names = [f"package-{i:05d}" for i in range(spec['dependencies'])]
+  half = len(names) // 2
+  specs = [f"{name}>={rng.randint(0, 9)}.{rng.randint(0, 20)}" for name in names]
+
+  (root / 'setup.py').write_text(
+      'from setuptools import setup, find_packages\n\n'
+      'with open("requirements.txt") as fh:\n'
+      '    requirements = [line.strip() for line in fh if line.strip()]\n\n'
+      'setup(\n'
+      '    name="synthetic-project",\n'
+      '    version="0.1.0",\n'
+      '    description="基准测试用的合成项目",\n'
+      '    packages=find_packages(),\n'
+      '    install_requires=requirements,\n'
+      ')\n',
+      encoding='utf-8')
+  (root / 'requirements.txt').write_text(
+      '-r requirements-dev.txt\n' + ''.join(f"{s}\n" for s in specs[:half]), encoding='utf-8')
+  (root / 'requirements-dev.txt').write_text(''.join(f"{s}\n" for s in specs[half:]),
+                                             encoding='utf-8')
+  (root / 'pyproject.toml').write_text(
+      '[project]\n'
+      'name = "synthetic-project"\n'
+      'version = "0.1.0"\n'
+      'description = "基准测试用的合成项目"\n'
+      'dependencies = [\n' + ''.join(f'  "{s}",\n' for s in specs) + ']\n',
+      encoding='utf-8')
+
+  with open(root / 'poetry.lock', 'w', encoding='utf-8') as f:
+    for i in range(spec['lock_packages']):
+      name = names[i] if i < len(names) else f"transitive-{i:06d}"
+      f.write('[[package]]\n'
+              f'name = "{name}"\n'
+              f'version = "{rng.randint(0, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 50)}"\n'
+              'description = ""\n'
+              'optional = false\n'
+              'python-versions = ">=3.8"\n\n')
+
+  (root / 'main.py').write_text('"""合成项目入口"""\n\n\ndef main():\n  pass\n', encoding='utf-8')
+
+
+def generate_project(root: Path, spec: Dict[str, int], force: bool = False) -> bool:
+  """在 root 下生成合成项目；参数与已生成的项目一致时直接复用
+
+  返回是否重新生成。root 已存在且不是合成项目时抛出 ValueError，
+  参数不一致时需要 force 才会删除重新生成。
+  """
+  root = Path(root)
+  marker = root / MARKER_FILE
+  expected = {'version': GENERATOR_VERSION, 'spec': spec}
+  if marker.is_file():
+    try:
+      current = json.loads(marker.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+      current = None
+    if current == expected:
+      return False
+    if not force:
+      raise ValueError(f"{root} 中的合成项目参数不同，使用 --force 重新生成")
+    shutil.rmtree(root)
+  elif root.exists() and any(root.iterdir()):
+    raise ValueError(f"{root} 不是空目录，也不是合成项目")
+
+  root.mkdir(parents=True, exist_ok=True)
+  rng = random.Random(spec['seed'])
+  write_manifests(root, spec, rng)
+
+  directories = list(iter_directories(spec['depth'], spec['fanout'])) or ['']
+  created = set()
+  contents = _Contents(spec['file_size'])
+  extensions = [ext for ext, weight in EXTENSION_WEIGHTS for _ in range(weight)]
+  low, high = spec['file_size'] // 2, spec['file_size'] * 3 // 2
+  for index in range(spec['files']):
+    # 文件按轮转方式分配到各目录
+    directory = directories[index % len(directories)]
+    if directory not in created:
+      os.makedirs(root / directory, exist_ok=True)
+      created.add(directory)
+    extension = extensions[rng.randrange(len(extensions))]
+    path = os.path.join(root, directory, f"module_{index:07d}{extension}")
+    with open(path, 'w', encoding='utf-8') as f:
+      f.write(contents.content(extension, index, rng.randint(low, high)))
+
+  # 最后写入标记，生成中断时下次会重新生成
+  marker.write_text(json.dumps(expected, indent=2), encoding='utf-8')
+  return True
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+  """添加生成参数的命令行选项（供基准脚本复用）"""
+  parser.add_argument('--files', type=int, help=f"源文件数量 (默认 {DEFAULT_SPEC['files']})")
+  parser.add_argument('--depth', type=int, help=f"目录深度 (默认 {DEFAULT_SPEC['depth']})")
+  parser.add_argument('--fanout', type=int, help=f"每个目录的子目录数 (默认 {DEFAULT_SPEC['fanout']})")
+  parser.add_argument('--dependencies',
+                      type=int,
+                      help=f"清单中的依赖数量 (默认 {DEFAULT_SPEC['dependencies']})")
+  parser.add_argument('--lock-packages',
+                      type=int,
+                      help=f"poetry.lock 中的包数量 (默认 {DEFAULT_SPEC['lock_packages']})")
+  parser.add_argument('--file-size',
+                      type=int,
+                      help=f"源文件的平均字节数 (默认 {DEFAULT_SPEC['file_size']})")
+  parser.add_argument('--seed', type=int, help='随机种子 (默认 0)')
+
+
+def spec_from_args(args: argparse.Namespace) -> Dict[str, int]:
+  return make_spec(files=args.files,
+                   depth=args.depth,
+                   fanout=args.fanout,
+                   dependencies=args.dependencies,
+                   lock_packages=args.lock_packages,
+                   file_size=args.file_size,
+                   seed=args.seed)
+
+
+def main(argv: List[str] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('output', help='生成项目的目录')
+  parser.add_argument('--force', action='store_true', help='参数不同时删除并重新生成')
+  add_spec_arguments(parser)
+  args = parser.parse_args(argv)
+
+  spec = spec_from_args(args)
+  try:
+    generated = generate_project(Path(args.output), spec, args.force)
+  except ValueError as e:
+    print(f"错误: {e}", file=sys.stderr)
+    return 1
+  print(f"{'已生成' if generated else '已存在'}: {args.output} ({spec['files']} 个文件)")
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
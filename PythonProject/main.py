@@ -5,20 +5,88 @@ README 自动生成工具
 """
 
 import logging
+import os
+import re
+import sys
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.logging import RichHandler
 
-from readme_generator.config import Config
-from readme_generator.core import ReadmeGenerator
-from readme_generator.utils import setup_logging
+# 为加快启动（包括 --help），生成器、jinja2、rich 等模块只在实际使用时导入
 
-console = Console()
 
+class PlainConsole:
+  """非终端输出时使用的控制台，去掉 rich 标记后输出纯文本"""
 
-@click.command()
+  _MARKUP = re.compile(r'\[/?(?:red|green|yellow|blue|bold)\]')
+
+  def print(self, text='', markup: bool = True):
+    text = str(text)
+    if markup:
+      text = self._MARKUP.sub('', text)
+    click.echo(text)
+
+
+_console = None
+
+# 对所有子命令都有效的公共选项
+COMMON_OPTIONS = ('verbose', 'timings', 'trace', 'memory_report')
+
+# 写在 batch 子命令之前时转交给 batch 的生成选项，其余生成选项不适用于子命令
+BATCH_OPTIONS = ('config', 'output', 'template', 'deterministic', 'walk_workers', 'cache_dir',
+                 'no_cache', 'max_memory')
+
+
+def apply_options(app_config,
+                  output=None,
+                  template=None,
+                  deterministic=False,
+                  walk_workers=None,
+                  cache_dir=None,
+                  no_cache=False,
+                  max_memory=None):
+  """用命令行选项覆盖配置文件中的设置"""
+  # 设置输出路径
+  if output:
+    app_config.output_path = Path(output)
+
+  # 设置自定义模板
+  if template:
+    app_config.template_path = Path(template)
+
+  if deterministic:
+    app_config.deterministic_output = True
+
+  # 设置并行遍历
+  if walk_workers is not None:
+    app_config.walk_workers = walk_workers
+
+  # 设置分析缓存
+  if cache_dir:
+    app_config.cache_dir = Path(cache_dir)
+  if no_cache:
+    app_config.cache_dir = None
+
+  if max_memory is not None:
+    app_config.max_memory_mb = max_memory
+
+
+def get_console():
+  """获取控制台：交互式终端使用 rich，否则使用纯文本输出"""
+  global _console
+  if _console is None:
+    if sys.stdout.isatty():
+      try:
+        from rich.console import Console
+        _console = Console()
+      except ImportError:
+        _console = PlainConsole()
+    else:
+      _console = PlainConsole()
+  return _console
+
+
+@click.group(invoke_without_command=True)
 @click.option('--config',
               '-c',
               type=click.Path(exists=True),
@@ -33,36 +101,109 @@ console = Console()
               help='自定义模板文件路径')
 @click.option('--verbose', '-v', is_flag=True, help='详细输出模式')
 @click.option('--dry-run', is_flag=True, help='仅预览，不实际生成文件')
-def main(config, output, template, verbose, dry_run):
+@click.option('--check',
+              is_flag=True,
+              help='只检查 README 是否为最新 (不渲染、不写入)，过期时以状态码 1 退出')
+@click.option('--deterministic',
+              is_flag=True,
+              help='确定性输出 (生成时间取自 SOURCE_DATE_EPOCH)')
+@click.option('--full',
+              is_flag=True,
+              help='重新生成全部章节 (启用 incremental_sections 时默认只更新输入变化的章节；'
+              '章节之外手写的内容总是保留，也用于覆盖没有章节标记的手写 README)')
+@click.option('--walk-workers',
+              type=click.IntRange(min=0),
+              help='并行遍历目录的线程数 (默认: 0，串行)')
+@click.option('--cache-dir',
+              type=click.Path(file_okay=False),
+              help='分析缓存目录 (未变化的项目只需 stat 文件即可重新渲染)')
+@click.option('--no-cache', is_flag=True, help='禁用分析缓存')
+@click.option('--watch',
+              is_flag=True,
+              help='监视项目目录，变化后增量重新生成 README')
+@click.option('--debounce',
+              type=click.FloatRange(min=0),
+              default=0.5,
+              show_default=True,
+              help='监视模式下的防抖时间 (秒)')
+@click.option('--timings',
+              is_flag=True,
+              help='结束时向标准错误输出各阶段耗时汇总 (也适用于子命令)')
+@click.option('--trace',
+              type=click.Path(dir_okay=False),
+              help='将各阶段耗时写入 Chrome trace 文件 (chrome://tracing 或 Perfetto 打开)；'
+              '设置 README_GEN_TRACE 环境变量时追加到该文件')
+@click.option('--memory-report',
+              is_flag=True,
+              help='用 tracemalloc 统计各阶段的内存分配峰值，结束时输出到标准错误 (会明显变慢)')
+@click.option('--max-memory',
+              type=click.FloatRange(min=0),
+              help='低内存模式的内存上限 (MB)：结构树与统计的文件列表超出后溢出到临时文件')
+@click.pass_context
+def main(ctx, config, output, template, verbose, dry_run, check, deterministic,
+         full, walk_workers, cache_dir, no_cache, watch, debounce, timings, trace,
+         memory_report, max_memory):
   """README 自动生成工具"""
+  from readme_generator import timing
+  from readme_generator.utils import setup_logging
 
   # 设置日志
   setup_logging(verbose)
   logger = logging.getLogger(__name__)
 
+  # 耗时统计：命令结束（包括出错退出）时输出汇总与 trace
+  append = trace is None
+  trace = trace or os.environ.get(timing.TRACE_ENV)
+  if timings or trace or memory_report:
+    command = ctx.invoked_subcommand or 'generate'
+    timing.enable(f"readme-gen {command}", memory=memory_report)
+    ctx.call_on_close(lambda: timing.finish(timings, trace, append, memory_report))
+    ctx.with_resource(timing.span(command))
+
+  # 执行子命令时只处理公共选项；写在子命令之前的生成选项转交给 batch，其他子命令报错
+  if ctx.invoked_subcommand is not None:
+    given = [
+        name for name in ctx.params
+        if name not in COMMON_OPTIONS and
+        ctx.get_parameter_source(name) == click.core.ParameterSource.COMMANDLINE
+    ]
+    allowed = BATCH_OPTIONS if ctx.invoked_subcommand == 'batch' else ()
+    rejected = [name for name in given if name not in allowed]
+    if rejected:
+      options = ', '.join(f"--{name.replace('_', '-')}" for name in rejected)
+      raise click.UsageError(f"选项 {options} 不适用于子命令 {ctx.invoked_subcommand}")
+    ctx.obj = {name: ctx.params[name] for name in given}
+    return
+
+  from readme_generator.config import Config
+  from readme_generator.core import ReadmeGenerator
+
+  console = get_console()
   try:
     # 加载配置
     config_path = config or 'config.yaml'
     app_config = Config.load(config_path)
-
-    # 设置输出路径
-    if output:
-      app_config.output_path = Path(output)
-
-    # 设置自定义模板
-    if template:
-      app_config.template_path = Path(template)
+    apply_options(app_config, output, template, deterministic, walk_workers, cache_dir, no_cache,
+                  max_memory)
 
     # 创建生成器
     generator = ReadmeGenerator(app_config)
 
-    if dry_run:
+    if check:
+      up_to_date = generator.check()
+    elif watch:
+      from readme_generator.watch import ProjectWatcher
+      console.print(
+          f"[blue]👀 监视模式 - 正在监视 {app_config.project_root} (Ctrl+C 退出)[/blue]"
+      )
+      ProjectWatcher(generator, debounce=debounce).run()
+    elif dry_run:
       console.print("[yellow]🔍 预览模式 - 不会生成实际文件[/yellow]")
-      preview = generator.preview()
-      console.print(preview)
+      # 逐块输出到标准输出，不在内存中拼接整个文档
+      generator.preview_stream(click.get_text_stream('stdout'))
     else:
       # 生成 README
-      output_file = generator.generate()
+      output_file = generator.generate(full=full)
       console.print(f"[green]✅ README 已成功生成: {output_file}[/green]")
 
   except Exception as e:
@@ -70,7 +211,249 @@ def main(config, output, template, verbose, dry_run):
     console.print(f"[red]❌ 错误: {e}[/red]")
     raise click.Abort()
 
+  if check:
+    if up_to_date:
+      console.print(f"[green]✅ README 已是最新: {app_config.output_path}[/green]")
+    else:
+      console.print(f"[yellow]⚠️ README 已过期: {app_config.output_path}[/yellow]")
+      sys.exit(1)
+
+
+@main.command()
+@click.argument('targets', nargs=-1, required=True)
+@click.option('--config',
+              '-c',
+              type=click.Path(exists=True),
+              help='所有项目共用的配置文件路径')
+@click.option('--workers',
+              '-j',
+              type=click.IntRange(min=1),
+              help='工作进程数 (默认: CPU 核心数)')
+@click.option('--max-depth',
+              type=click.IntRange(min=0),
+              default=4,
+              show_default=True,
+              help='自动发现子项目时的最大目录深度')
+@click.pass_context
+def batch(ctx, targets, config, workers, max_depth):
+  """批量生成 README
+
+  TARGETS 可以是目录（自动发现包含 setup.py 或 pyproject.toml 的子项目）、
+  每行一个项目路径的列表文件，或 glob 模式。
+  写在 batch 之前的 --config、--output、--template 等生成选项同样适用于每个项目。
+  """
+  from readme_generator.batch import generate_many, resolve_targets
+  from readme_generator.config import Config
+
+  console = get_console()
+  options = dict(ctx.obj or {})
+  # batch 自身的 --config 优先
+  config = options.pop('config', None) if config is None else config
+  app_config = Config.load(config) if config else Config()
+  apply_options(app_config, **options)
+  projects = resolve_targets(targets, max_depth)
+  if not projects:
+    console.print("[yellow]⚠️ 未找到任何项目[/yellow]")
+    return
+
+  console.print(f"[blue]📦 共发现 {len(projects)} 个项目[/blue]")
+  results = generate_many(projects, app_config, workers)
+
+  if isinstance(console, PlainConsole):
+    for result in results:
+      status = "成功" if result['success'] else f"失败: {result['error']}"
+      console.print(
+          f"{result['project']}\t{status}\t{result['duration']:.2f}s",
+          markup=False)
+  else:
+    from rich.table import Table
+    table = Table(title="批量生成结果")
+    table.add_column("项目")
+    table.add_column("状态")
+    table.add_column("耗时", justify="right")
+    for result in results:
+      status = "[green]成功[/green]" if result['success'] else \
+          f"[red]失败: {result['error']}[/red]"
+      table.add_row(result['project'], status, f"{result['duration']:.2f}s")
+    console.print(table)
+
+  failed = sum(1 for result in results if not result['success'])
+  total_time = sum(result['duration'] for result in results)
+  console.print(f"成功 {len(results) - failed} 个，失败 {failed} 个，"
+                f"累计耗时 {total_time:.2f}s")
+  if failed:
+    raise SystemExit(1)
+
+
+@main.command()
+@click.argument('directory',
+                type=click.Path(exists=True, file_okay=False),
+                default='.')
+@click.option('--output',
+              '-o',
+              type=click.Path(dir_okay=False),
+              help='报告输出文件 (默认: 标准输出)')
+@click.option('--max-depth',
+              type=click.IntRange(min=0),
+              default=3,
+              show_default=True,
+              help='目录结构的最大深度')
+@click.option('--max-entries',
+              type=click.IntRange(min=0),
+              default=50,
+              show_default=True,
+              help='每个目录最多列出的条目数 (0 表示不限制)')
+@click.option('--walk-workers',
+              type=click.IntRange(min=0),
+              default=0,
+              help='并行遍历目录的线程数 (默认: 0，串行)')
+def analyze(directory, output, max_depth, max_entries, walk_workers):
+  """生成项目分析报告
+
+  报告包含目录结构、文件类型统计、重要文件与主要编程语言，
+  所有部分只遍历一次 DIRECTORY，供 run.sh 作为 Ollama 的输入。
+  """
+  from readme_generator.analyze import analyze_project
+
+  report = analyze_project(directory, max_depth, max_entries or None,
+                           walk_workers)
+  if output:
+    with open(output, 'w', encoding='utf-8') as f:
+      f.write(report)
+  else:
+    click.echo(report, nl=False)
+
+
+@main.command()
+@click.argument('directory',
+                type=click.Path(exists=True, file_okay=False),
+                default='.')
+@click.option('--config',
+              '-c',
+              type=click.Path(exists=True),
+              help='配置文件路径 (读取 ollama_* / llm_* 配置)')
+@click.option('--analysis',
+              '-a',
+              type=click.Path(exists=True, dir_okay=False),
+              help='已生成的项目分析报告 (默认: 运行 analyze 生成)')
+@click.option('--output',
+              '-o',
+              type=click.Path(dir_okay=False),
+              help='输出 README 文件路径 (默认: <DIRECTORY>/README.md)')
+@click.option('--model', '-m', help='Ollama 模型 (默认: qwen3:8b)')
+@click.option('--host', help='Ollama 服务地址 (默认: OLLAMA_HOST 或本机 11434 端口)')
+@click.option('--lang',
+              '-l',
+              type=click.Choice(['english', 'chinese']),
+              default='english',
+              show_default=True,
+              help='显示在前面的语言')
+@click.option('--concurrency',
+              '-j',
+              type=click.IntRange(min=1),
+              help='同时生成的语言数 (默认: 2)')
+@click.option('--timeout',
+              type=click.FloatRange(min=1),
+              help='单次生成的超时时间，秒 (默认: 600)')
+@click.option('--retries',
+              type=click.IntRange(min=0),
+              help='请求失败时的重试次数 (默认: 2)')
+@click.option('--token-budget',
+              type=click.IntRange(min=0),
+              help='提示词的 token 预算，超出时压缩分析报告 (默认: 3000，0 表示不限制)')
+@click.option('--cache-dir',
+              type=click.Path(file_okay=False),
+              help='生成结果缓存目录 (默认: ~/.cache/readme-generator/llm)')
+@click.option('--no-cache', is_flag=True, help='不读取也不写入生成结果缓存')
+@click.option('--refresh', is_flag=True, help='忽略已缓存的结果重新生成，并更新缓存')
+@click.option('--full',
+              is_flag=True,
+              help='完整重新生成 README (默认只重新生成依赖的分析内容有变化的章节)')
+def llm(directory, config, analysis, output, model, host, lang, concurrency,
+        timeout, retries, token_budget, cache_dir, no_cache, refresh, full):
+  """使用 Ollama 生成双语 README
+
+  两种语言的生成并发提交到 Ollama，所有请求共用一个保持连接的连接池。
+  生成结果按模型、提示词与生成参数缓存，分析报告未变化时直接复用，不请求 Ollama。
+  现有的 README 带有章节标记时只重新生成变化的章节，保留章节之外手写的内容。
+  """
+  from readme_generator.cache import ResponseCache
+  from readme_generator.config import Config
+  from readme_generator.llm import OllamaClient, OllamaError, default_cache_dir, generate_readme
+  from readme_generator.output import write_output
+
+  console = get_console()
+  app_config = Config.load(config) if config else Config()
+  if analysis:
+    with open(analysis, 'r', encoding='utf-8') as f:
+      report = f.read()
+  else:
+    from readme_generator.analyze import analyze_project
+    report = analyze_project(directory)
+
+  concurrency = concurrency or app_config.llm_concurrency
+  client = OllamaClient(model=model or app_config.ollama_model,
+                        host=host or app_config.ollama_host or None,
+                        timeout=timeout or app_config.llm_timeout,
+                        retries=app_config.llm_retries
+                        if retries is None else retries,
+                        pool_size=concurrency)
+  cache = None
+  if not no_cache:
+    ttl_days = app_config.llm_cache_ttl_days
+    cache = ResponseCache(
+        Path(cache_dir) if cache_dir else app_config.llm_cache_dir or
+        default_cache_dir(), int(app_config.llm_cache_max_mb * 1024 * 1024),
+        ttl_days * 86400 if ttl_days else None)
+
+  output_path = Path(output) if output else Path(directory) / 'README.md'
+  existing = None
+  if not full:
+    try:
+      existing = output_path.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+      pass
+
+  try:
+    with client:
+      content, _ = generate_readme(report,
+                                   client,
+                                   lang,
+                                   concurrency,
+                                   cache=cache,
+                                   refresh=refresh,
+                                   token_budget=app_config.llm_token_budget
+                                   if token_budget is None else token_budget,
+                                   existing=existing)
+  except OllamaError as e:
+    console.print(f"[red]❌ 错误: {e}[/red]")
+    raise SystemExit(1)
+
+  if content == existing:
+    console.print(f"[green]✅ README 已是最新: {output_path}[/green]")
+    return
+  write_output(output_path, content)
+  console.print(f"[green]✅ 双语 README 已生成: {output_path}[/green]")
+
+
+@main.command('compile-templates')
+@click.argument('templates', nargs=-1, type=click.Path(exists=True))
+@click.option('--cache-dir',
+              type=click.Path(file_okay=False),
+              help='字节码缓存目录 (默认: Jinja2 默认的临时目录)')
+def compile_templates_command(templates, cache_dir):
+  """预编译模板到字节码缓存
+
+  默认模板总会被编译；TEMPLATES 可以是模板文件或模板目录。
+  """
+  from readme_generator.templates import compile_templates
+
+  compiled = compile_templates([Path(t) for t in templates],
+                               Path(cache_dir) if cache_dir else None)
+  console = get_console()
+  for name in compiled:
+    console.print(f"[green]✅ {name}[/green]")
+
 
 if __name__ == '__main__':
   main()
-  main()
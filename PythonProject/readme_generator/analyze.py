@@ -0,0 +1,185 @@
+"""
+项目分析报告模块
+生成 run.sh 交给 Ollama 的项目分析报告（目录结构、文件类型、重要文件、编程语言），
+所有部分共用 ProjectAnalyzer 的一次目录遍历，不再调用 find、tree、sort 等外部命令
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .timing import span
+from .utils import LANGUAGE_EXTENSIONS, ProjectAnalyzer, StatisticsCollector
+from .walker import DEFAULT_COLLAPSE_PATTERNS, DirectoryTree, entry_is_dir
+
+# 与 run.sh 中 tree -I 的排除项一致
+ANALYZE_EXCLUDE = ['.git', 'node_modules', '__pycache__', '.DS_Store', '.env']
+
+# 根目录下需要列出的配置与入口文件
+IMPORTANT_FILES = [
+    "README.md", "readme.md", "README.txt",
+    "package.json", "requirements.txt", "Pipfile", "poetry.lock",
+    "Dockerfile", "docker-compose.yml", "docker-compose.yaml",
+    "Makefile", "CMakeLists.txt", "build.gradle", "pom.xml",
+    "tsconfig.json", "webpack.config.js", "vite.config.js",
+    "go.mod", "Cargo.toml", "composer.json",
+    "Podfile", "Podfile.lock", "Package.swift", "Cartfile", "Cartfile.resolved",
+    "Info.plist", "AppDelegate.swift", "SceneDelegate.swift",
+    ".gitignore", "LICENSE", "CHANGELOG.md",
+    "main.py", "app.py", "index.js", "main.js", "index.html"
+]  # yapf: disable
+
+# Xcode 项目目录的后缀
+XCODE_SUFFIXES = ('.xcodeproj', '.xcworkspace')
+
+# 可能的入口文件的扩展名
+ENTRY_EXTENSIONS = {
+    '.py', '.js', '.ts', '.go', '.java', '.cpp', '.c', '.swift', '.m', '.mm'
+}
+
+# 各部分列出的条目数
+MAX_FILE_TYPES = 20
+MAX_LANGUAGES = 5
+MAX_ENTRY_FILES = 10
+
+
+class AnalysisReport:
+  """项目分析报告"""
+
+  def __init__(self,
+               project_root,
+               max_depth: int = 3,
+               max_entries: Optional[int] = None,
+               walk_workers: int = 0):
+    self.project_root = Path(project_root)
+    self.analyzer = ProjectAnalyzer(self.project_root.resolve(),
+                                    ANALYZE_EXCLUDE,
+                                    walk_workers,
+                                    max_depth=max_depth,
+                                    max_entries=max_entries,
+                                    collapse_patterns=DEFAULT_COLLAPSE_PATTERNS)
+    self.statistics = StatisticsCollector()
+    self.tree: Optional[DirectoryTree] = None
+
+  def scan(self) -> DirectoryTree:
+    """遍历项目目录，同时收集文件统计（只遍历一次）"""
+    if self.tree is None:
+      self.tree = self.analyzer.scan(statistics=self.statistics)
+    return self.tree
+
+  def directory_structure(self) -> List[str]:
+    lines = ["目录结构:"]
+    lines.append(self.analyzer.get_structure(tree=self.scan()))
+    return lines
+
+  def file_types(self) -> List[str]:
+    self.scan()
+    lines = ["文件类型统计:"]
+    extensions = sorted(self.statistics.extensions.items(),
+                        key=lambda item: (-item[1][0], item[0]))
+    if not extensions:
+      lines.append("  - 未找到文件")
+    for ext, (files, _) in extensions[:MAX_FILE_TYPES]:
+      if ext:
+        lines.append(f"  {ext}: {files} 个文件")
+      else:
+        lines.append(f"  无扩展名: {files} 个文件")
+    return lines
+
+  def important_files(self) -> List[str]:
+    tree = self.scan()
+    lines = ["重要文件:"]
+    if tree.complete:
+      root_files = {
+          entry.name for entry in tree.entries if not entry_is_dir(entry)
+      }
+      root_dirs = [entry.name for entry in tree.entries if entry_is_dir(entry)]
+    else:
+      # 根目录条目超出上限时 tree 中的名称不完整，回退到逐个检查
+      root_files = {
+          name for name in IMPORTANT_FILES
+          if (self.project_root / name).is_file()
+      }
+      root_dirs = sorted(
+          entry.name for entry in os.scandir(self.project_root)
+          if entry.name.endswith(XCODE_SUFFIXES) and entry_is_dir(entry))
+
+    found = [name for name in IMPORTANT_FILES if name in root_files]
+    xcode_projects = [
+        name for suffix in XCODE_SUFFIXES for name in root_dirs
+        if name.endswith(suffix)
+    ]
+    lines.extend(f"  - {name}" for name in found + xcode_projects)
+    if xcode_projects:
+      lines.append("  iOS/macOS 项目类型: Xcode 项目")
+    if not found and not xcode_projects:
+      lines.append("  - 未找到标准配置文件")
+
+    lines.append("  其他可能的入口文件:")
+    entry_files = []
+    for name in self._entry_files(tree, 0):
+      entry_files.append(name)
+      if len(entry_files) >= MAX_ENTRY_FILES:
+        break
+    if entry_files:
+      lines.extend(f"    - {name}" for name in entry_files)
+    else:
+      lines.append("    - 未找到明显的入口文件")
+    return lines
+
+  def _entry_files(self, node: DirectoryTree, depth: int) -> Iterator[str]:
+    """根目录及其直接子目录中的源代码文件"""
+    for entry in node.entries:
+      child = node.children.get(entry.name)
+      if child is not None:
+        if depth < 1 and not child.collapsed:
+          yield from self._entry_files(child, depth + 1)
+      elif not entry_is_dir(entry) and os.path.splitext(
+          entry.name)[1].lower() in ENTRY_EXTENSIONS:
+        yield entry.name
+
+  def languages(self) -> List[str]:
+    self.scan()
+    lines = ["主要编程语言:"]
+    counts = {}
+    for ext, (files, _) in self.statistics.extensions.items():
+      language = LANGUAGE_EXTENSIONS.get(ext)
+      if language is not None:
+        counts[language] = counts.get(language, 0) + files
+    if not counts:
+      lines.append("  - 未检测到编程语言文件")
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    for language, files in ranked[:MAX_LANGUAGES]:
+      lines.append(f"  - {language}: {files} 个文件")
+    return lines
+
+  def render(self, now: Optional[datetime] = None) -> str:
+    """渲染完整报告，格式与 run.sh 原有的 analyze_project 一致"""
+    now = now or datetime.now()
+    lines = [
+        "项目分析报告",
+        "=============",
+        "",
+        f"项目名称: {self.project_root.resolve().name}",
+        f"项目路径: {self.project_root}",
+        f"分析时间: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+    ]
+    for section in (self.directory_structure(), self.file_types(),
+                    self.important_files(), self.languages()):
+      lines.extend(section)
+      lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def analyze_project(project_root,
+                    max_depth: int = 3,
+                    max_entries: Optional[int] = None,
+                    walk_workers: int = 0) -> str:
+  """分析项目并返回报告文本"""
+  report = AnalysisReport(project_root, max_depth, max_entries, walk_workers)
+  with span('analyze.scan'):
+    report.scan()
+  with span('analyze.render'):
+    return report.render()
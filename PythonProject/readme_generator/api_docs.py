@@ -0,0 +1,387 @@
+"""
+API 文档提取模块
+使用 AST 解析 Python 模块（不执行代码），收集类、函数的签名与 docstring；
+文件列表复用共享的目录遍历结果，超出结构树深度、条目上限或被折叠的目录另行扫描，
+不遗漏任何模块；在进程池中并行解析（已在工作进程中时串行解析），并按文件内容哈希缓存解析结果
+"""
+
+import ast
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import AnalysisCache
+from .walker import GENERATED_MARKERS, DirectoryTree, entry_is_dir, scan_directory
+
+logger = logging.getLogger(__name__)
+
+# 提取 API 时跳过的目录（虚拟环境、构建产物等）
+API_SKIP_DIRS = {'.venv', 'venv', '.tox', 'build', 'dist', 'node_modules'}
+
+# 文件数量少于该值时直接在当前进程中解析，避免进程池的启动开销
+PARALLEL_THRESHOLD = 64
+
+# 缓存格式版本，提取结果的结构变化时递增
+API_CACHE_VERSION = 2
+
+
+def iter_python_files(root: str, exclude=()) -> Iterator[str]:
+  """按确定的顺序遍历目录下的所有 .py 文件（不限深度）
+
+  跳过 exclude、API_SKIP_DIRS、符号链接的目录以及包含生成目录标记（例如 pyvenv.cfg）的子目录。
+  """
+  skip = frozenset(exclude) | API_SKIP_DIRS
+  stack = [root]
+  while stack:
+    path = stack.pop()
+    try:
+      entries = scan_directory(path, skip)
+    except OSError:
+      continue
+    if path != root and any(entry.name in GENERATED_MARKERS for entry in entries):
+      continue
+    subdirs = []
+    for entry in entries:
+      if entry_is_dir(entry):
+        if not entry.is_symlink():
+          subdirs.append(entry.path)
+      elif entry.name.endswith('.py'):
+        yield entry.path
+    stack.extend(reversed(subdirs))
+
+
+def iter_tree_python_files(tree: DirectoryTree, exclude=()) -> Iterator[str]:
+  """取出目录下所有的 .py 文件，不受结构树深度与条目上限的限制
+
+  条目完整的已遍历目录直接使用共享的遍历结果；超出条目上限、超出 max_depth
+  或被折叠的目录用 iter_python_files 重新扫描。跳过的目录与 iter_python_files 相同。
+  """
+  if tree.collapsed or not tree.complete:
+    yield from iter_python_files(tree.path, exclude)
+    return
+  for entry in tree.entries:
+    if entry_is_dir(entry):
+      if entry.name in API_SKIP_DIRS or entry.is_symlink():
+        continue
+      child = tree.children.get(entry.name)
+      if child is not None:
+        yield from iter_tree_python_files(child, exclude)
+      else:
+        yield from iter_python_files(entry.path, exclude)
+    elif entry.name.endswith('.py'):
+      yield entry.path
+
+
+def module_name(root: str, path: str) -> str:
+  """根据相对路径计算模块名"""
+  rel = os.path.relpath(path, root)
+  parts = rel[:-3].replace(os.sep, '/').split('/')
+  if parts[-1] == '__init__':
+    parts = parts[:-1]
+  return '.'.join(parts) or os.path.basename(os.path.abspath(root))
+
+
+_BINARY_OPERATORS = {
+    ast.BitOr: '|',
+    ast.BitAnd: '&',
+    ast.Add: '+',
+    ast.Sub: '-',
+    ast.Mult: '*',
+    ast.Div: '/',
+    ast.FloorDiv: '//',
+    ast.Mod: '%',
+    ast.Pow: '**'
+}
+_UNARY_OPERATORS = {ast.USub: '-', ast.UAdd: '+', ast.Not: 'not ', ast.Invert: '~'}
+
+
+def _format_expr(node: ast.AST) -> str:
+  """ast.unparse 的简化版本（Python 3.8 没有 ast.unparse）
+
+  覆盖注解与默认值中常见的表达式：名称、属性、常量、下标、元组/列表/字典/集合、
+  一元与二元运算、调用；其余表达式输出为 '...'。
+  """
+  if isinstance(node, ast.Name):
+    return node.id
+  if isinstance(node, ast.Attribute):
+    return f"{_format_expr(node.value)}.{node.attr}"
+  if isinstance(node, ast.Constant):
+    return '...' if node.value is Ellipsis else repr(node.value)
+  if isinstance(node, ast.Subscript):
+    index = node.slice
+    # Python 3.8 的下标包在 ast.Index 中
+    index = getattr(index, 'value', index) if type(index).__name__ == 'Index' else index
+    if isinstance(index, ast.Tuple) and index.elts:
+      inner = ', '.join(_format_expr(elt) for elt in index.elts)
+    else:
+      inner = _format_expr(index)
+    return f"{_format_expr(node.value)}[{inner}]"
+  if isinstance(node, ast.Tuple):
+    items = [_format_expr(elt) for elt in node.elts]
+    return f"({items[0]},)" if len(items) == 1 else f"({', '.join(items)})"
+  if isinstance(node, ast.List):
+    return f"[{', '.join(_format_expr(elt) for elt in node.elts)}]"
+  if isinstance(node, ast.Set):
+    return f"{{{', '.join(_format_expr(elt) for elt in node.elts)}}}"
+  if isinstance(node, ast.Dict):
+    items = [
+        f"**{_format_expr(value)}" if key is None else
+        f"{_format_expr(key)}: {_format_expr(value)}"
+        for key, value in zip(node.keys, node.values)
+    ]
+    return f"{{{', '.join(items)}}}"
+  if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+    return (f"{_format_expr(node.left)} {_BINARY_OPERATORS[type(node.op)]} "
+            f"{_format_expr(node.right)}")
+  if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+    return f"{_UNARY_OPERATORS[type(node.op)]}{_format_expr(node.operand)}"
+  if isinstance(node, ast.Starred):
+    return f"*{_format_expr(node.value)}"
+  if isinstance(node, ast.Call):
+    args = [_format_expr(arg) for arg in node.args]
+    args += [
+        f"**{_format_expr(kw.value)}" if kw.arg is None else f"{kw.arg}={_format_expr(kw.value)}"
+        for kw in node.keywords
+    ]
+    return f"{_format_expr(node.func)}({', '.join(args)})"
+  return '...'
+
+
+def _unparse(node: Optional[ast.AST]) -> str:
+  if node is None:
+    return ''
+  if hasattr(ast, 'unparse'):
+    return ast.unparse(node)
+  return _format_expr(node)
+
+
+def format_signature(node: ast.AST) -> str:
+  """根据函数定义节点生成签名字符串"""
+  args = node.args
+  params: List[str] = []
+
+  def _param(arg: ast.arg, default: Optional[ast.AST] = None) -> str:
+    text = arg.arg
+    if arg.annotation is not None:
+      text += f": {_unparse(arg.annotation)}"
+    if default is not None:
+      text += f" = {_unparse(default)}" if arg.annotation is not None else \
+          f"={_unparse(default)}"
+    return text
+
+  positional = list(getattr(args, 'posonlyargs', [])) + list(args.args)
+  defaults = [None] * (len(positional) - len(args.defaults)) + list(
+      args.defaults)
+  posonly_count = len(getattr(args, 'posonlyargs', []))
+  for i, (arg, default) in enumerate(zip(positional, defaults)):
+    params.append(_param(arg, default))
+    if posonly_count and i == posonly_count - 1:
+      params.append('/')
+
+  if args.vararg is not None:
+    params.append('*' + _param(args.vararg))
+  elif args.kwonlyargs:
+    params.append('*')
+  for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+    params.append(_param(arg, default))
+  if args.kwarg is not None:
+    params.append('**' + _param(args.kwarg))
+
+  signature = f"{node.name}({', '.join(params)})"
+  if node.returns is not None:
+    signature += f" -> {_unparse(node.returns)}"
+  if isinstance(node, ast.AsyncFunctionDef):
+    signature = 'async ' + signature
+  return signature
+
+
+def _docstring(node: ast.AST) -> Tuple[str, str]:
+  """返回 (完整 docstring, 首行摘要)"""
+  doc = ast.get_docstring(node) or ''
+  summary = doc.strip().split('\n', 1)[0] if doc else ''
+  return doc, summary
+
+
+def _is_public(name: str) -> bool:
+  return not name.startswith('_') or name == '__init__'
+
+
+def _function_info(node: ast.AST) -> Dict[str, str]:
+  doc, summary = _docstring(node)
+  return {
+      'name': node.name,
+      'signature': format_signature(node),
+      'docstring': doc,
+      'summary': summary
+  }
+
+
+def extract_api(source: bytes, name: str, path: str) -> Dict[str, Any]:
+  """从源码中提取模块的公开 API"""
+  tree = ast.parse(source, filename=path)
+  doc, summary = _docstring(tree)
+  module = {
+      'name': name,
+      'path': path,
+      'docstring': doc,
+      'summary': summary,
+      'classes': [],
+      'functions': [],
+      # 所有函数（包括私有函数、方法与嵌套函数）与类的数量，供项目统计使用
+      'metrics': {
+          'functions': 0,
+          'classes': 0
+      }
+  }
+  for node in ast.walk(tree):
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+      module['metrics']['functions'] += 1
+    elif isinstance(node, ast.ClassDef):
+      module['metrics']['classes'] += 1
+
+  for node in tree.body:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+      if _is_public(node.name) and node.name != '__init__':
+        module['functions'].append(_function_info(node))
+    elif isinstance(node, ast.ClassDef) and _is_public(node.name):
+      class_doc, class_summary = _docstring(node)
+      module['classes'].append({
+          'name':
+              node.name,
+          'bases': [_unparse(base) for base in node.bases],
+          'docstring':
+              class_doc,
+          'summary':
+              class_summary,
+          'methods': [
+              _function_info(item)
+              for item in node.body
+              if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and
+              _is_public(item.name)
+          ]
+      })
+  return module
+
+
+def _parse_file(task: Tuple[str, str, str, Optional[str]]
+               ) -> Tuple[str, Optional[str], Optional[Dict[str, Any]], bool]:
+  """解析单个文件（在工作进程中执行）
+
+  返回 (路径, 内容哈希, 模块信息, 是否与已缓存的哈希相同)。
+  哈希相同时不再解析，由调用方复用缓存结果。
+  """
+  path, rel, name, known_hash = task
+  try:
+    with open(path, 'rb') as f:
+      source = f.read()
+  except OSError:
+    return path, None, None, False
+
+  digest = hashlib.sha256(source).hexdigest()
+  if digest == known_hash:
+    return path, digest, None, True
+  try:
+    return path, digest, extract_api(source, name, rel), False
+  except (SyntaxError, ValueError) as e:
+    logger.debug(f"无法解析 {path}: {e}")
+    return path, digest, None, False
+
+
+def code_metrics(modules: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+  """汇总已解析模块的数量及其中的函数与类的数量"""
+  metrics = {'modules': 0, 'functions': 0, 'classes': 0}
+  for module in modules:
+    metrics['modules'] += 1
+    metrics['functions'] += module['metrics']['functions']
+    metrics['classes'] += module['metrics']['classes']
+  return metrics
+
+
+class ApiExtractor:
+  """项目 API 提取器，按文件指纹增量解析"""
+
+  def __init__(self,
+               project_root,
+               exclude_files: List[str] = None,
+               workers: int = 0,
+               cache: Optional[AnalysisCache] = None):
+    self.project_root = str(project_root)
+    self.exclude_files = exclude_files or []
+    self.workers = workers or os.cpu_count() or 1
+    self.cache = cache
+    # {相对路径: {size, mtime_ns, sha256, module}}
+    self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+  def _cache_key(self) -> str:
+    return f"{API_CACHE_VERSION}:{os.path.abspath(self.project_root)}"
+
+  def _load_entries(self) -> Dict[str, Dict[str, Any]]:
+    if self._entries is None:
+      stored = self.cache.get('api', self._cache_key()) if self.cache else None
+      self._entries = stored or {}
+    return self._entries
+
+  def extract(self, files: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """提取项目中所有模块的 API，按模块路径排序
+
+    files 为要解析的 .py 文件路径（通常来自共享的目录遍历结果，见 iter_tree_python_files），
+    为 None 时自行遍历项目目录。
+    """
+    if files is None:
+      files = iter_python_files(self.project_root, self.exclude_files)
+    previous = self._load_entries()
+    current: Dict[str, Dict[str, Any]] = {}
+    tasks = []
+
+    for path in files:
+      rel = os.path.relpath(path, self.project_root)
+      try:
+        st = os.stat(path)
+      except OSError:
+        continue
+      cached = previous.get(rel)
+      if cached and cached['size'] == st.st_size and \
+          cached['mtime_ns'] == st.st_mtime_ns:
+        current[rel] = cached
+        continue
+      current[rel] = {
+          'size': st.st_size,
+          'mtime_ns': st.st_mtime_ns,
+          'sha256': None,
+          'module': None
+      }
+      tasks.append((path, rel, module_name(self.project_root, path),
+                    cached['sha256'] if cached else None))
+
+    if tasks:
+      logger.debug(f"解析 {len(tasks)} 个 Python 文件")
+      for path, digest, module, unchanged in self._run(tasks):
+        rel = os.path.relpath(path, self.project_root)
+        entry = current[rel]
+        entry['sha256'] = digest
+        # 内容哈希未变（例如仅 mtime 变化）时复用上次的解析结果
+        entry['module'] = previous[rel]['module'] if unchanged else module
+
+    self._entries = current
+    if self.cache is not None and (tasks or current.keys() != previous.keys()):
+      self.cache.put('api', self._cache_key(), current)
+
+    return [
+        current[rel]['module']
+        for rel in sorted(current)
+        if current[rel]['module'] is not None
+    ]
+
+  def _run(self, tasks):
+    # 已在工作进程中（例如批量生成的进程池）时不再嵌套创建进程池
+    if self.workers <= 1 or len(tasks) < PARALLEL_THRESHOLD or \
+        multiprocessing.parent_process() is not None:
+      return map(_parse_file, tasks)
+
+    workers = min(self.workers, len(tasks))
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      return list(pool.map(_parse_file, tasks, chunksize=chunksize))
@@ -0,0 +1,216 @@
+"""
+批量生成模块
+自动发现多个项目（或 monorepo 中的子包），在进程池中并行生成 README；
+工作进程崩溃导致进程池损坏时，未完成的项目各自在独立进程中重新生成
+"""
+
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .config import Config
+from .manifest import MANIFEST_FILES
+
+logger = logging.getLogger(__name__)
+
+# 发现子项目时跳过的目录
+DISCOVERY_SKIP_DIRS = {
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv', '.tox',
+    'build', 'dist', '.readme_cache'
+}
+
+# 识别子项目的清单文件
+PROJECT_MARKERS = ('setup.py', 'pyproject.toml')
+
+
+def _is_project(path: str) -> bool:
+  return any(os.path.isfile(os.path.join(path, name)) for name in PROJECT_MARKERS)
+
+
+def discover_projects(root: Union[str, Path], max_depth: int = 4) -> List[Path]:
+  """在目录下查找包含 setup.py 或 pyproject.toml 的子项目（包括根目录本身）"""
+  found = []
+
+  def _walk(path: str, depth: int):
+    try:
+      with os.scandir(path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+      return
+
+    names = {entry.name for entry in entries}
+    if any(name in names for name in PROJECT_MARKERS):
+      found.append(Path(path))
+
+    if depth >= max_depth:
+      return
+    for entry in entries:
+      if entry.name in DISCOVERY_SKIP_DIRS or entry.name.startswith('.'):
+        continue
+      try:
+        if entry.is_dir(follow_symlinks=False):
+          _walk(entry.path, depth + 1)
+      except OSError:
+        continue
+
+  _walk(str(root), 0)
+  return found
+
+
+def resolve_targets(targets: Iterable[str], max_depth: int = 4) -> List[Path]:
+  """将命令行目标解析为项目目录列表
+
+  每个目标可以是：
+  - 目录：在其中自动发现子项目；
+  - 文本文件：每行一个项目路径（# 开头为注释）；
+  - glob 模式：匹配到的目录若包含清单文件则作为项目。
+  """
+  projects: List[Path] = []
+  for target in targets:
+    path = Path(target)
+    if path.is_dir():
+      projects.extend(discover_projects(path, max_depth))
+    elif path.is_file() and path.name not in MANIFEST_FILES:
+      with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+          line = line.strip()
+          if line and not line.startswith('#'):
+            projects.append(Path(line))
+    else:
+      for match in sorted(glob.glob(target, recursive=True)):
+        if os.path.isdir(match) and _is_project(match):
+          projects.append(Path(match))
+
+  # 去重并保持顺序
+  seen = set()
+  unique = []
+  for project in projects:
+    key = os.path.abspath(project)
+    if key not in seen:
+      seen.add(key)
+      unique.append(project)
+  return unique
+
+
+def _project_config(base: Dict[str, Any], project: Path) -> Config:
+  """基于公共配置为单个项目生成配置"""
+  data = dict(base)
+  data['project_root'] = str(project)
+  output_path = Path(base.get('output_path') or 'README.md')
+  if not output_path.is_absolute():
+    output_path = project / output_path
+  else:
+    output_path = project / output_path.name
+  data['output_path'] = str(output_path)
+  return Config(data)
+
+
+def _warm_templates(base: Dict[str, Any]):
+  """预先编译模板；在进程池中作为初始化函数，每个工作进程只编译一次"""
+  from .templates import load_template
+  config = Config(base)
+  if config.template_path and config.template_path.is_file():
+    load_template(config.template_path, config.template_cache_dir,
+                  config.template_bytecode_cache)
+  else:
+    load_template(None, config.template_cache_dir,
+                  config.template_bytecode_cache)
+
+
+def _failed(project: str, error: str) -> Dict[str, Any]:
+  return {
+      'project': project,
+      'success': False,
+      'output': '',
+      'error': error,
+      'duration': 0.0
+  }
+
+
+def _generate_one(base: Dict[str, Any], project: str) -> Dict[str, Any]:
+  """在工作进程中为单个项目生成 README"""
+  from .core import ReadmeGenerator
+
+  start = time.perf_counter()
+  result = _failed(project, '')
+  try:
+    generator = ReadmeGenerator(_project_config(base, Path(project)))
+    result['output'] = str(generator.generate())
+    result['success'] = True
+  except Exception as e:
+    result['error'] = f"{type(e).__name__}: {e}"
+  result['duration'] = time.perf_counter() - start
+  return result
+
+
+def _generate_isolated(base: Dict[str, Any], project: str) -> Dict[str, Any]:
+  """在独立的单进程池中生成，工作进程崩溃只影响这一个项目"""
+  try:
+    with ProcessPoolExecutor(max_workers=1) as pool:
+      return pool.submit(_generate_one, base, project).result()
+  except BrokenProcessPool:
+    return _failed(project, "BrokenProcessPool: 工作进程异常退出")
+  except Exception as e:
+    return _failed(project, f"{type(e).__name__}: {e}")
+
+
+def generate_many(projects: Iterable[Union[str, Path]],
+                  config: Optional[Config] = None,
+                  workers: Optional[int] = None) -> List[Dict[str, Any]]:
+  """为多个项目生成 README
+
+  每个项目在进程池中独立生成，单个项目失败不会中断整个批次；
+  某个项目使工作进程崩溃时，其余未完成的项目在各自的进程中重新生成。
+  返回与 projects 顺序一致的结果列表，每项包含
+  project / success / output / error / duration。
+  """
+  projects = [str(project) for project in projects]
+  base = (config or Config()).to_dict()
+  if workers is None:
+    workers = min(len(projects), os.cpu_count() or 1)
+
+  # fork 启动方式下子进程直接继承父进程中已编译的模板
+  _warm_templates(base)
+
+  results: Dict[str, Dict[str, Any]] = {}
+  if workers <= 1 or len(projects) <= 1:
+    for project in projects:
+      results[project] = _generate_one(base, project)
+  else:
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_warm_templates,
+                             initargs=(base,)) as pool:
+      futures = {
+          pool.submit(_generate_one, base, project): project
+          for project in projects
+      }
+      for future in as_completed(futures):
+        project = futures[future]
+        try:
+          results[project] = future.result()
+        except BrokenProcessPool:
+          # 进程池损坏后所有未完成的项目都以该异常结束，无法判断是哪个项目导致的
+          unfinished.append(project)
+        except Exception as e:
+          results[project] = _failed(project, f"{type(e).__name__}: {e}")
+
+    if unfinished:
+      logger.warning(f"工作进程异常退出，在独立进程中重新生成 {len(unfinished)} 个未完成的项目")
+      with ThreadPoolExecutor(max_workers=min(workers, len(unfinished))) as threads:
+        isolated = threads.map(lambda project: _generate_isolated(base, project), unfinished)
+        for project, result in zip(unfinished, isolated):
+          results[project] = result
+
+  for project in projects:
+    result = results[project]
+    if result['success']:
+      logger.info(f"✅ {project} ({result['duration']:.2f}s)")
+    else:
+      logger.error(f"❌ {project}: {result['error']}")
+  return [results[project] for project in projects]
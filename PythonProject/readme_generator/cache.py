@@ -0,0 +1,270 @@
+"""
+分析缓存模块
+将目录遍历、清单解析、Git 检测的结果持久化到磁盘，
+以文件路径 + 大小 + mtime 作为键（必要时回退到内容哈希），
+按总大小上限进行 LRU 淘汰；
+大模型的生成结果以模型名 + 提示词哈希 + 生成参数为键缓存，可设置过期时间
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# 缓存格式版本，格式变化时递增以丢弃旧缓存
+CACHE_VERSION = 1
+
+
+def file_stat(path: Path) -> Optional[Dict[str, int]]:
+  """获取文件的大小和 mtime，文件不存在时返回 None"""
+  try:
+    st = os.stat(path)
+  except OSError:
+    return None
+  return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def content_hash(path: Path) -> Optional[str]:
+  """计算文件内容的 SHA-256"""
+  digest = hashlib.sha256()
+  try:
+    with open(path, 'rb') as f:
+      for chunk in iter(lambda: f.read(1024 * 1024), b''):
+        digest.update(chunk)
+  except OSError:
+    return None
+  return digest.hexdigest()
+
+
+def fingerprint_files(paths: Iterable[Path],
+                      with_hash: bool = True) -> Dict[str, Dict[str, Any]]:
+  """为一组文件生成指纹 {路径: {size, mtime_ns, sha256}}"""
+  fingerprints = {}
+  for path in paths:
+    stat = file_stat(path)
+    if stat is None:
+      continue
+    if with_hash:
+      stat['sha256'] = content_hash(path)
+    fingerprints[str(path)] = stat
+  return fingerprints
+
+
+def fingerprints_match(stored: Dict[str, Dict[str, Any]],
+                       paths: Iterable[Path]) -> bool:
+  """检查文件是否与缓存的指纹一致
+
+  先比较大小和 mtime；mtime 变化但大小相同时，回退到比较内容哈希
+  （例如 git checkout 之后文件内容未变、仅 mtime 被更新）。
+  不修改 stored，调用方需要用 refresh_mtimes 记录新的 mtime。
+  """
+  current = {str(path) for path in paths}
+  if current != set(stored):
+    return False
+
+  for path, expected in stored.items():
+    stat = file_stat(Path(path))
+    if stat is None or stat['size'] != expected.get('size'):
+      return False
+    if stat['mtime_ns'] == expected.get('mtime_ns'):
+      continue
+    if not expected.get('sha256') or content_hash(
+        Path(path)) != expected['sha256']:
+      return False
+  return True
+
+
+def refresh_mtimes(stored: Dict[str, Dict[str, Any]], paths: Iterable[Path]):
+  """内容未变时把文件当前的 mtime 写回指纹，下次直接按 mtime 命中而不再计算哈希"""
+  for path in paths:
+    stat = file_stat(path)
+    expected = stored.get(str(path))
+    if stat is not None and expected is not None:
+      expected['mtime_ns'] = stat['mtime_ns']
+
+
+class AnalysisCache:
+  """磁盘分析缓存，每个条目一个 JSON 文件，以文件 mtime 记录最近访问时间
+
+  缓存目录的总大小只在第一次写入时统计一次，之后按每次写入的大小增量累计，
+  超过上限时才重新列出目录并淘汰，写入大量条目时不必每次都遍历整个目录。
+  """
+
+  def __init__(self,
+               cache_dir: Path,
+               max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+    self.cache_dir = Path(cache_dir)
+    self.max_bytes = max_bytes
+    # 缓存目录的总大小（字节），None 表示尚未统计
+    self._total: Optional[int] = None
+    self._lock = threading.Lock()
+
+  def _entry_path(self, namespace: str, key: str) -> Path:
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return self.cache_dir / f"{namespace}-{digest}.json"
+
+  def get(self, namespace: str, key: str) -> Optional[Any]:
+    """读取缓存条目，不存在或已损坏时返回 None"""
+    path = self._entry_path(namespace, key)
+    try:
+      with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    except (OSError, ValueError):
+      return None
+
+    if data.get('version') != CACHE_VERSION or data.get('key') != key:
+      return None
+
+    # 更新访问时间，用于 LRU 淘汰
+    try:
+      os.utime(path)
+    except OSError:
+      pass
+    return data.get('value')
+
+  def put(self, namespace: str, key: str, value: Any):
+    """写入缓存条目，超过大小上限时淘汰最久未使用的条目"""
+    path = self._entry_path(namespace, key)
+    try:
+      old_size = os.stat(path).st_size
+    except OSError:
+      old_size = 0
+    try:
+      self.cache_dir.mkdir(parents=True, exist_ok=True)
+      tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+      # json.dumps 使用 C 实现的编码器，比逐块写入的 json.dump 快得多
+      data = json.dumps({
+          'version': CACHE_VERSION,
+          'key': key,
+          'value': value
+      },
+                        ensure_ascii=False,
+                        default=str)
+      with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+      size = os.stat(tmp_path).st_size
+      os.replace(tmp_path, path)
+    except OSError as e:
+      logger.warning(f"写入分析缓存失败: {e}")
+      return
+
+    with self._lock:
+      if self._total is None:
+        # 第一次写入时统计整个目录（已包含刚写入的条目）
+        self._total = self._usage()
+      else:
+        self._total += size - old_size
+      if self._total > self.max_bytes:
+        self._total = self._evict()
+
+  def clear(self):
+    """清空缓存"""
+    for entry in self._entries():
+      try:
+        os.unlink(entry.path)
+      except OSError:
+        pass
+    with self._lock:
+      self._total = None
+
+  def _entries(self) -> list:
+    try:
+      with os.scandir(self.cache_dir) as it:
+        return [
+            entry for entry in it
+            if entry.name.endswith('.json') and entry.is_file()
+        ]
+    except OSError:
+      return []
+
+  def _stats(self) -> list:
+    stats = []
+    for entry in self._entries():
+      try:
+        st = entry.stat()
+      except OSError:
+        continue
+      stats.append((st.st_mtime_ns, st.st_size, entry.path))
+    return stats
+
+  def _usage(self) -> int:
+    """缓存目录中所有条目的总大小"""
+    return sum(size for _, size, _ in self._stats())
+
+  def _evict(self) -> int:
+    """按最近访问时间淘汰条目，直到总大小不超过上限，返回淘汰后的总大小"""
+    stats = self._stats()
+    total = sum(size for _, size, _ in stats)
+    if total <= self.max_bytes:
+      return total
+
+    for _, size, path in sorted(stats):
+      if total <= self.max_bytes:
+        break
+      try:
+        os.unlink(path)
+        total -= size
+        logger.debug(f"淘汰缓存条目: {path}")
+      except OSError:
+        pass
+    return total
+
+
+class ResponseCache(AnalysisCache):
+  """大模型生成结果缓存
+
+  键由模型名、提示词的 SHA-256 与生成参数组成，相同输入直接返回缓存的内容，
+  不需要请求 Ollama（也不需要加载模型）。条目超过 ttl 秒后失效（None 表示不过期），
+  总大小超过上限时按 LRU 淘汰。
+  """
+
+  NAMESPACE = 'llm'
+
+  def __init__(self,
+               cache_dir: Path,
+               max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+               ttl: Optional[float] = None):
+    super().__init__(cache_dir, max_bytes)
+    self.ttl = ttl
+
+  @staticmethod
+  def make_key(model: str, prompt: str,
+               options: Optional[Dict[str, Any]] = None) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    return json.dumps([model, prompt_hash, options or {}], sort_keys=True)
+
+  def lookup(self,
+             model: str,
+             prompt: str,
+             options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """读取缓存的生成结果，不存在或已过期时返回 None"""
+    key = self.make_key(model, prompt, options)
+    value = self.get(self.NAMESPACE, key)
+    if not isinstance(value, dict):
+      return None
+    if self.ttl is not None and time.time() - value.get('created', 0) > self.ttl:
+      try:
+        os.unlink(self._entry_path(self.NAMESPACE, key))
+      except OSError:
+        pass
+      return None
+    return value.get('response')
+
+  def store(self,
+            model: str,
+            prompt: str,
+            response: str,
+            options: Optional[Dict[str, Any]] = None):
+    """写入生成结果"""
+    self.put(self.NAMESPACE, self.make_key(model, prompt, options), {
+        'created': time.time(),
+        'response': response
+    })
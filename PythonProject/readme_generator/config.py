@@ -8,8 +8,7 @@ import logging
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-import toml
-import yaml
+from .walker import DEFAULT_COLLAPSE_PATTERNS
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +28,12 @@ class Config:
         # 路径配置
         self.project_root = Path(self.data.get('project_root', '.'))
         self.output_path = Path(self.data.get('output_path', 'README.md'))
-        self.template_path = Path(self.data.get('template_path', ''))
+        # 未设置自定义模板时为 None（Path('') 会变成 '.'，无法在 to_dict 后还原）
+        template_path = self.data.get('template_path', '')
+        self.template_path = Path(template_path) if template_path else None
+        template_cache_dir = self.data.get('template_cache_dir', '')
+        self.template_cache_dir = Path(template_cache_dir) if template_cache_dir else None
+        self.template_bytecode_cache = self.data.get('template_bytecode_cache', True)
 
         # 功能开关
         self.include_badges = self.data.get('include_badges', True)
@@ -39,16 +43,54 @@ class Config:
         self.include_api_docs = self.data.get('include_api_docs', False)
         self.include_contributing = self.data.get('include_contributing', True)
         self.include_changelog = self.data.get('include_changelog', False)
+        self.include_statistics = self.data.get('include_statistics', False)
+
+        # 输出配置
+        # 确定性输出：生成时间取自 SOURCE_DATE_EPOCH（未设置时省略），相同输入得到相同字节
+        self.deterministic_output = self.data.get('deterministic_output', False)
+        # 区块增量生成：README 按章节加标记，只重新渲染输入变化的章节，保留章节之外手写的内容
+        self.incremental_sections = self.data.get('incremental_sections', False)
 
         # Git 配置
         self.git_auto_detect = self.data.get('git_auto_detect', True)
         self.github_username = self.data.get('github_username', '')
         self.repository_name = self.data.get('repository_name', '')
 
+        # 项目结构配置
+        self.structure_max_depth = self.data.get('structure_max_depth', 3)
+        # 每个目录最多列出的条目数，0 表示不限制
+        self.structure_max_entries = self.data.get('structure_max_entries', 50)
+        self.structure_collapse = self.data.get('structure_collapse', list(DEFAULT_COLLAPSE_PATTERNS))
+
         # 模板配置
         self.custom_sections = self.data.get('custom_sections', [])
         self.exclude_files = self.data.get('exclude_files', ['.git', '__pycache__', '.vscode'])
 
+        # 性能配置
+        self.walk_workers = self.data.get('walk_workers', 0)
+        self.api_workers = self.data.get('api_workers', 0)
+        self.line_count_workers = self.data.get('line_count_workers', 0)
+        cache_dir = self.data.get('cache_dir', '')
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_max_mb = self.data.get('cache_max_mb', 64)
+        # 低内存模式：结构树与统计的文件列表超出上限的 1/4 后溢出到临时文件 (0 表示不限制)
+        self.max_memory_mb = self.data.get('max_memory_mb', 0)
+
+        # 大模型 (Ollama) 配置
+        self.ollama_model = self.data.get('ollama_model', 'qwen3:8b')
+        # 留空时使用 OLLAMA_HOST 环境变量或 http://127.0.0.1:11434
+        self.ollama_host = self.data.get('ollama_host', '')
+        self.llm_concurrency = self.data.get('llm_concurrency', 2)
+        self.llm_timeout = self.data.get('llm_timeout', 600)
+        self.llm_retries = self.data.get('llm_retries', 2)
+        # 提示词的 token 预算，超出时压缩分析报告 (0 表示不限制)
+        self.llm_token_budget = self.data.get('llm_token_budget', 3000)
+        # 生成结果缓存：留空时使用 ~/.cache/readme-generator/llm；过期天数为 0 表示不过期
+        llm_cache_dir = self.data.get('llm_cache_dir', '')
+        self.llm_cache_dir = Path(llm_cache_dir) if llm_cache_dir else None
+        self.llm_cache_ttl_days = self.data.get('llm_cache_ttl_days', 30)
+        self.llm_cache_max_mb = self.data.get('llm_cache_max_mb', 64)
+
     @classmethod
     def load(cls, config_file: str) -> 'Config':
         """从配置文件加载配置"""
@@ -60,11 +102,14 @@ class Config:
 
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
+                # yaml / toml 只在需要时导入，以加快启动
                 if config_path.suffix.lower() == '.yaml' or config_path.suffix.lower() == '.yml':
+                    import yaml
                     data = yaml.safe_load(f)
                 elif config_path.suffix.lower() == '.json':
                     data = json.load(f)
                 elif config_path.suffix.lower() == '.toml':
+                    import toml
                     data = toml.load(f)
                 else:
                     raise ValueError(f"不支持的配置文件格式: {config_path.suffix}")
@@ -84,10 +129,12 @@ class Config:
         try:
             with open(config_path, 'w', encoding='utf-8') as f:
                 if config_path.suffix.lower() == '.yaml' or config_path.suffix.lower() == '.yml':
+                    import yaml
                     yaml.dump(self.data, f, default_flow_style=False, allow_unicode=True)
                 elif config_path.suffix.lower() == '.json':
                     json.dump(self.data, f, indent=2, ensure_ascii=False)
                 elif config_path.suffix.lower() == '.toml':
+                    import toml
                     toml.dump(self.data, f)
 
             logger.info(f"配置已保存到: {config_file}")
@@ -106,7 +153,9 @@ class Config:
             'python_version': self.python_version,
             'project_root': str(self.project_root),
             'output_path': str(self.output_path),
-            'template_path': str(self.template_path),
+            'template_path': str(self.template_path) if self.template_path else '',
+            'template_cache_dir': str(self.template_cache_dir) if self.template_cache_dir else '',
+            'template_bytecode_cache': self.template_bytecode_cache,
             'include_badges': self.include_badges,
             'include_toc': self.include_toc,
             'include_installation': self.include_installation,
@@ -114,10 +163,30 @@ class Config:
             'include_api_docs': self.include_api_docs,
             'include_contributing': self.include_contributing,
             'include_changelog': self.include_changelog,
+            'include_statistics': self.include_statistics,
+            'deterministic_output': self.deterministic_output,
+            'incremental_sections': self.incremental_sections,
             'git_auto_detect': self.git_auto_detect,
             'github_username': self.github_username,
             'repository_name': self.repository_name,
+            'structure_max_depth': self.structure_max_depth,
+            'structure_max_entries': self.structure_max_entries,
+            'structure_collapse': self.structure_collapse,
             'custom_sections': self.custom_sections,
-            'exclude_files': self.exclude_files
-        }
+            'exclude_files': self.exclude_files,
+            'walk_workers': self.walk_workers,
+            'api_workers': self.api_workers,
+            'line_count_workers': self.line_count_workers,
+            'cache_dir': str(self.cache_dir) if self.cache_dir else '',
+            'cache_max_mb': self.cache_max_mb,
+            'max_memory_mb': self.max_memory_mb,
+            'ollama_model': self.ollama_model,
+            'ollama_host': self.ollama_host,
+            'llm_concurrency': self.llm_concurrency,
+            'llm_timeout': self.llm_timeout,
+            'llm_retries': self.llm_retries,
+            'llm_token_budget': self.llm_token_budget,
+            'llm_cache_dir': str(self.llm_cache_dir) if self.llm_cache_dir else '',
+            'llm_cache_ttl_days': self.llm_cache_ttl_days,
+            'llm_cache_max_mb': self.llm_cache_max_mb
         }
@@ -3,84 +3,478 @@
 包含 README 生成的主要逻辑
 """
 
+import hashlib
+import importlib.util
 import logging
 import os
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-try:
-    import git
-    GIT_AVAILABLE = True
-except ImportError:
-    GIT_AVAILABLE = False
-
-from jinja2 import Environment, FileSystemLoader, Template
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
 
+from . import __version__
+from .cache import AnalysisCache
 from .config import Config
-from .utils import BadgeGenerator, ProjectAnalyzer
+from .gitinfo import GitRepository, parse_github_url
+from .linecount import LineCounter
+from .lowmem import TextLines, iter_json, spill_threshold
+from .manifest import ProjectManifest, is_dependency_file
+from .output import write_output
+from .sections import (has_sections, inputs_digest, parse_sections, splice_sections,
+                       stale_sections)
+from .templates import (DEFAULT_TEMPLATE, SectionTemplate, load_section_templates, load_template,
+                        template_inputs)
+from .timing import span, timed_iter
+from .utils import BadgeGenerator, ProjectAnalyzer, StatisticsCollector, is_subpath
+from .walker import DirectoryTree
+
+# GitPython 仅在直接解析 .git 目录失败时作为后备；导入较慢，只检查是否安装
+GIT_AVAILABLE = importlib.util.find_spec('git') is not None
 
 logger = logging.getLogger(__name__)
 
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# README 末尾记录输入指纹的注释，--check 据此判断 README 是否过期
+FINGERPRINT_FORMAT = '<!-- readme-generator: input-fingerprint {} -->\n'
+FINGERPRINT_RE = re.compile(r'<!-- readme-generator: input-fingerprint ([0-9a-f]{64}) -->')
+FINGERPRINT_LINE_RE = re.compile(FINGERPRINT_RE.pattern + r'\n?')
+FINGERPRINT_TAIL_BYTES = 4096
+
+# 不影响输出内容的配置项（性能、缓存、路径等），不参与输入指纹；
+# 模板路径由模板源码的哈希代替
+NON_OUTPUT_CONFIG_KEYS = frozenset({
+    'project_root', 'output_path', 'template_path', 'template_cache_dir',
+    'template_bytecode_cache', 'walk_workers', 'api_workers', 'line_count_workers', 'cache_dir',
+    'cache_max_mb', 'max_memory_mb', 'ollama_model', 'ollama_host', 'llm_concurrency',
+    'llm_timeout', 'llm_retries', 'llm_token_budget', 'llm_cache_dir', 'llm_cache_ttl_days',
+    'llm_cache_max_mb'
+})
+
+
+def _template_info(project_info: Dict[str, Any], variables: Optional[FrozenSet[str]],
+                   ignored: FrozenSet[str]) -> Dict[str, Any]:
+    """模板用到的项目信息（不含生成时间）；变量未知时使用除 ignored 之外的全部信息"""
+    return {
+        key: value
+        for key, value in project_info.items()
+        if key != 'generated_date' and (key in variables if variables is not None else
+                                        key not in ignored)
+    }
+
+
 class ReadmeGenerator:
     """README 生成器主类"""
 
     def __init__(self, config: Config):
         self.config = config
-        self.project_analyzer = ProjectAnalyzer(config.project_root, config.exclude_files)
+        self.cache: Optional[AnalysisCache] = None
+        if config.cache_dir:
+            self.cache = AnalysisCache(config.cache_dir, int(config.cache_max_mb * 1024 * 1024))
+        self.project_analyzer = ProjectAnalyzer(config.project_root, config.exclude_files,
+                                                config.walk_workers, self.cache,
+                                                config.structure_max_depth,
+                                                config.structure_max_entries or None,
+                                                config.structure_collapse,
+                                                self._generated_paths())
         self.badge_generator = BadgeGenerator()
+        self._api_extractor = None
+        self._manifest: Optional[ProjectManifest] = None
+        # 各收集器的结果，监视模式下按变化的路径失效
+        self._results: Dict[str, Any] = {}
+        self._last_content_key: Optional[str] = None
+        self._template_inputs_cache: Optional[Tuple[str, Optional[FrozenSet[str]],
+                                                    FrozenSet[str]]] = None
 
         # 初始化模板环境
-        self._setup_template_environment()
+        with span('template'):
+            self._setup_template_environment()
 
     def _setup_template_environment(self):
         """设置 Jinja2 模板环境"""
-        if self.config.template_path and self.config.template_path.exists():
+        if self.config.template_path and self.config.template_path.is_file():
             # 使用自定义模板
-            template_dir = self.config.template_path.parent
-            template_name = self.config.template_path.name
-            env = Environment(loader=FileSystemLoader(template_dir))
-            self.template = env.get_template(template_name)
+            self.template = load_template(self.config.template_path,
+                                          self.config.template_cache_dir,
+                                          self.config.template_bytecode_cache)
             logger.info(f"使用自定义模板: {self.config.template_path}")
         else:
             # 使用默认模板
-            self.template = Template(self._get_default_template())
+            self.template = load_template(None, self.config.template_cache_dir,
+                                          self.config.template_bytecode_cache)
             logger.info("使用默认模板")
 
-    def generate(self) -> Path:
-        """生成 README 文件"""
+    def generate(self, full: bool = False) -> Path:
+        """生成 README 文件（内容未变化时不重写）
+
+        启用区块增量生成时只重新渲染输入变化的区块；full 为 True 时重新渲染全部区块，
+        区块之外手写的内容仍然保留。
+        现有的 README 是手写的（没有区块标记与输入指纹）时，只有 full 为 True 才会覆盖。
+        """
         logger.info("开始生成 README...")
+        self._guard_hand_written(full)
 
         # 收集项目信息
         project_info = self._collect_project_info()
 
-        # 渲染模板
-        content = self.template.render(**project_info)
+        # 渲染模板并写入文件
+        output_path = self.config.output_path
+        with span('write'):
+            written = self._write_output(self._render_chunks(project_info, full=full))
+        if written:
+            logger.info(f"README 生成完成: {output_path}")
+        else:
+            logger.info(f"README 内容未变化: {output_path}")
+        return output_path
+
+    def regenerate(self, changes: Optional[Iterable[Tuple[str, str]]] = None) -> bool:
+        """增量重新生成 README
 
-        # 写入文件
+        changes 为 (事件类型, 路径) 列表，只重新运行受影响的收集器；
+        为 None 时重新运行全部收集器。输入指纹（不含生成时间）未变化时不写文件。
+        返回是否写入了文件。
+        """
+        if changes is None:
+            self._results.clear()
+        else:
+            self.invalidate(changes)
+        self._guard_hand_written()
+
+        project_info = self._collect_project_info(reuse=True)
         output_path = self.config.output_path
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
 
-        logger.info(f"README 生成完成: {output_path}")
-        return output_path
+        # 生成时间不参与指纹，避免仅因时间变化而重写文件
+        content_key = self.input_fingerprint(project_info)
+        if content_key == self._last_content_key and output_path.exists():
+            logger.debug("README 内容未变化，跳过写入")
+            return False
+
+        with span('write'):
+            written = self._write_output(self._render_chunks(project_info, content_key))
+        self._last_content_key = content_key
+
+        if written:
+            logger.info(f"README 已更新: {output_path}")
+        return written
+
+    def check(self) -> bool:
+        """检查 README 是否为最新：比较文件中记录的输入指纹与当前输入，不渲染模板"""
+        stored = self.stored_fingerprint()
+        if stored is None:
+            logger.info(f"README 不存在或未记录输入指纹: {self.config.output_path}")
+            return False
+        with span('check'):
+            return stored == self.input_fingerprint()
+
+    def input_fingerprint(self, project_info: Optional[Dict[str, Any]] = None) -> str:
+        """计算输入指纹：配置、模板源码以及模板用到的项目信息（不含生成时间）"""
+        if project_info is None:
+            project_info = self._collect_project_info()
+
+        template_hash, variables, ignored = self._template_inputs()
+        config = {
+            key: value
+            for key, value in self.config.to_dict().items()
+            if key not in NON_OUTPUT_CONFIG_KEYS
+        }
+        info = _template_info(project_info, variables, ignored)
+        digest = hashlib.sha256()
+
+        def _update(value: Any):
+            # 逐块编码，溢出到临时文件的结构树不会被拼接成完整的字符串
+            for chunk in iter_json(value):
+                digest.update(chunk.encode('utf-8'))
+
+        _update({'version': __version__, 'template': template_hash, 'config': config})
+        for key in sorted(info):
+            _update(key)
+            value = info[key]
+            if isinstance(value, list):
+                # 列表（例如 API 模块）逐项编码，避免为大型项目构造完整的 JSON 字符串
+                digest.update(b'[')
+                for item in value:
+                    _update(item)
+                    digest.update(b',')
+                digest.update(b']')
+            else:
+                _update(value)
+        return digest.hexdigest()
+
+    def stored_fingerprint(self) -> Optional[str]:
+        """读取 README 末尾记录的输入指纹"""
+        try:
+            with open(self.config.output_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - FINGERPRINT_TAIL_BYTES))
+                tail = f.read().decode('utf-8', errors='replace')
+        except OSError:
+            return None
+        matches = FINGERPRINT_RE.findall(tail)
+        return matches[-1] if matches else None
+
+    def _template_inputs(self) -> Tuple[str, Optional[FrozenSet[str]], FrozenSet[str]]:
+        if self._template_inputs_cache is None:
+            self._template_inputs_cache = template_inputs(self._template_file())
+        return self._template_inputs_cache
+
+    def _template_file(self) -> Optional[Path]:
+        if self.config.template_path and self.config.template_path.is_file():
+            return self.config.template_path
+        return None
+
+    def _render(self, project_info: Dict[str, Any], fingerprint: Optional[str] = None) -> str:
+        """渲染模板，并在末尾记录输入指纹"""
+        return ''.join(self._render_chunks(project_info, fingerprint))
+
+    def _render_chunks(self, project_info: Dict[str, Any],
+                       fingerprint: Optional[str] = None,
+                       full: bool = False) -> Iterator[str]:
+        """逐块渲染模板（不在内存中拼接整个文档），最后输出输入指纹注释"""
+        if fingerprint is None:
+            with span('fingerprint'):
+                fingerprint = self.input_fingerprint(project_info)
+        structure = project_info.get('project_structure')
+        if isinstance(structure, TextLines) and self._template_file() is not None:
+            # 自定义模板按原来的约定接收字符串形式的结构树（split、length、拼接等字符串操作）；
+            # 只有默认模板逐行输出，不拼接整个结构树
+            project_info = dict(project_info, project_structure=str(structure))
+        if self.config.incremental_sections:
+            chunks = self._render_sections(project_info, full)
+        else:
+            chunks = self.template.generate(**project_info)
+        # 渲染与写入交替进行，只累计产生各块的耗时
+        chunks = timed_iter('render', chunks)
+        last = ''
+        for chunk in chunks:
+            if chunk:
+                last = chunk
+                yield chunk
+        if not last.endswith('\n'):
+            yield '\n'
+        yield FINGERPRINT_FORMAT.format(fingerprint)
+
+    def _render_sections(self, project_info: Dict[str, Any], full: bool = False) -> Iterator[str]:
+        """按区块增量渲染：只渲染输入哈希变化的区块，拼接回现有的 README
+
+        生成时间不参与区块的输入哈希，只在其他区块变化时随之更新。
+        现有 README 中没有区块标记时整体重新生成。
+        """
+        sections = load_section_templates(self._template_file(), self.config.template_cache_dir,
+                                          self.config.template_bytecode_cache)
+        items = parse_sections(self._read_output())
+        plan = [(section.name, self._section_inputs(section, project_info))
+                for section in sections]
+        by_name = {section.name: section for section in sections}
+        old_names = {item.name for item in items if not isinstance(item, str)}
+
+        stale = [name for name, _ in plan] if full else stale_sections(items, plan)
+        rendered = {name: by_name[name].render(**project_info) for name in stale}
+        changed = (old_names.difference(by_name) or
+                   any(name in old_names or text.strip() for name, text in rendered.items()))
+        if changed:
+            for section in sections:
+                if section.name not in rendered and (section.variables is None or
+                                                     'generated_date' in section.variables):
+                    rendered[section.name] = section.render(**project_info)
+        if old_names:
+            names = [name for name, text in rendered.items() if name in old_names or text.strip()]
+            logger.debug(f"重新渲染区块: {', '.join(names) or '无'}")
+        return splice_sections(items, plan, rendered)
+
+    @staticmethod
+    def _section_inputs(section: SectionTemplate, project_info: Dict[str, Any]) -> str:
+        """区块的输入哈希：版本、区块模板源码与区块用到的项目信息（不含生成时间）"""
+        info = _template_info(project_info, section.variables, section.ignored)
+        return inputs_digest(__version__, section.source_hash, info)
+
+    def _guard_hand_written(self, full: bool = False):
+        """启用区块增量生成时，拒绝覆盖手写的 README
+
+        没有区块标记时区块增量生成会整体重新生成 README，手写的内容无法区分，会全部丢失；
+        由本工具生成的 README（末尾有输入指纹）不受影响。
+        """
+        if full or not self.config.incremental_sections:
+            return
+        try:
+            text = self.config.output_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            return
+        if text.strip() and not has_sections(text) and FINGERPRINT_RE.search(text) is None:
+            raise ValueError(f"{self.config.output_path} 没有区块标记，看起来是手写的 README，"
+                             f"区块增量生成会覆盖其中的全部内容；请先备份，"
+                             f"再使用 --full 重新生成，或指定其他输出路径")
+
+    def _read_output(self) -> str:
+        """读取现有的 README（去掉输入指纹注释），不存在时返回空字符串"""
+        try:
+            text = self.config.output_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            return ''
+        return FINGERPRINT_LINE_RE.sub('', text)
+
+    def _write_output(self, chunks: Iterable[str]) -> bool:
+        """流式、原子地写入输出文件，返回是否写入（内容未变化时不重写）"""
+        written = write_output(self.config.output_path, chunks)
+        if not written:
+            logger.debug("README 内容未变化，跳过写入")
+        return written
+
+    def invalidate(self, changes: Iterable[Tuple[str, str]]) -> Set[str]:
+        """根据变化的路径使相关收集器的结果失效，返回失效的收集器名称
+
+        - 根目录清单文件（setup.py、pyproject.toml、锁文件等）以及子目录中可能被 -r 引用的
+          requirements 文件的修改只重新解析清单；
+        - 文件的新增、删除、移动只重新遍历目录树，不重新解析清单；
+        - .git 中 config、HEAD、packed-refs、refs 的变化只重新检测 Git 信息；
+        - .py 文件的变化重新提取 API（未变化的模块直接复用缓存）；
+        - 启用统计时，普通文件的内容修改重新遍历目录树（文件大小与行数可能变化），
+          否则不影响任何收集器；
+        - 生成器自身写入的输出文件、写入输出时的临时文件与缓存目录的任何变化都被忽略。
+        """
+        root = os.path.abspath(self.config.project_root)
+        output = os.path.abspath(self.config.output_path)
+        # _write_output 在输出目录中创建的临时文件: .README.md.<随机>.tmp
+        tmp_prefix = os.path.join(os.path.dirname(output), f'.{os.path.basename(output)}.')
+        generated = [os.path.abspath(path) for path in self._generated_paths()]
+        template = None
+        if self.config.template_path and self.config.template_path.is_file():
+            template = os.path.abspath(self.config.template_path)
+        exclude = set(self.project_analyzer.exclude_files)
+        git_files = self._git_state_files()
+
+        affected = set()
+        for kind, path in changes:
+            path = os.path.abspath(path)
+            if path == template:
+                affected.add('template')
+                continue
+            if path == output or (path.startswith(tmp_prefix) and path.endswith('.tmp')) or \
+                    any(is_subpath(path, prefix) for prefix in generated):
+                continue
+            if path in git_files:
+                # 项目位于上层仓库或工作树中时，Git 文件可能在项目目录之外
+                affected.add('git')
+                continue
+
+            rel = os.path.relpath(path, root)
+            if rel == os.curdir:
+                # 根目录本身的变化（轮询模式下表示根目录条目有增删）
+                if kind != 'modified':
+                    affected.update(('tree', 'manifest'))
+                continue
+            parts = Path(rel).parts
+            if parts[0] == os.pardir:
+                continue
+            if parts[0] == '.git':
+                if len(parts) == 1 or parts[1] in ('config', 'HEAD', 'packed-refs', 'refs'):
+                    affected.add('git')
+                continue
+            if exclude.intersection(parts):
+                continue
+
+            if is_dependency_file(parts):
+                affected.add('manifest')
+            if parts[-1].endswith('.py'):
+                affected.add('api')
+            if kind != 'modified' or self.config.include_statistics:
+                affected.add('tree')
+
+        for name in affected:
+            self._results.pop(name, None)
+        if 'template' in affected:
+            self._setup_template_environment()
+            self._template_inputs_cache = None
+            self._last_content_key = None
+        if affected:
+            logger.debug(f"重新运行收集器: {', '.join(sorted(affected))}")
+        return affected
+
+    def _generated_paths(self) -> List[str]:
+        """项目目录中由生成器自身写入的文件与目录（输出文件和各缓存目录）
+
+        这些路径不进入结构树也不参与文件统计，否则第一次生成后结构树多出 README，
+        统计计入 README 自身的大小，生成后立即 --check 会判定为过期。
+        返回的路径以项目根目录开头，与遍历的条目一致。
+        """
+        root = str(self.config.project_root)
+        abs_root = os.path.abspath(root)
+        paths = []
+        for path in (self.config.output_path, self.config.cache_dir,
+                     self.config.template_cache_dir, self.config.llm_cache_dir):
+            if not path:
+                continue
+            rel = os.path.relpath(os.path.abspath(path), abs_root)
+            if rel == os.curdir or rel.split(os.sep, 1)[0] == os.pardir:
+                continue
+            paths.append(os.path.join(root, rel))
+        return paths
 
     def preview(self) -> str:
         """预览生成的内容"""
         logger.info("生成预览...")
         project_info = self._collect_project_info()
-        return self.template.render(**project_info)
+        return self._render(project_info)
+
+    def preview_stream(self, stream: TextIO):
+        """预览生成的内容，逐块写入 stream（例如标准输出）"""
+        logger.info("生成预览...")
+        project_info = self._collect_project_info()
+        with span('write'):
+            for chunk in self._render_chunks(project_info):
+                stream.write(chunk)
+            stream.flush()
+
+    def _collect_project_info(self, reuse: bool = False) -> Dict[str, Any]:
+        """收集项目信息
+
+        reuse 为 True 时复用尚未被 invalidate 标记失效的收集器结果（用于监视模式）。
+        """
+        with span('collect', reuse=reuse):
+            return self._collect(reuse)
+
+    def _collect(self, reuse: bool) -> Dict[str, Any]:
+        if not reuse:
+            self._results.clear()
+
+        # 目录只遍历一次，结果共享给结构树、入口点和清单检测
+        fresh_tree = 'tree' not in self._results
+        if fresh_tree:
+            # 低内存模式下结构树与统计的文件列表超出阈值后溢出到临时文件
+            threshold = spill_threshold(self.config.max_memory_mb)
+            statistics = None
+            if self.config.include_statistics:
+                statistics = StatisticsCollector(
+                    LineCounter(self.config.project_root, self.config.line_count_workers, self.cache),
+                    threshold)
+            with span('collect.scan'):
+                tree = self.project_analyzer.scan(statistics=statistics)
+            with span('collect.structure'):
+                structure = self.project_analyzer.get_structure_lines(tree=tree,
+                                                                      spill_threshold=threshold)
+            with span('collect.entry_points'):
+                entry_points = self.project_analyzer.get_entry_points(tree)
+            with span('collect.statistics'):
+                statistics = statistics.result() if statistics else None
+            self._results['tree'] = (tree, structure, entry_points, statistics)
+        tree, structure, entry_points, statistics = self._results['tree']
+
+        if 'manifest' not in self._results:
+            # 复用的目录条目中的 stat 结果可能已过期，此时重新扫描根目录
+            # 根目录条目超出上限时 tree.entries 不完整，也需要重新扫描
+            with span('collect.manifest'):
+                manifest = self._get_manifest(tree.entries if fresh_tree and tree.complete else None)
+            with span('collect.dependencies'):
+                dependencies = self.project_analyzer.get_dependencies(manifest)
+            self._results['manifest'] = (manifest, dependencies)
+        manifest, dependencies = self._results['manifest']
 
-    def _collect_project_info(self) -> Dict[str, Any]:
-        """收集项目信息"""
         info = {
-            'project_name': self.config.project_name or self._detect_project_name(),
-            'project_description': self.config.project_description or self._detect_project_description(),
+            'project_name': self.config.project_name or self._detect_project_name(manifest),
+            'project_description': self.config.project_description or self._detect_project_description(manifest),
             'author': self.config.author,
             'license': self.config.license,
             'python_version': self.config.python_version,
-            'generated_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'generated_date': self._generated_date(),
             'include_badges': self.config.include_badges,
             'include_toc': self.config.include_toc,
             'include_installation': self.config.include_installation,
@@ -88,12 +482,15 @@ class ReadmeGenerator:
             'include_api_docs': self.config.include_api_docs,
             'include_contributing': self.config.include_contributing,
             'include_changelog': self.config.include_changelog,
+            'include_statistics': self.config.include_statistics,
         }
 
         # Git 信息
-        if self.config.git_auto_detect and GIT_AVAILABLE:
-            git_info = self._detect_git_info()
-            info.update(git_info)
+        if self.config.git_auto_detect:
+            if 'git' not in self._results:
+                with span('collect.git'):
+                    self._results['git'] = self._detect_git_info()
+            info.update(self._results['git'])
         else:
             info.update({
                 'github_username': self.config.github_username,
@@ -102,243 +499,146 @@ class ReadmeGenerator:
             })
 
         # 项目结构分析
-        info['project_structure'] = self.project_analyzer.get_structure()
-        info['dependencies'] = self.project_analyzer.get_dependencies()
-        info['entry_points'] = self.project_analyzer.get_entry_points()
+        info['project_structure'] = structure
+        info['dependencies'] = dependencies
+        info['entry_points'] = entry_points
+        info['statistics'] = statistics
+
+        # API 文档；项目统计中的函数与类数量同样来自 API 提取的解析结果
+        if self.config.include_api_docs or statistics is not None:
+            if 'api' not in self._results:
+                from .api_docs import iter_tree_python_files
+                with span('collect.api'):
+                    # 复用共享的目录遍历结果，只另行扫描结构树中不完整的目录
+                    self._results['api'] = self.api_extractor.extract(
+                        iter_tree_python_files(tree, self.config.exclude_files))
+            if self.config.include_api_docs:
+                info['api'] = self._results['api']
+            if statistics is not None:
+                info['statistics'] = self._python_metrics(statistics, self._results['api'])
 
         # 生成徽章
         if self.config.include_badges:
-            info['badges'] = self.badge_generator.generate_badges(info)
+            with span('collect.badges'):
+                info['badges'] = self.badge_generator.generate_badges(info)
 
         # 自定义章节
         info['custom_sections'] = self.config.custom_sections
 
         return info
 
-    def _detect_project_name(self) -> str:
+    @staticmethod
+    def _python_metrics(statistics: Dict[str, Any],
+                        modules: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """在统计结果中加入 Python 指标: 文件数、代码行数、函数与类的数量"""
+        from .api_docs import code_metrics
+        python = next((item for item in statistics['extensions'] if item['extension'] == '.py'), {})
+        metrics = code_metrics(modules)
+        metrics.update(files=python.get('files', 0), lines=python.get('lines', 0))
+        return dict(statistics, python=metrics)
+
+    @property
+    def api_extractor(self):
+        """API 提取器（仅在启用 API 文档时导入）"""
+        if self._api_extractor is None:
+            from .api_docs import ApiExtractor
+            self._api_extractor = ApiExtractor(self.config.project_root, self.config.exclude_files,
+                                               self.config.api_workers, self.cache)
+        return self._api_extractor
+
+    @property
+    def last_tree(self) -> Optional[DirectoryTree]:
+        """最近一次收集项目信息时的目录遍历结果"""
+        result = self._results.get('tree')
+        return result[0] if result else None
+
+    @property
+    def manifest(self) -> ProjectManifest:
+        """项目清单快照（按 mtime 失效的缓存）"""
+        return self._get_manifest()
+
+    def _get_manifest(self, root_entries=None) -> ProjectManifest:
+        """获取项目清单，root_entries 为已扫描的根目录条目"""
+        if root_entries is not None:
+            root_entries = list(root_entries)
+        if self._manifest is None or self._manifest.is_stale(root_entries):
+            if self.cache is not None:
+                self._manifest = ProjectManifest.load_cached(self.config.project_root, self.cache,
+                                                             root_entries)
+            else:
+                self._manifest = ProjectManifest.load(self.config.project_root, root_entries)
+        return self._manifest
+
+    def _generated_date(self) -> str:
+        """生成时间；确定性输出时取自 SOURCE_DATE_EPOCH，未设置时为空"""
+        if not self.config.deterministic_output:
+            return datetime.now().strftime(DATE_FORMAT)
+        epoch = os.environ.get('SOURCE_DATE_EPOCH')
+        if not epoch:
+            return ''
+        try:
+            return datetime.fromtimestamp(int(epoch), tz=timezone.utc).strftime(DATE_FORMAT)
+        except (ValueError, OverflowError):
+            logger.warning(f"无效的 SOURCE_DATE_EPOCH: {epoch}")
+            return ''
+
+    def _detect_project_name(self, manifest: Optional[ProjectManifest] = None) -> str:
         """自动检测项目名称"""
-        # 从 setup.py 检测
-        setup_py = self.config.project_root / 'setup.py'
-        if setup_py.exists():
-            try:
-                with open(setup_py, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
-                    if match:
-                        return match.group(1)
-            except Exception:
-                pass
-
-        # 从 pyproject.toml 检测
-        pyproject = self.config.project_root / 'pyproject.toml'
-        if pyproject.exists():
-            try:
-                import toml
-                with open(pyproject, 'r', encoding='utf-8') as f:
-                    data = toml.load(f)
-                    if 'project' in data and 'name' in data['project']:
-                        return data['project']['name']
-                    elif 'tool' in data and 'poetry' in data['tool'] and 'name' in data['tool']['poetry']:
-                        return data['tool']['poetry']['name']
-            except Exception:
-                pass
-
-        # 从目录名检测
-        return self.config.project_root.name
-
-    def _detect_project_description(self) -> str:
+        manifest = manifest or self.manifest
+        # 依次从 setup.py、pyproject.toml、setup.cfg 检测，最后使用目录名
+        return manifest.name or self.config.project_root.name
+
+    def _detect_project_description(self, manifest: Optional[ProjectManifest] = None) -> str:
         """自动检测项目描述"""
-        # 从 setup.py 检测
-        setup_py = self.config.project_root / 'setup.py'
-        if setup_py.exists():
-            try:
-                with open(setup_py, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    match = re.search(r'description\s*=\s*["\']([^"\']+)["\']', content)
-                    if match:
-                        return match.group(1)
-            except Exception:
-                pass
-
-        # 从 pyproject.toml 检测
-        pyproject = self.config.project_root / 'pyproject.toml'
-        if pyproject.exists():
-            try:
-                import toml
-                with open(pyproject, 'r', encoding='utf-8') as f:
-                    data = toml.load(f)
-                    if 'project' in data and 'description' in data['project']:
-                        return data['project']['description']
-                    elif 'tool' in data and 'poetry' in data['tool'] and 'description' in data['tool']['poetry']:
-                        return data['tool']['poetry']['description']
-            except Exception:
-                pass
-
-        return "一个 Python 项目"
+        manifest = manifest or self.manifest
+        return manifest.description or "一个 Python 项目"
 
     def _detect_git_info(self) -> Dict[str, str]:
-        """检测 Git 信息"""
-        if not GIT_AVAILABLE:
-            return {}
+        """检测 Git 信息
+
+        直接解析 .git 目录（不启动子进程、不导入 GitPython）；
+        解析失败且安装了 GitPython 时退回到 GitPython。
+        """
+        try:
+            repo = GitRepository.discover(self.config.project_root)
+            if repo is None:
+                logger.warning(f"未找到 Git 仓库: {self.config.project_root}")
+                return {}
+            return repo.info()
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            if not GIT_AVAILABLE:
+                logger.warning(f"无法检测 Git 信息: {e}")
+                return {}
+            logger.debug(f"解析 .git 目录失败，改用 GitPython: {e}")
+        return self._read_git_info()
+
+    def _git_state_files(self) -> Set[str]:
+        """Git 信息所依赖的文件"""
+        if not self.config.git_auto_detect:
+            return set()
+        try:
+            repo = GitRepository.discover(self.config.project_root)
+        except (OSError, ValueError):
+            return set()
+        return {os.path.abspath(path) for path in repo.state_files()} if repo else set()
 
+    def _read_git_info(self) -> Dict[str, str]:
+        """使用 GitPython 读取远程地址并解析 GitHub 信息"""
         try:
-            repo = git.Repo(self.config.project_root)
-            remote_url = repo.remotes.origin.url
-
-            # 解析 GitHub URL
-            if 'github.com' in remote_url:
-                # 处理 SSH 和 HTTPS URL
-                if remote_url.startswith('git@'):
-                    # SSH: git@github.com:username/repo.git
-                    match = re.search(r'git@github\.com:([^/]+)/([^.]+)', remote_url)
-                else:
-                    # HTTPS: https://github.com/username/repo.git
-                    match = re.search(r'github\.com/([^/]+)/([^.]+)', remote_url)
-
-                if match:
-                    username = match.group(1)
-                    repo_name = match.group(2).replace('.git', '')
-                    return {
-                        'github_username': username,
-                        'repository_name': repo_name,
-                        'git_url': f"https://github.com/{username}/{repo_name}"
-                    }
+            import git
+            repo = git.Repo(self.config.project_root, search_parent_directories=True)
+            info = parse_github_url(repo.remotes.origin.url)
+            if not repo.head.is_detached:
+                info['git_branch'] = repo.active_branch.name
+            if repo.head.is_valid():
+                info['head_sha'] = repo.head.commit.hexsha
+            return info
         except Exception as e:
             logger.warning(f"无法检测 Git 信息: {e}")
 
         return {}
 
-    def _get_default_template(self) -> str:
+    @staticmethod
+    def _get_default_template() -> str:
         """获取默认模板"""
-        return '''# {{ project_name }}
-
-{{ project_description }}
-
-{% if include_badges and badges %}
-{% for badge in badges %}
-{{ badge }}
-{% endfor %}
-
-{% endif %}
-{% if include_toc %}
-## 目录
-
-- [安装](#安装)
-- [使用](#使用)
-{% if include_api_docs %}
-- [API 文档](#api-文档)
-{% endif %}
-{% if include_contributing %}
-- [贡献](#贡献)
-{% endif %}
-- [许可证](#许可证)
-
-{% endif %}
-## 特性
-
-- ✨ 功能特性 1
-- 🚀 功能特性 2
-- 📦 功能特性 3
-
-{% if include_installation %}
-## 安装
-
-### 环境要求
-
-- Python {{ python_version }}
-
-### 安装方法
-
-```bash
-# 克隆仓库
-git clone {{ git_url }}
-cd {{ repository_name }}
-
-# 安装依赖
-pip install -r requirements.txt
-```
-
-{% endif %}
-{% if include_usage %}
-## 使用
-
-### 基本用法
-
-```python
-# 添加使用示例
-import {{ project_name.lower().replace('-', '_') }}
-
-# 示例代码
-```
-
-### 命令行使用
-
-```bash
-python main.py --help
-```
-
-{% endif %}
-{% if project_structure %}
-## 项目结构
-
-```
-{{ project_structure }}
-```
-
-{% endif %}
-{% if dependencies %}
-## 依赖
-
-{% for dep in dependencies %}
-- {{ dep }}
-{% endfor %}
-
-{% endif %}
-{% if custom_sections %}
-{% for section in custom_sections %}
-## {{ section.title }}
-
-{{ section.content }}
-
-{% endfor %}
-{% endif %}
-{% if include_api_docs %}
-## API 文档
-
-详细的 API 文档请参考 [docs/](docs/) 目录。
-
-{% endif %}
-{% if include_contributing %}
-## 贡献
-
-欢迎贡献！请阅读 [CONTRIBUTING.md](CONTRIBUTING.md) 了解详情。
-
-### 开发环境设置
-
-```bash
-# 克隆仓库
-git clone {{ git_url }}
-cd {{ repository_name }}
-
-# 创建虚拟环境
-python -m venv venv
-source venv/bin/activate  # Windows: venv\\Scripts\\activate
-
-# 安装开发依赖
-pip install -r requirements-dev.txt
-```
-
-{% endif %}
-## 许可证
-
-本项目采用 {{ license }} 许可证 - 详见 [LICENSE](LICENSE) 文件。
-
-## 作者
-
-{{ author }}
-
----
-
-*本 README 由 [README Generator](https://github.com/your-username/readme-generator) 自动生成于 {{ generated_date }}*
-'''
-'''
+        return DEFAULT_TEMPLATE
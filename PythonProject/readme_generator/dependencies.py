@@ -0,0 +1,544 @@
+"""
+依赖解析模块
+通过 ast 静态读取 setup.py（不执行），跟随 requirements 文件中的 -r 引用（检测循环引用），
+逐行流式解析 poetry.lock / uv.lock / Pipfile.lock 获取锁定版本，
+Poetry 的 ^、~ 等版本约束转换为 PEP 440 约束；
+各文件的解析结果按文件指纹缓存，输出按规范化的包名排序，保证每次运行结果一致
+"""
+
+import ast
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .cache import AnalysisCache
+
+logger = logging.getLogger(__name__)
+
+# 缓存格式版本，解析逻辑变化时递增
+DEPENDENCY_CACHE_VERSION = 2
+
+# 锁文件，按优先级排列（同一个包在多个锁文件中时取第一个）
+LOCK_FILES = ('poetry.lock', 'uv.lock', 'Pipfile.lock')
+
+# setup.py 中解析变量引用的最大深度，防止自引用的赋值导致死循环
+MAX_RESOLVE_DEPTH = 16
+
+_NAME_RE = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+_EGG_RE = re.compile(r'#egg=([A-Za-z0-9][A-Za-z0-9._-]*)')
+# requirements 文件中每行依赖之后允许出现的选项（pip 只支持这几个长选项）
+_OPTION_RE = re.compile(r'\s+--(hash|global-option|install-option|config-settings)\b.*$')
+_TOML_KEY_RE = re.compile(r'^(name|version)\s*=\s*"([^"]*)"')
+_JSON_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+_JSON_KEY_RE = re.compile(r'^\s*"([^"]+)"\s*:\s*(.*)$')
+_POETRY_CLAUSE_RE = re.compile(r'^(\^|~=|~|>=|<=|==|!=|>|<|=)?\s*(.*)$')
+_RELEASE_RE = re.compile(r'^\d+(\.\d+)*')
+
+
+def canonical_name(requirement: str) -> Optional[str]:
+  """依赖的规范化包名（PEP 503），无法识别时返回 None"""
+  match = _NAME_RE.match(requirement)
+  if not match:
+    return None
+  return re.sub(r'[-_.]+', '-', match.group(1)).lower()
+
+
+# ---- setup.py ----
+
+
+class _SetupEvaluator:
+  """在不执行 setup.py 的前提下求值 install_requires
+
+  支持字面量列表/元组、模块级变量、列表拼接（+ 与 +=）以及 setup(**kwargs)；
+  表达式中引用的 .txt 文件（例如 open('requirements.txt').read().splitlines()）
+  视为 requirements 引用。无法静态求值的部分忽略。
+  """
+
+  def __init__(self, tree: ast.Module):
+    self.assignments: Dict[str, ast.expr] = {}
+    self.requirements: List[str] = []
+    self.includes: List[str] = []
+    for node in ast.walk(tree):
+      if isinstance(node, ast.Assign):
+        for target in node.targets:
+          if isinstance(target, ast.Name):
+            self.assignments[target.id] = node.value
+      elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value:
+        self.assignments[node.target.id] = node.value
+      elif (isinstance(node, ast.AugAssign) and isinstance(node.op, ast.Add) and
+            isinstance(node.target, ast.Name) and node.target.id in self.assignments):
+        self.assignments[node.target.id] = ast.BinOp(self.assignments[node.target.id],
+                                                     ast.Add(), node.value)
+      elif isinstance(node, ast.With):
+        # with open('requirements.txt') as f: 中的 f
+        for item in node.items:
+          if isinstance(item.optional_vars, ast.Name):
+            self.assignments[item.optional_vars.id] = item.context_expr
+
+  def evaluate(self, node: ast.expr, depth: int = 0):
+    if depth > MAX_RESOLVE_DEPTH:
+      return
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+      # 多行字符串（例如 "a\nb".split()）按行拆分
+      self.requirements.extend(
+          line.strip() for line in node.value.splitlines() if line.strip())
+    elif isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+      for element in node.elts:
+        self.evaluate(element, depth + 1)
+    elif isinstance(node, ast.Name):
+      value = self.assignments.get(node.id)
+      if value is not None:
+        self.evaluate(value, depth + 1)
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+      self.evaluate(node.left, depth + 1)
+      self.evaluate(node.right, depth + 1)
+    elif not self._find_includes(node, depth):
+      logger.debug(f"setup.py 中的 install_requires 无法静态求值: {ast.dump(node)[:80]}")
+
+  def string(self, node: ast.expr, depth: int = 0) -> Optional[str]:
+    """求值字符串表达式（字面量、变量引用与字符串拼接），无法静态求值时返回 None"""
+    if depth > MAX_RESOLVE_DEPTH:
+      return None
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+      return node.value
+    if isinstance(node, ast.Name) and node.id in self.assignments:
+      return self.string(self.assignments[node.id], depth + 1)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+      left = self.string(node.left, depth + 1)
+      right = self.string(node.right, depth + 1)
+      if left is not None and right is not None:
+        return left + right
+    return None
+
+  def _find_includes(self, node: ast.expr, depth: int) -> bool:
+    """在表达式（及其引用的变量）中查找 .txt 文件名，找到时记为 requirements 引用"""
+    if depth > MAX_RESOLVE_DEPTH:
+      return False
+    found = False
+    for child in ast.walk(node):
+      if (isinstance(child, ast.Constant) and isinstance(child.value, str) and
+          child.value.endswith('.txt')):
+        if child.value not in self.includes:
+          self.includes.append(child.value)
+        found = True
+      elif isinstance(child, ast.Name) and child.id in self.assignments:
+        found = self._find_includes(self.assignments[child.id], depth + 1) or found
+    return found
+
+  def keyword(self, call: ast.Call, name: str) -> Optional[ast.expr]:
+    """setup() 调用中指定参数的表达式，包括通过 **kwargs 传入的字典"""
+    for keyword in call.keywords:
+      if keyword.arg == name:
+        return keyword.value
+      if keyword.arg is None:
+        value = keyword.value
+        if isinstance(value, ast.Name):
+          value = self.assignments.get(value.id)
+        if isinstance(value, ast.Dict):
+          for key, item in zip(value.keys, value.values):
+            if isinstance(key, ast.Constant) and key.value == name:
+              return item
+        elif isinstance(value, ast.Call) and _call_name(value) == 'dict':
+          found = self.keyword(value, name)
+          if found is not None:
+            return found
+    return None
+
+
+def _call_name(call: ast.Call) -> Optional[str]:
+  func = call.func
+  if isinstance(func, ast.Name):
+    return func.id
+  if isinstance(func, ast.Attribute):
+    return func.attr
+  return None
+
+
+def _setup_call(tree: ast.Module) -> Optional[ast.Call]:
+  for node in ast.walk(tree):
+    if isinstance(node, ast.Call) and _call_name(node) == 'setup':
+      return node
+  return None
+
+
+def parse_setup_py(source: str) -> Tuple[List[str], List[str]]:
+  """静态解析 setup.py，返回 (install_requires 中的依赖, 引用的 requirements 文件)"""
+  try:
+    tree = ast.parse(source)
+  except (SyntaxError, ValueError) as e:
+    logger.warning(f"解析 setup.py 失败: {e}")
+    return [], []
+
+  evaluator = _SetupEvaluator(tree)
+  call = _setup_call(tree)
+  if call is not None:
+    value = evaluator.keyword(call, 'install_requires')
+    if value is not None:
+      evaluator.evaluate(value)
+  return evaluator.requirements, evaluator.includes
+
+
+def parse_setup_metadata(source: str,
+                         fields: Tuple[str, ...] = ('name', 'description')) -> Dict[str, str]:
+  """静态解析 setup.py 中 setup() 的字符串参数（例如 name、description）
+
+  只返回能静态求值为字符串的参数；语法错误时返回空字典（由依赖解析报告警告）。
+  """
+  try:
+    tree = ast.parse(source)
+  except (SyntaxError, ValueError):
+    return {}
+  call = _setup_call(tree)
+  if call is None:
+    return {}
+  evaluator = _SetupEvaluator(tree)
+  metadata = {}
+  for field in fields:
+    value = evaluator.keyword(call, field)
+    text = evaluator.string(value) if value is not None else None
+    if text and text.strip():
+      metadata[field] = text.strip()
+  return metadata
+
+
+# ---- requirements 文件 ----
+
+
+def _logical_lines(path: Path) -> Iterator[str]:
+  """逐行读取 requirements 文件，合并以反斜杠结尾的续行"""
+  pending = ''
+  with open(path, 'r', encoding='utf-8', errors='replace') as f:
+    for line in f:
+      line = line.rstrip('\n')
+      if line.endswith('\\'):
+        pending += line[:-1] + ' '
+        continue
+      yield pending + line
+      pending = ''
+  if pending:
+    yield pending
+
+
+def parse_requirements(path: Path) -> Tuple[List[str], List[str]]:
+  """解析 requirements 文件，返回 (依赖, -r 引用的文件)
+
+  忽略注释、--hash 等选项与 -c 约束文件；-e 只保留带 #egg= 的包名。
+  """
+  requirements: List[str] = []
+  includes: List[str] = []
+  for line in _logical_lines(path):
+    line = line.strip()
+    if not line or line.startswith('#'):
+      continue
+    line = re.sub(r'\s+#.*$', '', line)
+    if line.startswith(('-r', '--requirement')):
+      target = re.sub(r'^(-r|--requirement)[=\s]*', '', line).strip()
+      if target:
+        includes.append(target)
+      continue
+    if line.startswith(('-e', '--editable')):
+      match = _EGG_RE.search(line)
+      if match:
+        requirements.append(match.group(1))
+      continue
+    if line.startswith('-'):
+      # -c 约束文件、--index-url 等选项
+      continue
+    line = _OPTION_RE.sub('', line).strip()
+    if canonical_name(line):
+      requirements.append(line)
+  return requirements, includes
+
+
+# ---- 锁文件 ----
+
+
+def iter_toml_lock(path: Path) -> Iterator[Tuple[str, str]]:
+  """逐行解析 poetry.lock / uv.lock 中 [[package]] 的名称与版本
+
+  只读取每个 [[package]] 表顶层的 name 与 version 行，不构造整个 TOML 文档。
+  """
+  name = version = None
+  in_package = False
+  with open(path, 'r', encoding='utf-8', errors='replace') as f:
+    for line in f:
+      if line.startswith('['):
+        if name and version:
+          yield name, version
+        name = version = None
+        in_package = line.strip() == '[[package]]'
+        continue
+      if not in_package:
+        continue
+      match = _TOML_KEY_RE.match(line)
+      if match:
+        if match.group(1) == 'name' and name is None:
+          name = match.group(2)
+        elif match.group(1) == 'version' and version is None:
+          version = match.group(2)
+  if name and version:
+    yield name, version
+
+
+def iter_pipfile_lock(path: Path) -> Iterator[Tuple[str, str]]:
+  """逐行解析 Pipfile.lock 中 default 部分的包名与版本
+
+  pipenv 按每行一个键的格式写入 Pipfile.lock，按括号深度跟踪所在的对象，
+  不把整个 JSON 文档读入内存。
+  """
+  depth = 0
+  section = package = None
+  with open(path, 'r', encoding='utf-8', errors='replace') as f:
+    for line in f:
+      match = _JSON_KEY_RE.match(line)
+      if match:
+        key, rest = match.groups()
+        if depth == 1:
+          section = key
+        elif depth == 2 and section == 'default':
+          package = key
+        elif depth == 3 and section == 'default' and package and key == 'version':
+          yield package, rest.strip().rstrip(',').strip('"').lstrip('=')
+      # 去掉字符串后再数括号，避免字符串中的括号影响深度
+      stripped = _JSON_STRING_RE.sub('', line)
+      depth += stripped.count('{') - stripped.count('}')
+
+
+def parse_lock(path: Path) -> Dict[str, str]:
+  """解析锁文件，返回 {规范化包名: 锁定版本}"""
+  iterator = iter_pipfile_lock if path.name == 'Pipfile.lock' else iter_toml_lock
+  versions: Dict[str, str] = {}
+  for name, version in iterator(path):
+    key = canonical_name(name)
+    if key and key not in versions:
+      versions[key] = version
+  if not versions and path.name == 'Pipfile.lock':
+    # 不是每行一个键的格式（例如压缩的 JSON），整体解析
+    try:
+      with open(path, 'r', encoding='utf-8') as f:
+        packages = json.load(f).get('default', {})
+    except ValueError as e:
+      logger.warning(f"解析 {path.name} 失败: {e}")
+      return versions
+    for name, info in packages.items():
+      key = canonical_name(name)
+      if key and isinstance(info, dict) and info.get('version'):
+        versions.setdefault(key, info['version'].lstrip('='))
+  return versions
+
+
+# ---- 汇总 ----
+
+
+def _requirements_sort_key(name: str) -> Tuple[int, str]:
+  # requirements.txt 在前，其余 requirements*.txt 按名称排序
+  return (0 if name == 'requirements.txt' else 1, name)
+
+
+class DependencyResolver:
+  """项目依赖解析器
+
+  依赖来源依次为 requirements.txt（及其 -r 引用）、setup.py、setup.cfg、pyproject.toml、
+  Pipfile 与其他 requirements*.txt；同一个包只保留第一次出现的写法，
+  锁文件中有该包时附上锁定版本。结果按规范化的包名排序。
+  """
+
+  def __init__(self, project_root, cache: Optional[AnalysisCache] = None):
+    self.project_root = os.path.abspath(project_root)
+    self.cache = cache
+    # {路径: [size, mtime_ns, 解析结果]}
+    self._previous: Dict[str, list] = {}
+    self._current: Dict[str, list] = {}
+    self._parsed = 0
+
+  def _cache_key(self) -> str:
+    return f"{DEPENDENCY_CACHE_VERSION}:{self.project_root}"
+
+  def _cached(self, path: Path, parse) -> Any:
+    """按文件大小与 mtime 缓存单个文件的解析结果"""
+    key = os.path.abspath(path)
+    try:
+      st = os.stat(key)
+    except OSError:
+      return None
+    cached = self._previous.get(key)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+      self._current[key] = cached
+      return cached[2]
+    try:
+      result = parse(Path(key))
+    except (OSError, UnicodeDecodeError) as e:
+      logger.warning(f"读取 {path} 失败: {e}")
+      return None
+    self._parsed += 1
+    self._current[key] = [st.st_size, st.st_mtime_ns, result]
+    return result
+
+  def _requirements(self, path: Path, seen: Set[str],
+                    stack: Tuple[str, ...] = ()) -> List[str]:
+    """解析 requirements 文件并跟随 -r 引用
+
+    seen 记录已解析的文件（被多次引用的文件只解析一次），stack 为当前的引用链，用于检测循环引用。
+    """
+    real = os.path.realpath(path)
+    if real in stack:
+      logger.warning(f"requirements 文件存在循环引用，已忽略: {path}")
+      return []
+    if real in seen:
+      return []
+    seen.add(real)
+    result = self._cached(path, lambda p: list(parse_requirements(p)))
+    if result is None:
+      return []
+    requirements, includes = result
+    requirements = list(requirements)
+    for include in includes:
+      target = path.parent / include
+      if target.is_file():
+        requirements.extend(self._requirements(target, seen, stack + (real,)))
+      else:
+        logger.warning(f"{path.name} 引用的文件不存在: {include}")
+    return requirements
+
+  def resolve(self, manifest) -> List[str]:
+    """汇总 manifest（ProjectManifest）描述的项目的依赖"""
+    root = Path(self.project_root)
+    names = {name for name, _, _ in manifest.fingerprint}
+    if self.cache is not None:
+      self._previous = self.cache.get('dependencies', self._cache_key()) or {}
+    self._current = {}
+    self._parsed = 0
+
+    sources: List[str] = []
+    seen: Set[str] = set()
+    requirement_files = sorted((name for name in names
+                                if name.startswith('requirements') and name.endswith('.txt')),
+                               key=_requirements_sort_key)
+    if 'requirements.txt' in requirement_files:
+      sources.extend(self._requirements(root / 'requirements.txt', seen))
+
+    if manifest.setup_py:
+      requirements, includes = self._cached(
+          root / 'setup.py', lambda _: list(parse_setup_py(manifest.setup_py))) or ([], [])
+      sources.extend(requirements)
+      for include in includes:
+        target = root / include
+        if target.is_file():
+          sources.extend(self._requirements(target, seen))
+
+    if manifest.setup_cfg is not None:
+      raw = manifest.setup_cfg.get('options', 'install_requires', fallback='')
+      sources.extend(line.strip() for line in raw.splitlines() if line.strip())
+
+    data = manifest.pyproject
+    if 'project' in data:
+      sources.extend(data['project'].get('dependencies', []))
+    poetry_deps = data.get('tool', {}).get('poetry', {}).get('dependencies', {})
+    for name, spec in poetry_deps.items():
+      if name != 'python':
+        sources.append(poetry_requirement(name, spec))
+
+    if 'Pipfile' in names:
+      sources.extend(self._cached(root / 'Pipfile', _parse_pipfile) or [])
+
+    for name in requirement_files:
+      if name != 'requirements.txt':
+        sources.extend(self._requirements(root / name, seen))
+
+    locked: Dict[str, str] = {}
+    for name in LOCK_FILES:
+      if name in names:
+        for key, version in (self._cached(root / name, parse_lock) or {}).items():
+          locked.setdefault(key, version)
+
+    dependencies: Dict[str, str] = {}
+    for requirement in sources:
+      key = canonical_name(requirement)
+      if key and key not in dependencies:
+        dependencies[key] = requirement
+
+    if self.cache is not None and (self._parsed or self._current.keys() != self._previous.keys()):
+      self.cache.put('dependencies', self._cache_key(), self._current)
+    if self._parsed:
+      logger.debug(f"解析了 {self._parsed} 个依赖文件")
+
+    result = []
+    for key in sorted(dependencies):
+      requirement = dependencies[key]
+      version = locked.get(key)
+      if version and f"=={version}" not in requirement.replace(' ', ''):
+        requirement = f"{requirement} (锁定 {version})"
+      result.append(requirement)
+    return result
+
+
+# ---- Poetry 版本约束 ----
+
+
+def _bump(release: List[int], index: int) -> str:
+  """把 release 的第 index 段加一、之后各段清零，作为上限版本"""
+  parts = release[:index] + [release[index] + 1] + [0] * (len(release) - index - 1)
+  return '.'.join(str(part) for part in parts)
+
+
+def _poetry_clause(clause: str) -> List[str]:
+  """把单个 Poetry 约束（^1.2、~1.2、1.2.*、1.2、>=1.2 等）转换为 PEP 440 约束"""
+  operator, version = _POETRY_CLAUSE_RE.match(clause.strip()).groups()
+  version = version.strip()
+  if version in ('', '*'):
+    return []
+  release_match = _RELEASE_RE.match(version)
+  if operator in ('^', '~') and release_match:
+    release = [int(part) for part in release_match.group(0).split('.')]
+    if operator == '^':
+      # 第一个非零段不变（全为零时取最后一段）
+      index = next((i for i, part in enumerate(release) if part), len(release) - 1)
+    else:
+      index = min(1, len(release) - 1)
+    return [f">={version}", f"<{_bump(release, index)}"]
+  if operator in (None, '=', '^', '~'):
+    return [f"=={version}"]
+  return [f"{operator}{version}"]
+
+
+def poetry_requirement(name: str, spec: Any) -> str:
+  """把 [tool.poetry.dependencies] 中的一项转换为 requirements 格式
+
+  字符串约束与 {version = "..."} 转换为 PEP 440 约束（* 表示不限版本）；
+  git、path、url 依赖以及多个约束（列表）或"或"约束 (||) 只保留包名。
+  """
+  extras = ''
+  if isinstance(spec, dict):
+    if spec.get('extras'):
+      extras = f"[{','.join(spec['extras'])}]"
+    spec = spec.get('version', '*')
+  if not isinstance(spec, str) or '|' in spec:
+    return name + extras
+  clauses: List[str] = []
+  for clause in spec.split(','):
+    clauses.extend(_poetry_clause(clause))
+  return f"{name}{extras}{','.join(clauses)}"
+
+
+def _parse_pipfile(path: Path) -> List[str]:
+  """Pipfile 中 [packages] 部分的依赖"""
+  try:
+    import toml
+  except ImportError:
+    logger.warning("需要安装 toml 包来解析 Pipfile")
+    return []
+  try:
+    with open(path, 'r', encoding='utf-8') as f:
+      packages = toml.load(f).get('packages', {})
+  except Exception as e:
+    logger.warning(f"读取 Pipfile 失败: {e}")
+    return []
+  requirements = []
+  for name, spec in packages.items():
+    if isinstance(spec, dict):
+      spec = spec.get('version', '*')
+    requirements.append(name if spec in ('*', '') else f"{name}{spec}")
+  return requirements
@@ -0,0 +1,281 @@
+"""
+Git 信息模块
+直接解析 .git 目录中的 config、HEAD、packed-refs 与工作树的 gitdir 文件，
+获取远程地址、当前分支、默认分支和 HEAD 提交，不启动 git 子进程也不导入 GitPython
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 解析 GitHub 远程地址，支持以下形式：
+#   git@github.com:username/repo.git
+#   ssh://git@github.com/username/repo.git
+#   https://github.com/username/repo.git
+_GITHUB_URL_RE = re.compile(
+    r'github\.com[:/](?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?/*$')
+
+# git config 中的节: [section] 或 [section "subsection"]
+_SECTION_RE = re.compile(r'^\[\s*([^\s\]"]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+
+_SHA_RE = re.compile(r'^[0-9a-f]{40}([0-9a-f]{24})?$')
+
+
+def find_git_dir(project_root) -> Optional[Tuple[str, str]]:
+  """从项目目录向上查找 Git 仓库
+
+  返回 (git_dir, common_dir)：git_dir 存放 HEAD，common_dir 存放 config、
+  packed-refs 与 refs（普通仓库中两者相同，工作树中 common_dir 为主仓库的 .git）。
+  未找到时返回 None。
+  """
+  path = os.path.abspath(project_root)
+  while True:
+    dot_git = os.path.join(path, '.git')
+    if os.path.isdir(dot_git):
+      git_dir = dot_git
+      break
+    if os.path.isfile(dot_git):
+      # 工作树或子模块: .git 文件内容为 "gitdir: <路径>"
+      with open(dot_git, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+      if not content.startswith('gitdir:'):
+        raise ValueError(f"无法识别的 .git 文件: {dot_git}")
+      git_dir = os.path.normpath(
+          os.path.join(path, content[len('gitdir:'):].strip()))
+      break
+    parent = os.path.dirname(path)
+    if parent == path:
+      return None
+    path = parent
+
+  common_dir = git_dir
+  commondir_file = os.path.join(git_dir, 'commondir')
+  if os.path.isfile(commondir_file):
+    with open(commondir_file, 'r', encoding='utf-8') as f:
+      common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+  return git_dir, common_dir
+
+
+def _unquote(value: str) -> str:
+  """去除 git config 值中的引号、行尾注释与转义"""
+  result = []
+  quoted = False
+  i = 0
+  while i < len(value):
+    ch = value[i]
+    if ch == '"':
+      quoted = not quoted
+    elif ch == '\\' and i + 1 < len(value):
+      i += 1
+      result.append({'n': '\n', 't': '\t', 'b': '\b'}.get(value[i], value[i]))
+    elif ch in '#;' and not quoted:
+      break
+    else:
+      result.append(ch)
+    i += 1
+  return ''.join(result).strip()
+
+
+def parse_git_config(path: str) -> Dict[str, Dict[str, List[str]]]:
+  """解析 git config 文件
+
+  返回 {节名: {键: [值, ...]}}，节名形如 'core' 或 'remote.origin'，
+  键名小写；同一个键可以出现多次（例如 fetch）。
+  """
+  config: Dict[str, Dict[str, List[str]]] = {}
+  section = None
+  with open(path, 'r', encoding='utf-8', errors='replace') as f:
+    for raw in f:
+      line = raw.strip()
+      if not line or line[0] in '#;':
+        continue
+      match = _SECTION_RE.match(line)
+      if match:
+        name, sub = match.groups()
+        section = name.lower()
+        if sub is not None:
+          section += '.' + sub.replace('\\"', '"').replace('\\\\', '\\')
+        config.setdefault(section, {})
+        line = line[match.end():].strip()
+        if not line:
+          continue
+      if section is None:
+        continue
+      key, sep, value = line.partition('=')
+      # 没有 "=" 的键表示布尔值 true
+      config[section].setdefault(key.strip().lower(),
+                                 []).append(_unquote(value) if sep else 'true')
+  return config
+
+
+def _read_symbolic_ref(path: str) -> Optional[str]:
+  """读取 HEAD 之类的引用文件，返回 'ref: ...' 的目标或提交 sha"""
+  try:
+    with open(path, 'r', encoding='utf-8') as f:
+      content = f.read().strip()
+  except OSError:
+    return None
+  if content.startswith('ref:'):
+    return content[len('ref:'):].strip()
+  return content or None
+
+
+def _read_packed_refs(common_dir: str) -> Dict[str, str]:
+  """读取 packed-refs，返回 {引用名: sha}"""
+  refs = {}
+  try:
+    with open(os.path.join(common_dir, 'packed-refs'), 'r',
+              encoding='utf-8') as f:
+      for line in f:
+        # 以 # 开头的是文件头，以 ^ 开头的是附注标签指向的提交
+        if line.startswith(('#', '^')):
+          continue
+        parts = line.split()
+        if len(parts) == 2:
+          refs[parts[1]] = parts[0]
+  except OSError:
+    pass
+  return refs
+
+
+class GitRepository:
+  """只读的 Git 仓库信息"""
+
+  def __init__(self, git_dir: str, common_dir: Optional[str] = None):
+    self.git_dir = git_dir
+    self.common_dir = common_dir or git_dir
+    self._config: Optional[Dict[str, Dict[str, List[str]]]] = None
+    self._packed_refs: Optional[Dict[str, str]] = None
+
+  @classmethod
+  def discover(cls, project_root) -> Optional['GitRepository']:
+    """从项目目录向上查找仓库，未找到时返回 None"""
+    found = find_git_dir(project_root)
+    return cls(*found) if found else None
+
+  @property
+  def config(self) -> Dict[str, Dict[str, List[str]]]:
+    if self._config is None:
+      path = os.path.join(self.common_dir, 'config')
+      self._config = parse_git_config(path) if os.path.isfile(path) else {}
+    return self._config
+
+  def config_value(self, section: str, key: str) -> Optional[str]:
+    """读取配置项，多次出现时取最后一个值"""
+    values = self.config.get(section, {}).get(key.lower())
+    return values[-1] if values else None
+
+  def state_files(self) -> List[str]:
+    """Git 信息所依赖的文件，用于缓存指纹与变化检测"""
+    paths = [
+        os.path.join(self.git_dir, 'HEAD'),
+        os.path.join(self.common_dir, 'config'),
+        os.path.join(self.common_dir, 'packed-refs'),
+        os.path.join(self.common_dir, 'refs', 'remotes', 'origin', 'HEAD')
+    ]
+    head = _read_symbolic_ref(paths[0])
+    if head and head.startswith('refs/'):
+      paths.append(os.path.join(self.common_dir, *head.split('/')))
+    return [path for path in paths if os.path.exists(path)]
+
+  def resolve_ref(self, ref: str, depth: int = 0) -> Optional[str]:
+    """将引用名解析为提交 sha（跟随符号引用）"""
+    if _SHA_RE.match(ref):
+      return ref
+    if depth > 5:
+      return None
+    # HEAD 之类的伪引用在 git_dir 中，其余引用在 common_dir 中
+    base = self.git_dir if '/' not in ref else self.common_dir
+    target = _read_symbolic_ref(os.path.join(base, *ref.split('/')))
+    if target is None:
+      if self._packed_refs is None:
+        self._packed_refs = _read_packed_refs(self.common_dir)
+      return self._packed_refs.get(ref)
+    return self.resolve_ref(target, depth + 1)
+
+  @property
+  def head_ref(self) -> Optional[str]:
+    """HEAD 指向的引用名，分离头指针时为 None"""
+    head = _read_symbolic_ref(os.path.join(self.git_dir, 'HEAD'))
+    return head if head and head.startswith('refs/') else None
+
+  @property
+  def branch(self) -> Optional[str]:
+    """当前分支名"""
+    ref = self.head_ref
+    if ref and ref.startswith('refs/heads/'):
+      return ref[len('refs/heads/'):]
+    return None
+
+  @property
+  def head_sha(self) -> Optional[str]:
+    """HEAD 指向的提交，尚无提交时为 None"""
+    return self.resolve_ref('HEAD')
+
+  @property
+  def remote_name(self) -> Optional[str]:
+    """优先使用 origin，其次为当前分支跟踪的远程，最后为第一个远程"""
+    remotes = [
+        section[len('remote.'):]
+        for section in self.config
+        if section.startswith('remote.') and
+        self.config_value(section, 'url')
+    ]
+    if 'origin' in remotes:
+      return 'origin'
+    branch = self.branch
+    tracked = self.config_value(f'branch.{branch}', 'remote') if branch else None
+    if tracked in remotes:
+      return tracked
+    return remotes[0] if remotes else None
+
+  @property
+  def remote_url(self) -> Optional[str]:
+    remote = self.remote_name
+    return self.config_value(f'remote.{remote}', 'url') if remote else None
+
+  @property
+  def default_branch(self) -> Optional[str]:
+    """默认分支: 远程 HEAD 指向的分支，其次为 init.defaultBranch，最后为当前分支"""
+    remote = self.remote_name
+    if remote:
+      prefix = f'refs/remotes/{remote}/'
+      target = _read_symbolic_ref(
+          os.path.join(self.common_dir, *prefix.split('/'), 'HEAD'))
+      if target and target.startswith(prefix):
+        return target[len(prefix):]
+    return self.config_value('init', 'defaultbranch') or self.branch
+
+  def info(self) -> Dict[str, str]:
+    """返回模板使用的 Git 信息"""
+    info = {}
+    branch = self.branch
+    if branch:
+      info['git_branch'] = branch
+    default_branch = self.default_branch
+    if default_branch:
+      info['default_branch'] = default_branch
+    head_sha = self.head_sha
+    if head_sha:
+      info['head_sha'] = head_sha
+    info.update(parse_github_url(self.remote_url or ''))
+    return info
+
+
+def parse_github_url(remote_url: str) -> Dict[str, str]:
+  """从远程地址解析 GitHub 用户名与仓库名，不是 GitHub 地址时返回空字典"""
+  match = _GITHUB_URL_RE.search(remote_url.strip())
+  if not match:
+    return {}
+  username, repo_name = match.group('owner'), match.group('repo')
+  return {
+      'github_username': username,
+      'repository_name': repo_name,
+      'git_url': f"https://github.com/{username}/{repo_name}"
+  }
+
+
+def read_git_info(project_root) -> Optional[Dict[str, str]]:
+  """读取项目所在仓库的 Git 信息，不在 Git 仓库中时返回 None"""
+  repo = GitRepository.discover(project_root)
+  return repo.info() if repo is not None else None
@@ -0,0 +1,152 @@
+"""
+行数统计模块
+内存映射每个文件，直接在字节上计数换行符（不解码）；
+根据文件头判断并跳过二进制文件，在线程池中并行统计，
+并按文件大小与 mtime 缓存每个文件的结果
+"""
+
+import logging
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import AnalysisCache
+
+logger = logging.getLogger(__name__)
+
+# 判断二进制文件时读取的文件头字节数
+SNIFF_BYTES = 8192
+
+# 小于该大小的文件直接读取，内存映射的开销不划算
+MMAP_THRESHOLD = 64 * 1024
+
+# 在内存映射上每次计数的字节数
+COUNT_CHUNK = 1024 * 1024
+
+# 文件数量少于该值时直接在当前线程中统计，避免线程池的开销
+PARALLEL_THRESHOLD = 32
+
+# iter_counts 每批处理的文件数，批内未命中缓存的文件并行统计
+COUNT_BATCH = 8192
+
+# 缓存格式版本，结果的结构变化时递增
+LINES_CACHE_VERSION = 1
+
+# 待统计的文件: (路径, 大小, mtime_ns)
+FileInfo = Tuple[str, int, int]
+
+
+def is_binary(header: bytes) -> bool:
+  """文件头中包含 NUL 字节时视为二进制文件（与 git 的判断方式相同）"""
+  return b'\0' in header
+
+
+def _count(data, size: int) -> int:
+  lines = 0
+  for start in range(0, size, COUNT_CHUNK):
+    lines += data[start:start + COUNT_CHUNK].count(b'\n')
+  return lines
+
+
+def count_lines(path: str) -> Optional[int]:
+  """统计文件行数，二进制文件或无法读取时返回 None
+
+  最后一行没有换行符时也计入。
+  """
+  try:
+    with open(path, 'rb') as f:
+      size = os.fstat(f.fileno()).st_size
+      if size == 0:
+        return 0
+      if size <= MMAP_THRESHOLD:
+        data = f.read()
+        if is_binary(data[:SNIFF_BYTES]):
+          return None
+        return data.count(b'\n') + (not data.endswith(b'\n'))
+
+      with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if is_binary(mm[:SNIFF_BYTES]):
+          return None
+        return _count(mm, size) + (mm[size - 1:size] != b'\n')
+  except (OSError, ValueError):
+    return None
+
+
+def _count_many(paths: List[str]) -> List[Optional[int]]:
+  return [count_lines(path) for path in paths]
+
+
+class LineCounter:
+  """项目行数统计，按文件大小与 mtime 增量统计"""
+
+  def __init__(self,
+               project_root,
+               workers: int = 0,
+               cache: Optional[AnalysisCache] = None):
+    self.project_root = os.path.abspath(project_root)
+    # 遍历得到的路径以传入的项目路径开头，直接截取前缀比 os.path.relpath 快得多
+    self._prefix = os.path.join(str(project_root), '')
+    self.workers = workers or os.cpu_count() or 1
+    self.cache = cache
+
+  def _cache_key(self) -> str:
+    return f"{LINES_CACHE_VERSION}:{self.project_root}"
+
+  def _relpath(self, path: str) -> str:
+    if path.startswith(self._prefix):
+      return path[len(self._prefix):]
+    return os.path.relpath(path, self.project_root)
+
+  def count(self, files: Iterable[FileInfo]) -> Dict[str, Optional[int]]:
+    """统计一组文件的行数，返回 {路径: 行数}，二进制文件的行数为 None"""
+    return dict(self.iter_counts(files))
+
+  def iter_counts(self, files: Iterable[FileInfo]) -> Iterator[Tuple[str, Optional[int]]]:
+    """按输入顺序逐个返回 (路径, 行数)，不保存全部结果（供低内存模式使用）
+
+    文件按 COUNT_BATCH 分批，批内未命中缓存的文件并行统计。
+    """
+    previous = (self.cache.get('lines', self._cache_key())
+                if self.cache is not None else None) or {}
+    current: Dict[str, list] = {}
+    counted = 0
+
+    def _flush(batch: List[Tuple[FileInfo, Optional[list]]]):
+      tasks = [info for info, cached in batch if cached is None]
+      computed = iter(self._run(tasks)) if tasks else iter(())
+      for (path, size, mtime_ns), cached in batch:
+        if cached is None:
+          cached = [size, mtime_ns, next(computed)]
+        current[self._relpath(path)] = cached
+        yield path, cached[2]
+
+    batch: List[Tuple[FileInfo, Optional[list]]] = []
+    for path, size, mtime_ns in files:
+      cached = previous.get(self._relpath(path))
+      if not (cached and cached[0] == size and cached[1] == mtime_ns):
+        cached = None
+        counted += 1
+      batch.append(((path, size, mtime_ns), cached))
+      if len(batch) >= COUNT_BATCH:
+        yield from _flush(batch)
+        batch = []
+    yield from _flush(batch)
+
+    if counted:
+      logger.debug(f"统计了 {counted} 个文件的行数")
+    if self.cache is not None and (counted or current.keys() != previous.keys()):
+      self.cache.put('lines', self._cache_key(), current)
+
+  def _run(self, tasks: List[FileInfo]) -> Iterable[Optional[int]]:
+    paths = [path for path, _, _ in tasks]
+    if self.workers <= 1 or len(paths) < PARALLEL_THRESHOLD:
+      return map(count_lines, paths)
+
+    # 按块分配任务，避免为每个小文件提交一次任务
+    workers = min(self.workers, len(paths))
+    size = max(1, len(paths) // (workers * 4))
+    chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix='readme-lines') as pool:
+      return [lines for chunk in pool.map(_count_many, chunks) for lines in chunk]
@@ -0,0 +1,542 @@
+"""
+大模型生成模块
+通过 Ollama 的 HTTP 接口生成双语 README：
+使用保持连接的连接池（requests.Session），两种语言用 asyncio 并发生成，
+请求失败时按指数退避重试；以流式方式接收输出并边生成边验证，
+发现问题立即中止，只续写或重新生成不合格的章节。
+生成的章节带有记录输入哈希的标记，再次生成时只重新生成依赖的分析报告部分有变化的章节
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from .cache import ResponseCache
+from .prompts import (DEFAULT_TOKEN_BUDGET, LANGUAGES, PROMPTS, SECOND_LANGUAGE_HEADINGS,
+                      build_prompt, continue_prompt, fit_analysis, report_digests,
+                      section_dependencies, section_prompt)
+from .sections import (Section, has_sections, inputs_digest, parse_sections, splice_sections,
+                       stale_sections, wrap_section)
+from .timing import span
+from .validate import (StreamValidator, join_sections, post_process, section_problems,
+                       split_sections, strip_thinking, validate_content)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = 'qwen3:8b'
+DEFAULT_HOST = 'http://127.0.0.1:11434'
+
+# 连接超时与读取超时 (秒)；生成较长的 README 时模型可能几分钟后才返回
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_TIMEOUT = 600.0
+
+# 按状态码判断是否值得重试：服务过载、模型加载中等暂时性错误
+RETRY_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+_THINK_RE = re.compile(r'<think>.*?(?:</think>|\Z)', re.S)
+_TITLE_RE = re.compile(r'^#\s', re.M)
+_HEADING_RE = re.compile(r'^#{1,6}\s', re.M)
+_BLANK_LINES_RE = re.compile(r'\n{4,}')
+
+
+class OllamaError(RuntimeError):
+  """Ollama 请求失败（重试后仍失败或不可重试的错误）"""
+
+
+def default_cache_dir() -> Path:
+  """生成结果缓存的默认目录: $XDG_CACHE_HOME/readme-generator/llm"""
+  base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+      os.path.expanduser('~'), '.cache')
+  return Path(base) / 'readme-generator' / 'llm'
+
+
+def default_host() -> str:
+  """Ollama 服务地址，可用 OLLAMA_HOST 环境变量指定（与 ollama 命令一致）"""
+  host = os.environ.get('OLLAMA_HOST') or DEFAULT_HOST
+  if '://' not in host:
+    host = 'http://' + host
+  return host.rstrip('/')
+
+
+class OllamaClient:
+  """Ollama HTTP 客户端
+
+  所有请求共用一个 requests.Session，连接在请求之间保持（keep-alive），
+  连接池大小与并发数一致，可在多个线程中同时使用。
+  """
+
+  def __init__(self,
+               model: str = DEFAULT_MODEL,
+               host: Optional[str] = None,
+               timeout: float = DEFAULT_TIMEOUT,
+               connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+               retries: int = 2,
+               backoff: float = 1.0,
+               pool_size: int = 2,
+               options: Optional[Dict[str, Any]] = None):
+    self.model = model
+    self.host = (host or default_host()).rstrip('/')
+    self.timeout = (connect_timeout, timeout)
+    self.retries = retries
+    self.backoff = backoff
+    self.pool_size = max(1, pool_size)
+    self.options = dict(options or {})
+    self._session = None
+
+  @property
+  def session(self):
+    # requests 只在实际请求时导入，以加快命令行启动
+    if self._session is None:
+      import requests
+      from requests.adapters import HTTPAdapter
+
+      session = requests.Session()
+      adapter = HTTPAdapter(pool_connections=1,
+                            pool_maxsize=self.pool_size,
+                            max_retries=0)
+      session.mount('http://', adapter)
+      session.mount('https://', adapter)
+      self._session = session
+    return self._session
+
+  def close(self):
+    if self._session is not None:
+      self._session.close()
+      self._session = None
+
+  def __enter__(self) -> 'OllamaClient':
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+  def _post(self, path: str, payload: Dict[str, Any], stream: bool = False):
+    """发送请求并返回响应，暂时性错误按指数退避重试
+
+    stream 为 True 时只等待响应头，响应体由调用方逐行读取。
+    """
+    import requests
+
+    url = self.host + path
+    attempts = self.retries + 1
+    for attempt in range(attempts):
+      try:
+        response = self.session.post(url,
+                                     json=payload,
+                                     timeout=self.timeout,
+                                     stream=stream)
+      except (requests.ConnectionError, requests.Timeout) as e:
+        error = f"{type(e).__name__}: {e}"
+      else:
+        if response.ok:
+          return response
+        error = f"HTTP {response.status_code}: {response.text[:200]}"
+        if response.status_code not in RETRY_STATUS:
+          raise OllamaError(f"请求 {url} 失败: {error}")
+
+      if attempt + 1 < attempts:
+        delay = self.backoff * (2**attempt)
+        logger.warning(f"请求 Ollama 失败 ({error})，{delay:.1f} 秒后重试 "
+                       f"({attempt + 1}/{self.retries})")
+        time.sleep(delay)
+    raise OllamaError(f"请求 {url} 失败 (已重试 {self.retries} 次): {error}")
+
+  def _payload(self, prompt: str, options: Optional[Dict[str, Any]],
+               stream: bool) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        'model': self.model,
+        'prompt': prompt,
+        'stream': stream
+    }
+    merged = dict(self.options, **(options or {}))
+    if merged:
+      payload['options'] = merged
+    return payload
+
+  def generate(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """生成文本（非流式），返回模型的完整输出"""
+    start = time.perf_counter()
+    response = self._post('/api/generate', self._payload(prompt, options, False))
+    try:
+      data = response.json()
+    except ValueError as e:
+      raise OllamaError(f"Ollama 返回了无法解析的响应: {response.text[:200]!r}") from e
+    logger.debug(f"Ollama 生成完成，耗时 {time.perf_counter() - start:.1f}s，"
+                 f"输出 {data.get('eval_count', '?')} 个 token")
+    return data.get('response', '')
+
+  def stream(self,
+             prompt: str,
+             options: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """流式生成，逐块返回模型输出
+
+    提前关闭生成器会断开连接，Ollama 随即停止推理，不再为被放弃的输出付出计算。
+    """
+    import requests
+
+    response = self._post('/api/generate', self._payload(prompt, options, True),
+                          stream=True)
+    try:
+      # 读取过程中连接中断、响应截断或出现无法解析的行，都作为 OllamaError 抛出
+      try:
+        for line in response.iter_lines():
+          if not line:
+            continue
+          try:
+            data = json.loads(line)
+          except ValueError as e:
+            raise OllamaError(f"Ollama 返回了无法解析的响应行: {line[:200]!r}") from e
+          if data.get('error'):
+            raise OllamaError(f"Ollama 生成失败: {data['error']}")
+          chunk = data.get('response')
+          if chunk:
+            yield chunk
+          if data.get('done'):
+            logger.debug(f"Ollama 生成完成，输出 {data.get('eval_count', '?')} 个 token")
+            return
+      except requests.RequestException as e:
+        raise OllamaError(f"读取 Ollama 流式响应失败: {type(e).__name__}: {e}") from e
+      raise OllamaError("Ollama 流式响应在生成完成前结束")
+    finally:
+      response.close()
+
+  async def agenerate(self,
+                      prompt: str,
+                      options: Optional[Dict[str, Any]] = None,
+                      executor: Optional[Executor] = None) -> str:
+    """在线程池中执行 generate，供 asyncio 并发调用"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, self.generate, prompt, options)
+
+
+def clean_response(text: str, title: bool = True) -> str:
+  """清理模型输出（对应 run.sh 中 ollama run 之后的过滤管道）
+
+  去除终端控制码与 <think> 思考过程，从第一个一级标题（title 为 False 时为任意级别的标题）
+  开始保留，去掉包裹整个输出的 ```markdown 代码块，并合并多余的空行。
+  """
+  text = _ANSI_RE.sub('', text).replace('\r', '')
+  text = _THINK_RE.sub('', text)
+  match = (_TITLE_RE if title else _HEADING_RE).search(text)
+  if match:
+    text = text[match.start():]
+  lines = text.strip().split('\n')
+  if lines and lines[0].strip() in ('```markdown', '```md'):
+    lines = lines[1:]
+  # 开头的 ```markdown 已被去掉时，结尾多出一个未配对的 ```
+  fences = sum(1 for line in lines if line.lstrip().startswith('```'))
+  if fences % 2 and lines[-1].strip() == '```':
+    lines = lines[:-1]
+  return _BLANK_LINES_RE.sub('\n\n\n', '\n'.join(lines)).strip()
+
+
+class BilingualGenerator:
+  """双语 README 生成器
+
+  各语言的生成相互独立，用 asyncio 并发提交（并发数由 concurrency 限制）；
+  Ollama 服务端设置 OLLAMA_NUM_PARALLEL 后可在同一个模型上并行推理。
+
+  输出以流式方式接收并由 StreamValidator 边生成边验证，发现问题立即中止：
+  已完成的章节保留，从出问题的章节开始续写；生成完成后逐章节检查，
+  只重新生成不合格的章节。每个续写点或章节最多尝试 attempts 次。
+
+  提供 cache 时先查缓存，只缓存通过验证的内容；
+  refresh 为 True 时忽略已有缓存重新生成，并用新结果覆盖缓存。
+  """
+
+  def __init__(self,
+               client: OllamaClient,
+               concurrency: int = 2,
+               attempts: int = 2,
+               cache: Optional[ResponseCache] = None,
+               refresh: bool = False):
+    self.client = client
+    self.concurrency = max(1, concurrency)
+    self.attempts = max(1, attempts)
+    self.cache = cache
+    self.refresh = refresh
+
+  def _stream(self, prompt: str, title: bool) -> Tuple[str, Optional[str]]:
+    """流式生成并验证，返回 (去掉思考过程的输出, 问题)；发现问题时立即中止"""
+    validator = StreamValidator(require_title=title)
+    with span('llm.stream', prompt_chars=len(prompt)):
+      chunks = self.client.stream(prompt)
+      try:
+        for chunk in chunks:
+          problem = validator.feed(chunk)
+          if problem:
+            return validator.visible, problem
+      finally:
+        chunks.close()
+      return validator.visible, validator.finish()
+
+  async def _run_stream(self, executor: Executor, prompt: str,
+                        title: bool) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    loop = asyncio.get_running_loop()
+    text, problem = await loop.run_in_executor(executor, self._stream, prompt,
+                                               title)
+    return split_sections(clean_response(text, title)), problem
+
+  async def _generate_body(self, language: str, prompt: str,
+                           executor: Executor) -> List[Tuple[str, str]]:
+    """生成完整的 README，中止时保留已完成的章节并从出问题的章节续写"""
+    sections: List[Tuple[str, str]] = []
+    for attempt in range(self.attempts):
+      if sections:
+        request = continue_prompt(language, prompt, join_sections(sections))
+      else:
+        request = prompt
+      start = time.perf_counter()
+      new_sections, problem = await self._run_stream(executor, request,
+                                                     not sections)
+      if sections:
+        # 续写时丢弃标题之前的内容与重复的章节
+        seen = {heading for heading, _ in sections}
+        new_sections = [(heading, text) for heading, text in new_sections
+                        if heading and heading not in seen]
+      if problem is None:
+        sections.extend(new_sections)
+        logger.info(f"{language} README 生成完成，耗时 {time.perf_counter() - start:.1f}s")
+        return sections
+
+      # 最后一个章节未完成或正是出问题的章节，只保留它之前的章节
+      kept = new_sections[:-1]
+      sections.extend(kept)
+      logger.warning(f"{language} README 生成中止 ({problem})，保留 {len(sections)} 个章节，"
+                     f"从出问题的章节续写 ({attempt + 1}/{self.attempts})")
+    if not sections:
+      raise OllamaError(f"{language} README 生成失败: 多次生成均被中止")
+    logger.warning(f"{language} README 续写多次被中止，只使用已完成的 {len(sections)} 个章节")
+    return sections
+
+  async def _regenerate_section(self, language: str, prompt: str, heading: str,
+                                executor: Executor) -> Optional[str]:
+    """重新生成单个章节，失败时返回 None"""
+    for attempt in range(self.attempts):
+      new_sections, problem = await self._run_stream(
+          executor, section_prompt(language, prompt, heading), not heading)
+      if problem is None:
+        for new_heading, text in new_sections:
+          if new_heading == heading and not section_problems(text):
+            if heading or not validate_content(text, min_length=0):
+              return text
+      logger.warning(f"{language} README 章节 \"{heading or '标题与简介'}\" 重新生成失败 "
+                     f"({problem or '内容不合格'}) ({attempt + 1}/{self.attempts})")
+    return None
+
+  async def _generate_document(self, language: str, prompt: str,
+                               executor: Executor) -> str:
+    sections = await self._generate_body(language, prompt, executor)
+
+    # 逐章节检查，只重新生成不合格的章节；标题部分还需满足整体验证的要求
+    for i, (heading, text) in enumerate(sections):
+      problems = section_problems(text)
+      if not heading and i == 0:
+        problems += validate_content(text, min_length=0)
+      if not problems:
+        continue
+      logger.warning(f"{language} README 章节 \"{heading or '标题与简介'}\" 不合格 "
+                     f"({'; '.join(problems)})，重新生成该章节")
+      fixed = await self._regenerate_section(language, prompt, heading, executor)
+      sections[i] = (heading, fixed if fixed is not None else strip_thinking(text))
+
+    content = post_process(join_sections(sections)).strip()
+    problems = validate_content(content)
+    if problems:
+      raise OllamaError(f"{language} README 验证失败: {'; '.join(problems)}")
+    return content
+
+  async def _generate_language(self, language: str, analysis: str,
+                               semaphore: asyncio.Semaphore,
+                               executor: Executor) -> str:
+    prompt = build_prompt(language, analysis)
+    model, options = self.client.model, self.client.options
+    if self.cache is not None and not self.refresh:
+      content = self.cache.lookup(model, prompt, options)
+      if content is not None:
+        logger.info(f"使用缓存的 {language} README")
+        return content
+
+    async with semaphore:
+      logger.info(f"生成 {language} README...")
+      content = await self._generate_document(language, prompt, executor)
+    if self.cache is not None:
+      self.cache.store(model, prompt, content, options)
+    return content
+
+  async def agenerate(self,
+                      analysis: str,
+                      languages: Iterable[str] = LANGUAGES) -> Dict[str, str]:
+    """并发生成各语言的 README，返回 {语言: 内容}"""
+    languages = list(languages)
+    semaphore = asyncio.Semaphore(self.concurrency)
+    # 阻塞的 HTTP 请求在独立的线程池中执行，线程数与并发数一致
+    with ThreadPoolExecutor(max_workers=self.concurrency,
+                            thread_name_prefix='readme-llm') as executor:
+      contents = await asyncio.gather(*(self._generate_language(
+          language, analysis, semaphore, executor) for language in languages))
+    return dict(zip(languages, contents))
+
+  def generate(self,
+               analysis: str,
+               languages: Iterable[str] = LANGUAGES) -> Dict[str, str]:
+    return asyncio.run(self.agenerate(analysis, languages))
+
+  async def aregenerate_sections(
+      self, analysis: str, targets: List[Tuple[str, str]]) -> List[Optional[str]]:
+    """并发重新生成指定的章节 [(语言, 标题行)]，返回各章节的内容（失败时为 None）"""
+    semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def _regenerate(language: str, heading: str, executor: Executor) -> Optional[str]:
+      async with semaphore:
+        logger.info(f"重新生成 {language} README 的章节 \"{heading or '标题与简介'}\"...")
+        return await self._regenerate_section(language, build_prompt(language, analysis),
+                                              heading, executor)
+
+    with ThreadPoolExecutor(max_workers=self.concurrency,
+                            thread_name_prefix='readme-llm') as executor:
+      return await asyncio.gather(*(_regenerate(language, heading, executor)
+                                    for language, heading in targets))
+
+  def regenerate_sections(self, analysis: str,
+                          targets: List[Tuple[str, str]]) -> List[Optional[str]]:
+    return asyncio.run(self.aregenerate_sections(analysis, targets))
+
+
+def _escape_heading(heading: str) -> str:
+  """把标题行编码为不含空白的名称：空格替换为下划线，下划线、%、> 与其他空白字符按百分号编码"""
+  return ''.join('_' if char == ' ' else f"%{ord(char):02X}" if char in '%_>' else
+                 quote(char, safe='') if char.isspace() else char
+                 for char in heading)
+
+
+def section_name(language: str, heading: str) -> str:
+  """章节标记中的名称：语言与编码后的完整标题行，标题与简介为 "语言:#"
+
+  名称可由 section_heading 精确还原为原来的标题行（包括标题级别、下划线与连续的空格）。
+  """
+  if not heading:
+    return f"{language}:#"
+  return f"{language}:{_escape_heading(heading)}"
+
+
+def section_heading(name: str) -> Tuple[str, str]:
+  """由章节名称还原 (语言, 标题行)"""
+  language, _, slug = name.partition(':')
+  if slug == '#':
+    return language, ''
+  if slug.startswith('#'):
+    return language, unquote(slug.replace('_', ' '))
+  # 旧版本的名称只记录标题文字，空白均替换为下划线
+  return language, '## ' + slug.replace('_', ' ')
+
+
+def section_inputs(language: str, heading: str, digests: Dict[Optional[str], str],
+                   model: str) -> str:
+  """章节的输入哈希：模型、提示词模板与章节依赖的分析报告部分"""
+  parts = {str(part): digests.get(part) for part in section_dependencies(heading)}
+  return inputs_digest(model, PROMPTS[language], parts)
+
+
+def mark_sections(language: str, content: str, digests: Dict[Optional[str], str],
+                  model: str) -> str:
+  """给 README 的每个章节加上记录输入哈希的标记"""
+  blocks = []
+  used = set()
+  for heading, text in split_sections(content):
+    name = section_name(language, heading)
+    if name in used:
+      # 重复的标题不加标记，作为普通内容保留
+      blocks.append(text + '\n')
+      continue
+    used.add(name)
+    blocks.append(wrap_section(name, section_inputs(language, heading, digests, model), text))
+  return '\n'.join(blocks).rstrip('\n')
+
+
+def update_readme(existing: str, analysis: str, generator: BilingualGenerator) -> str:
+  """增量更新带有章节标记的 README：只重新生成依赖的分析报告部分有变化的章节
+
+  重新生成失败的章节保留原有内容（及原有的输入哈希，下次运行时再次尝试）；
+  章节之外的内容（例如语言分隔线与手写的内容）原样保留。
+  """
+  items = parse_sections(existing)
+  digests = report_digests(analysis)
+  model = generator.client.model
+  plan = []
+  for item in items:
+    if not isinstance(item, Section):
+      continue
+    language, heading = section_heading(item.name)
+    if language not in PROMPTS:
+      plan.append((item.name, item.inputs))
+      continue
+    plan.append((item.name, section_inputs(language, heading, digests, model)))
+
+  stale = stale_sections(items, plan)
+  if not stale:
+    logger.info("分析报告中各章节依赖的内容均未变化，无需重新生成")
+    return existing
+  logger.info(f"重新生成 {len(stale)}/{len(plan)} 个章节")
+  contents = generator.regenerate_sections(analysis,
+                                           [section_heading(name) for name in stale])
+  rendered = {}
+  for name, text in zip(stale, contents):
+    if text is None:
+      logger.warning(f"章节 {name} 重新生成失败，保留原有内容")
+    else:
+      rendered[name] = text
+  return ''.join(splice_sections(items, plan, rendered))
+
+
+def combine_languages(contents: Dict[str, str], first: str = 'english') -> str:
+  """拼接双语 README：默认语言在前，其余语言在分割线之后"""
+  order: List[str] = [first] + [lang for lang in contents if lang != first]
+  parts = [contents[order[0]]]
+  for language in order[1:]:
+    parts.append(f"---\n\n{SECOND_LANGUAGE_HEADINGS[language]}\n\n{contents[language]}")
+  return '\n\n'.join(parts) + '\n'
+
+
+def generate_readme(analysis: str,
+                    client: OllamaClient,
+                    first: str = 'english',
+                    concurrency: int = 2,
+                    attempts: int = 2,
+                    cache: Optional[ResponseCache] = None,
+                    refresh: bool = False,
+                    token_budget: int = DEFAULT_TOKEN_BUDGET,
+                    existing: Optional[str] = None
+                   ) -> Tuple[str, Dict[str, str]]:
+  """根据分析报告生成双语 README，返回 (拼接后的内容, {语言: 内容})
+
+  token_budget 为每个提示词的 token 上限（0 表示不限制），
+  分析报告超出时按重要性压缩，并在日志中记录省略的内容。
+  existing 为带有章节标记的现有 README 时只增量更新变化的章节，此时返回的字典为空。
+  """
+  if token_budget:
+    with span('llm.fit'):
+      analysis, dropped = fit_analysis(analysis, token_budget)
+    for note in dropped:
+      logger.info(f"分析报告超出 {token_budget} token 的预算，已压缩 - {note}")
+  generator = BilingualGenerator(client, concurrency, attempts, cache, refresh)
+  if existing and has_sections(existing):
+    with span('llm.update'):
+      return update_readme(existing, analysis, generator), {}
+
+  with span('llm.generate'):
+    contents = generator.generate(analysis)
+  digests = report_digests(analysis)
+  marked = {
+      language: mark_sections(language, content, digests, client.model)
+      for language, content in contents.items()
+  }
+  return combine_languages(marked, first), contents
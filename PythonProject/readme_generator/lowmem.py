@@ -0,0 +1,142 @@
+"""
+低内存模式模块
+SpillList 是只追加的序列，超出阈值后把元素以 JSON 行写入临时文件，遍历时逐行读回；
+TextLines 按行保存多行文本（例如结构树），模板逐行输出而不拼接整个字符串。
+iter_json 逐块生成与 json.dumps 相同的编码，计算哈希时无需构造完整的 JSON 字符串
+"""
+
+import json
+import tempfile
+from typing import Any, Iterable, Iterator, List, Optional
+
+# 低内存模式下分给每个缓冲区的内存比例（max_memory_mb 的 1/SPILL_PARTS）
+SPILL_PARTS = 4
+
+
+def spill_threshold(max_memory_mb: float) -> Optional[int]:
+  """由内存上限计算每个缓冲区的溢出阈值（字节），不限制时返回 None"""
+  if not max_memory_mb or max_memory_mb <= 0:
+    return None
+  return max(1, int(max_memory_mb * 1024 * 1024 / SPILL_PARTS))
+
+
+class SpillList:
+  """超出阈值后溢出到临时文件的只追加序列
+
+  threshold 为 None 时始终保存在内存中。元素必须可 JSON 序列化，
+  溢出后读回的元组会变为列表；溢出后不能嵌套遍历同一个序列。
+  """
+
+  def __init__(self, threshold: Optional[int] = None, items: Iterable[Any] = ()):
+    self.threshold = threshold
+    self._items: List[Any] = []
+    self._size = 0
+    self._file = None
+    self._count = 0
+    self.extend(items)
+
+  @property
+  def spilled(self) -> bool:
+    return self._file is not None
+
+  def _estimate(self, item: Any) -> int:
+    if isinstance(item, str):
+      return len(item) + 1
+    return len(json.dumps(item, ensure_ascii=False, default=str)) + 1
+
+  def append(self, item: Any):
+    self._count += 1
+    if self._file is not None:
+      self._file.write(json.dumps(item, ensure_ascii=False, default=str))
+      self._file.write('\n')
+      return
+    self._items.append(item)
+    if self.threshold is not None:
+      self._size += self._estimate(item)
+      if self._size > self.threshold:
+        self._spill()
+
+  def extend(self, items: Iterable[Any]):
+    for item in items:
+      self.append(item)
+
+  def _spill(self):
+    self._file = tempfile.TemporaryFile('w+', encoding='utf-8', prefix='readme-spill-')
+    for item in self._items:
+      self._file.write(json.dumps(item, ensure_ascii=False, default=str))
+      self._file.write('\n')
+    self._items = []
+    self._size = 0
+
+  def __iter__(self) -> Iterator[Any]:
+    if self._file is None:
+      yield from self._items
+      return
+    # 溢出后同一时间只能有一个遍历；遍历结束（或中止）后回到文件末尾继续追加
+    f = self._file
+    f.flush()
+    f.seek(0)
+    try:
+      for line in f:
+        yield json.loads(line)
+    finally:
+      f.seek(0, 2)
+
+  def __len__(self) -> int:
+    return self._count
+
+  def __bool__(self) -> bool:
+    return self._count > 0
+
+  def close(self):
+    if self._file is not None:
+      self._file.close()
+      self._file = None
+    self._items = []
+    self._count = 0
+
+  def __repr__(self) -> str:
+    return f"<{type(self).__name__} {self._count} 项{'，已溢出' if self.spilled else ''}>"
+
+
+class TextLines(SpillList):
+  """按行保存的多行文本；str() 返回以换行连接的完整文本"""
+
+  def __str__(self) -> str:
+    return '\n'.join(self)
+
+  def iter_json(self) -> Iterator[str]:
+    """逐行生成 json.dumps(str(self), ensure_ascii=False) 的内容"""
+    yield '"'
+    for i, line in enumerate(self):
+      if i:
+        yield '\\n'
+      yield json.dumps(line, ensure_ascii=False)[1:-1]
+    yield '"'
+
+
+def iter_json(value: Any) -> Iterator[str]:
+  """逐块生成 json.dumps(value, sort_keys=True, ensure_ascii=False, default=str) 的内容
+
+  只展开字典、TextLines 与 SpillList，其余的值直接交给 json.dumps。
+  """
+  if isinstance(value, TextLines):
+    yield from value.iter_json()
+  elif isinstance(value, SpillList):
+    yield '['
+    for i, item in enumerate(value):
+      if i:
+        yield ', '
+      yield from iter_json(item)
+    yield ']'
+  elif isinstance(value, dict) and all(isinstance(key, str) for key in value):
+    yield '{'
+    for i, key in enumerate(sorted(value)):
+      if i:
+        yield ', '
+      yield json.dumps(key, ensure_ascii=False)
+      yield ': '
+      yield from iter_json(value[key])
+    yield '}'
+  else:
+    yield json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
@@ -0,0 +1,227 @@
+"""
+项目清单模块
+一次性解析 setup.py / setup.cfg / pyproject.toml，供各检测器共享，避免重复读取与解析；
+requirements*.txt、Pipfile 与锁文件只记录指纹，由依赖解析模块按文件增量解析
+"""
+
+import configparser
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cache import AnalysisCache, fingerprint_files, fingerprints_match, refresh_mtimes
+from .dependencies import LOCK_FILES, DependencyResolver, parse_setup_metadata
+
+logger = logging.getLogger(__name__)
+
+# 清单文件的指纹: (文件名, mtime_ns, size)
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+MANIFEST_FILES = ('setup.py', 'setup.cfg', 'pyproject.toml', 'Pipfile') + LOCK_FILES
+
+
+def _is_requirements_file(name: str) -> bool:
+  """判断是否为 requirements*.txt 文件"""
+  return name.startswith('requirements') and name.endswith('.txt')
+
+
+def is_manifest_file(name: str) -> bool:
+  """判断根目录下的文件名是否属于项目清单"""
+  return name in MANIFEST_FILES or _is_requirements_file(name)
+
+
+def is_dependency_file(parts: Tuple[str, ...]) -> bool:
+  """判断项目内的相对路径（各级名称）是否可能影响依赖列表
+
+  包括根目录下的清单文件，以及可能被 -r 引用的子目录中的 requirements 文件。
+  """
+  if len(parts) == 1:
+    return is_manifest_file(parts[0])
+  return parts[-1].endswith('.txt') and ('requirements' in parts[-1] or
+                                          'requirements' in parts[:-1])
+
+
+def manifest_fingerprint(project_root: Path,
+                         entries: Optional[Iterable[os.DirEntry]] = None
+                        ) -> Fingerprint:
+  """计算项目清单文件的指纹（仅 stat，不读取内容）
+
+  entries 为已扫描的根目录条目（例如目录遍历的结果），传入时不再重复 scandir。
+  """
+  if entries is None:
+    try:
+      with os.scandir(project_root) as it:
+        entries = list(it)
+    except OSError:
+      entries = []
+
+  fingerprint = []
+  for entry in entries:
+    name = entry.name
+    if is_manifest_file(name):
+      try:
+        if not entry.is_file():
+          continue
+        st = entry.stat()
+      except OSError:
+        continue
+      fingerprint.append((name, st.st_mtime_ns, st.st_size))
+  return tuple(sorted(fingerprint))
+
+
+class ProjectManifest:
+  """项目清单快照，所有清单文件在构造时只解析一次"""
+
+  def __init__(self, project_root: Path, fingerprint: Fingerprint = ()):
+    self.project_root = project_root
+    self.fingerprint = fingerprint
+    self.setup_py: Optional[str] = None
+    self.setup_cfg: Optional[configparser.ConfigParser] = None
+    self.pyproject: Dict[str, Any] = {}
+    # setup.py 中静态求值的 setup() 参数，首次使用时解析
+    self._setup_metadata: Optional[Dict[str, str]] = None
+
+  @classmethod
+  def load(cls,
+           project_root: Path,
+           entries: Optional[Iterable[os.DirEntry]] = None
+          ) -> 'ProjectManifest':
+    """读取并解析项目根目录下的清单文件"""
+    fingerprint = manifest_fingerprint(project_root, entries)
+    manifest = cls(project_root, fingerprint)
+    names = {name for name, _, _ in fingerprint}
+
+    if 'setup.py' in names:
+      try:
+        manifest.setup_py = (project_root / 'setup.py').read_text(
+            encoding='utf-8')
+      except Exception as e:
+        logger.warning(f"读取 setup.py 失败: {e}")
+
+    if 'setup.cfg' in names:
+      try:
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.read(project_root / 'setup.cfg', encoding='utf-8')
+        manifest.setup_cfg = parser
+      except Exception as e:
+        logger.warning(f"读取 setup.cfg 失败: {e}")
+
+    if 'pyproject.toml' in names:
+      try:
+        import toml
+        with open(project_root / 'pyproject.toml', 'r',
+                  encoding='utf-8') as f:
+          manifest.pyproject = toml.load(f)
+      except ImportError:
+        logger.warning("需要安装 toml 包来解析 pyproject.toml")
+      except Exception as e:
+        logger.warning(f"读取 pyproject.toml 失败: {e}")
+
+    return manifest
+
+  @classmethod
+  def load_cached(cls,
+                  project_root: Path,
+                  cache: AnalysisCache,
+                  entries: Optional[Iterable[os.DirEntry]] = None
+                 ) -> 'ProjectManifest':
+    """优先从分析缓存恢复清单，清单文件变化时重新解析并写回缓存"""
+    fingerprint = manifest_fingerprint(project_root, entries)
+    key = os.path.abspath(project_root)
+    paths = [project_root / name for name, _, _ in fingerprint]
+
+    stored = cache.get('manifest', key)
+    if stored:
+      if stored.get('fingerprint') == [list(item) for item in fingerprint]:
+        return cls.from_dict(project_root, fingerprint, stored['manifest'])
+      if fingerprints_match(stored.get('files', {}), paths):
+        # mtime 变化但内容未变，只更新指纹与各文件的 mtime
+        stored['fingerprint'] = fingerprint
+        refresh_mtimes(stored['files'], paths)
+        cache.put('manifest', key, stored)
+        return cls.from_dict(project_root, fingerprint, stored['manifest'])
+
+    manifest = cls.load(project_root, entries)
+    cache.put(
+        'manifest', key, {
+            'fingerprint': manifest.fingerprint,
+            'files': fingerprint_files(paths),
+            'manifest': manifest.to_dict()
+        })
+    return manifest
+
+  def to_dict(self) -> Dict[str, Any]:
+    """转换为可 JSON 序列化的字典"""
+    setup_cfg = None
+    if self.setup_cfg is not None:
+      setup_cfg = {
+          section: dict(self.setup_cfg.items(section, raw=True))
+          for section in self.setup_cfg.sections()
+      }
+    return {
+        'setup_py': self.setup_py,
+        'setup_cfg': setup_cfg,
+        'pyproject': self.pyproject
+    }
+
+  @classmethod
+  def from_dict(cls, project_root: Path, fingerprint: Fingerprint,
+                data: Dict[str, Any]) -> 'ProjectManifest':
+    """从 to_dict 的结果恢复清单"""
+    manifest = cls(project_root, fingerprint)
+    manifest.setup_py = data.get('setup_py')
+    if data.get('setup_cfg') is not None:
+      parser = configparser.ConfigParser(interpolation=None)
+      parser.read_dict(data['setup_cfg'])
+      manifest.setup_cfg = parser
+    manifest.pyproject = data.get('pyproject') or {}
+    return manifest
+
+  def is_stale(self, entries: Optional[Iterable[os.DirEntry]] = None) -> bool:
+    """清单文件的 mtime/size 是否已变化"""
+    return manifest_fingerprint(self.project_root, entries) != self.fingerprint
+
+  # ---- 元数据 ----
+
+  def _setup_py_field(self, field: str) -> Optional[str]:
+    if not self.setup_py:
+      return None
+    if self._setup_metadata is None:
+      self._setup_metadata = parse_setup_metadata(self.setup_py)
+    return self._setup_metadata.get(field)
+
+  def _pyproject_field(self, field: str) -> Optional[str]:
+    data = self.pyproject
+    if 'project' in data and field in data['project']:
+      return data['project'][field]
+    poetry = data.get('tool', {}).get('poetry', {})
+    if field in poetry:
+      return poetry[field]
+    return None
+
+  def _setup_cfg_field(self, field: str) -> Optional[str]:
+    if self.setup_cfg is None:
+      return None
+    value = self.setup_cfg.get('metadata', field, fallback='').strip()
+    return value or None
+
+  def _metadata_field(self, field: str) -> Optional[str]:
+    return (self._setup_py_field(field) or self._pyproject_field(field) or
+            self._setup_cfg_field(field))
+
+  @property
+  def name(self) -> Optional[str]:
+    """项目名称"""
+    return self._metadata_field('name')
+
+  @property
+  def description(self) -> Optional[str]:
+    """项目描述"""
+    return self._metadata_field('description')
+
+  # ---- 依赖 ----
+
+  def get_dependencies(self, cache: Optional[AnalysisCache] = None) -> List[str]:
+    """从清单中汇总依赖列表（按规范化的包名排序，保证输出稳定）"""
+    return DependencyResolver(self.project_root, cache).resolve(self)
@@ -0,0 +1,85 @@
+"""
+输出文件模块
+流式、原子地写入输出文件：先写入同目录下的临时文件，同时与现有文件逐块比较，
+内容相同时不重写，否则以重命名替换（保留现有文件的权限）
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Union
+
+# 流式写入输出文件时每次写入的字符数
+WRITE_BUFFER_SIZE = 256 * 1024
+
+
+def join_blocks(chunks: Iterable[str], size: int) -> Iterator[str]:
+  """将小块字符串合并为约 size 个字符的块"""
+  pending: List[str] = []
+  pending_size = 0
+  for chunk in chunks:
+    pending.append(chunk)
+    pending_size += len(chunk)
+    if pending_size >= size:
+      yield ''.join(pending)
+      pending = []
+      pending_size = 0
+  if pending:
+    yield ''.join(pending)
+
+
+def _read_umask() -> int:
+  mask = os.umask(0)
+  os.umask(mask)
+  return mask
+
+
+# 进程的 umask 只能通过设置来读取，导入时读取一次；
+# 不在每次写入时临时修改，否则其他线程在此期间创建的文件会得到错误的权限
+_UMASK = _read_umask()
+
+
+def write_output(path: Union[str, Path], chunks: Union[str, Iterable[str]]) -> bool:
+  """流式写入文本文件，返回是否写入（内容未变化时为 False）
+
+  临时文件名为 .<文件名>.<随机>.tmp，监视模式据此忽略写入过程中产生的事件。
+  """
+  path = Path(path)
+  if isinstance(chunks, str):
+    chunks = (chunks,)
+  try:
+    existing = open(path, 'rb')
+  except OSError:
+    existing = None
+
+  fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.',
+                                  suffix='.tmp',
+                                  dir=str(path.parent.resolve()))
+  try:
+    identical = existing is not None
+    with os.fdopen(fd, 'wb') as f:
+      # 模板产生大量小块，攒够 WRITE_BUFFER_SIZE 个字符再编码、写入和比较
+      for block in join_blocks(chunks, WRITE_BUFFER_SIZE):
+        data = block.encode('utf-8')
+        f.write(data)
+        if identical:
+          identical = existing.read(len(data)) == data
+    if identical and existing.read(1) == b'':
+      os.unlink(tmp_path)
+      return False
+
+    if existing is not None:
+      os.chmod(tmp_path, os.fstat(existing.fileno()).st_mode & 0o7777)
+    else:
+      os.chmod(tmp_path, 0o666 & ~_UMASK)
+    os.replace(tmp_path, path)
+  except BaseException:
+    try:
+      os.unlink(tmp_path)
+    except OSError:
+      pass
+    raise
+  finally:
+    if existing is not None:
+      existing.close()
+  return True
@@ -0,0 +1,355 @@
+"""
+提示词模块
+生成双语 README 时交给大模型的提示词（与 run.sh 中的提示词一致）；
+项目分析报告超出 token 预算时，按各部分的重要性压缩目录树与文件列表，
+并记录省略的内容；按章节记录 README 依赖的分析报告部分，用于增量重新生成
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 支持的语言，顺序即默认的生成与拼接顺序
+LANGUAGES = ('english', 'chinese')
+
+ENGLISH_PROMPT = """You are a professional technical documentation generator. Read the source code and comments in the current directory and generate a well-structured, properly formatted, and detailed README.md file. Follow these rules:
+
+1. Clearly and concisely describe the project's goals and core functionality;
+2. Display the file structure using standard Markdown syntax (file tree), with correct indentation and bullet formatting;
+3. Include appropriate sections: Project Overview, Installation, Usage, File Structure, Dependencies, Contribution Guidelines, etc.;
+4. Extract accurate technical information from code comments, but exclude subjective reasoning, debugging notes, or thought processes;
+5. The output must be cleanly formatted, neutrally written, logically structured, and aligned with open-source documentation conventions;
+6. Ensure all Markdown syntax renders correctly — especially code blocks, lists, and headings.
+
+Only output the content of the final README.md file, with no additional explanation.
+
+
+## FINAL INPUT:
+
+Project Analysis:
+{analysis}
+
+===> YOUR TASK:
+
+Generate the **README.md** for the project described above.
+DO NOT THINK. DO NOT EXPLAIN. OUTPUT ONLY RAW MARKDOWN."""
+
+CHINESE_PROMPT = """你是一个专业的技术文档生成工具。请读取当前目录下的源代码与注释信息，并据此生成一份结构规范、格式正确、内容详实的 README.md 文件。生成规则如下：
+
+1. 用清晰简练的语言描述项目的目标与主要功能；
+2. 使用标准的 Markdown 格式展示项目结构（文件树），注意缩进和符号规范；
+3. 包含以下内容段落（如适用）：项目简介、安装方式、使用方法、项目结构说明、依赖项、开发与贡献指南；
+4. 从源代码注释中提取准确的技术信息，剔除主观的思考、调试过程、推理过程；
+5. 输出内容应排版整齐、语言中性、逻辑清晰，符合开源项目文档标准；
+6. 所有 Markdown 语法必须正确渲染，不得出现格式错误。
+
+输出只包括最终的 README.md 内容，不包含额外说明。
+
+
+项目分析：
+{analysis}
+
+===> 立即开始输出 README.md 内容，仅限 Markdown。禁止多余内容。"""
+
+PROMPTS: Dict[str, str] = {
+    'english': ENGLISH_PROMPT,
+    'chinese': CHINESE_PROMPT,
+}
+
+# 生成中止后续写：已通过验证的章节放在提示词中，模型从下一个章节继续
+CONTINUE_PROMPTS: Dict[str, str] = {
+    'english': """{prompt}
+
+The beginning of the README has already been written:
+
+{partial}
+
+===> Continue the README from the next section. Do not repeat any section above.
+OUTPUT ONLY RAW MARKDOWN.""",
+    'chinese': """{prompt}
+
+README 的前半部分已经生成：
+
+{partial}
+
+===> 从下一个章节开始继续输出 README，不要重复上面的任何章节。仅限 Markdown。""",
+}
+
+# 重新生成单个章节
+SECTION_PROMPTS: Dict[str, str] = {
+    'english': """{prompt}
+
+===> Output ONLY the section "{heading}" of the README, starting with the line "{heading}".
+Do not output any other section.""",
+    'chinese': """{prompt}
+
+===> 只输出 README 中的“{heading}”章节，以“{heading}”这一行开头，不要输出其他章节。""",
+}
+
+# 重新生成标题与简介（第一个二级标题之前的部分）
+TITLE_PROMPTS: Dict[str, str] = {
+    'english': """{prompt}
+
+===> Output ONLY the title line (starting with "# ") and a short introduction of the project.
+Do not output any "## " section.""",
+    'chinese': """{prompt}
+
+===> 只输出 README 的一级标题（以“# ”开头）和项目简介，不要输出任何“## ”章节。""",
+}
+
+# 双语 README 中第二种语言前的标题
+SECOND_LANGUAGE_HEADINGS: Dict[str, str] = {
+    'english': '## English Version',
+    'chinese': '## 中文版本',
+}
+
+
+def continue_prompt(language: str, prompt: str, partial: str) -> str:
+  """续写提示词：partial 为已经通过验证的章节"""
+  return CONTINUE_PROMPTS[language].format(prompt=prompt, partial=partial)
+
+
+def section_prompt(language: str, prompt: str, heading: str) -> str:
+  """重新生成单个章节的提示词，heading 为空字符串时重新生成标题与简介"""
+  if not heading:
+    return TITLE_PROMPTS[language].format(prompt=prompt)
+  return SECTION_PROMPTS[language].format(prompt=prompt, heading=heading)
+
+
+# 分析报告中每次运行都会变化、但与 README 内容无关的行，不放入提示词，
+# 使报告内容未变化时提示词（以及生成结果缓存的键）保持不变
+VOLATILE_PREFIXES = ('分析时间:',)
+
+
+def strip_volatile(analysis: str) -> str:
+  """去掉分析报告中的易变行（如分析时间）"""
+  return ''.join(line for line in analysis.splitlines(keepends=True)
+                 if not line.startswith(VOLATILE_PREFIXES))
+
+
+def build_prompt(language: str, analysis: str) -> str:
+  """根据项目分析报告生成指定语言的提示词"""
+  if language not in PROMPTS:
+    raise ValueError(f"不支持的语言: {language}")
+  return PROMPTS[language].format(
+      analysis=strip_volatile(analysis).rstrip('\n'))
+
+
+# 提示词的默认 token 预算（包括提示词模板本身）
+DEFAULT_TOKEN_BUDGET = 3000
+
+# 分析报告各部分的标题，按重要性从高到低排列；压缩时从最不重要的部分开始
+SECTION_PRIORITY = ('重要文件:', '主要编程语言:', '文件类型统计:', '目录结构:')
+
+# 各部分压缩后至少保留的条目行数（不含标题）
+MIN_SECTION_LINES = {
+    '重要文件:': 5,
+    '主要编程语言:': 3,
+    '文件类型统计:': 5,
+    '目录结构:': 1,
+}
+
+_CJK_RE = re.compile(r'[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]')
+_TREE_BRANCH_RE = re.compile(r'[├└]── ')
+
+
+def estimate_tokens(text: str) -> int:
+  """粗略估计 token 数
+
+  中日韩字符约每字一个 token，其余非 ASCII 字符（如目录树的制表符）按一个 token 计，
+  ASCII 文本约每 4 个字符一个 token。估计值偏大，用于预算时更安全。
+  """
+  non_ascii = len(text) - len(text.encode('ascii', 'ignore'))
+  ascii_chars = len(text) - non_ascii
+  return non_ascii + (ascii_chars + 3) // 4
+
+
+def _tree_depth(line: str) -> int:
+  """目录树文本行的深度（根目录下的条目为 1）"""
+  match = _TREE_BRANCH_RE.search(line)
+  if match:
+    return match.start() // 4 + 1
+  # run.sh 备用方法输出的每级缩进两个空格
+  return (len(line) - len(line.lstrip(' '))) // 2 + 1
+
+
+class ReportSection:
+  """分析报告中的一个部分：标题行与其后的内容行"""
+
+  __slots__ = ('title', 'lines')
+
+  def __init__(self, title: Optional[str], lines: List[str]):
+    self.title = title
+    self.lines = lines
+
+  def text(self) -> str:
+    head = [self.title] if self.title else []
+    return '\n'.join(head + self.lines)
+
+  def tokens(self) -> int:
+    return estimate_tokens(self.text()) + 1
+
+
+def parse_report(report: str) -> List[ReportSection]:
+  """按已知的标题把分析报告拆分为各部分，标题之前的内容为标题为 None 的部分"""
+  sections = [ReportSection(None, [])]
+  for line in report.rstrip('\n').split('\n'):
+    if line in SECTION_PRIORITY:
+      sections.append(ReportSection(line, []))
+    else:
+      sections[-1].lines.append(line)
+  # 去掉每部分末尾的空行，重新拼接时统一用一个空行分隔
+  for section in sections:
+    while section.lines and not section.lines[-1].strip():
+      section.lines.pop()
+  return sections
+
+
+def _join_sections(sections: List[ReportSection]) -> str:
+  return '\n\n'.join(section.text() for section in sections) + '\n'
+
+
+def _truncate(section: ReportSection, tokens: int, keep: int) -> Optional[str]:
+  """从末尾删除内容行，使该部分不超过 tokens，至少保留 keep 行；返回省略说明"""
+  total = len(section.lines)
+  if total <= keep:
+    return None
+  budget = tokens - estimate_tokens(section.title or '') - 16
+  kept = 0
+  used = 0
+  for line in section.lines:
+    cost = estimate_tokens(line) + 1
+    if kept >= keep and used + cost > budget:
+      break
+    used += cost
+    kept += 1
+  if kept >= total:
+    return None
+  dropped = total - kept
+  section.lines = section.lines[:kept] + [f"  … (省略 {dropped} 行)"]
+  return f"{section.title.rstrip(':')}: 省略末尾 {dropped} 行"
+
+
+def _reduce_tree_depth(section: ReportSection, tokens: int) -> Optional[str]:
+  """逐级减少目录树的深度，直到不超过 tokens 或只剩第一层"""
+  lines = section.lines
+  # 第一行是根目录名
+  root, entries = lines[:1], lines[1:]
+  depths = [_tree_depth(line) for line in entries]
+  if not depths:
+    return None
+  max_depth = max(depths)
+  original = max_depth
+  costs = [estimate_tokens(line) + 1 for line in entries]
+  # 标题、根目录与省略标记行的开销
+  total = sum(costs) + estimate_tokens(section.title or '') + 16
+  total += sum(estimate_tokens(line) + 1 for line in root)
+  # 按深度累计 token，避免每减少一级都重新估计
+  per_depth: Dict[int, int] = {}
+  for depth, cost in zip(depths, costs):
+    per_depth[depth] = per_depth.get(depth, 0) + cost
+  while max_depth > 1 and total > tokens:
+    total -= per_depth.get(max_depth, 0)
+    max_depth -= 1
+  if max_depth == original:
+    return None
+  kept = [line for line, depth in zip(entries, depths) if depth <= max_depth]
+  dropped = len(entries) - len(kept)
+  section.lines = root + kept + [f"  … (省略深度大于 {max_depth} 的 {dropped} 个条目)"]
+  return f"目录结构: 省略深度大于 {max_depth} 的 {dropped} 个条目"
+
+
+def fit_report(report: str, tokens: int) -> Tuple[str, List[str]]:
+  """压缩分析报告使其估计的 token 数不超过 tokens
+
+  按 SECTION_PRIORITY 从最不重要的部分开始逐个处理：目录树先逐级减少深度，
+  列表从末尾截断（至少保留 MIN_SECTION_LINES 行）；截断后仍然超出时
+  整个省略该部分，再处理下一个更重要的部分。标题之前的项目信息总是保留。
+  报告中在原处留下省略标记；返回 (压缩后的报告, 省略内容的说明列表)，
+  未超出预算时原样返回。
+  """
+  if estimate_tokens(report) <= tokens:
+    return report, []
+
+  sections = parse_report(report)
+  dropped: List[str] = []
+
+  def _excess() -> int:
+    return sum(section.tokens() for section in sections) - tokens
+
+  for title in reversed(SECTION_PRIORITY):
+    section = next((item for item in sections if item.title == title), None)
+    if section is None:
+      continue
+    excess = _excess()
+    if excess <= 0:
+      break
+    target = max(section.tokens() - excess, 0)
+    if title == '目录结构:':
+      note = _reduce_tree_depth(section, target)
+      if note:
+        dropped.append(note)
+    if section.tokens() > target:
+      note = _truncate(section, target, MIN_SECTION_LINES.get(title, 1))
+      if note:
+        dropped.append(note)
+    if section.tokens() > target:
+      # 截断到最少行数仍然超出预算：整个省略，之前对该部分的压缩说明不再需要
+      name = title.rstrip(':')
+      dropped = [note for note in dropped if not note.startswith(name + ':')]
+      dropped.append(f"{name}: 整个省略")
+      section.lines = ["  … (已省略)"]
+
+  return _join_sections(sections), dropped
+
+
+def template_tokens(language: str) -> int:
+  """提示词模板本身（不含分析报告）的估计 token 数"""
+  return estimate_tokens(PROMPTS[language].format(analysis=''))
+
+
+def fit_analysis(analysis: str,
+                 budget: int = DEFAULT_TOKEN_BUDGET,
+                 languages=LANGUAGES) -> Tuple[str, List[str]]:
+  """压缩分析报告，使每种语言的完整提示词都不超过 budget 个 token"""
+  overhead = max(template_tokens(language) for language in languages)
+  return fit_report(strip_volatile(analysis), max(budget - overhead, 0))
+
+
+# README 章节依赖分析报告的哪些部分：按标题中的关键词匹配（不区分大小写，第一个匹配生效），
+# 未匹配的章节依赖全部内容。分析报告只有相关部分变化时才重新生成该章节
+SECTION_DEPENDENCIES: Tuple[Tuple[Tuple[str, ...], Tuple[Optional[str], ...]], ...] = (
+    (('structure', 'layout', 'tree', '结构', '目录'), ('目录结构:',)),
+    (('install', 'setup', 'getting started', 'requirement', 'dependenc', 'build', 'environment',
+      '安装', '依赖', '快速开始', '构建', '环境'), ('重要文件:', '主要编程语言:')),
+    (('usage', 'run', 'example', 'quick', '使用', '用法', '运行', '示例'), ('重要文件:',)),
+    (('overview', 'feature', 'introduction', 'about', 'tech', 'language', '简介', '概述', '特性',
+      '功能', '技术', '语言'), ('重要文件:', '主要编程语言:', '文件类型统计:')),
+    (('contribut', 'license', 'author', 'changelog', '贡献', '许可', '作者', '更新'), ('重要文件:',)),
+)
+
+# 标题与简介（第一个二级标题之前的部分）依赖项目信息、重要文件与编程语言
+TITLE_DEPENDENCIES: Tuple[Optional[str], ...] = (None, '重要文件:', '主要编程语言:')
+
+# 项目信息中不影响 README 内容的行
+UNTRACKED_PREFIXES = ('项目路径:',)
+
+
+def section_dependencies(heading: str) -> Tuple[Optional[str], ...]:
+  """README 章节依赖的分析报告部分（None 为标题之前的项目信息），heading 为空时是标题与简介"""
+  if not heading:
+    return TITLE_DEPENDENCIES
+  text = heading.lstrip('#').strip().lower()
+  for keywords, parts in SECTION_DEPENDENCIES:
+    if any(keyword in text for keyword in keywords):
+      return parts
+  return (None,) + SECTION_PRIORITY
+
+
+def report_digests(analysis: str) -> Dict[Optional[str], str]:
+  """分析报告各部分的 SHA-256：{部分标题: 哈希}，标题之前的项目信息为 None"""
+  digests = {}
+  for section in parse_report(strip_volatile(analysis)):
+    lines = [line for line in section.lines if not line.startswith(UNTRACKED_PREFIXES)]
+    digests[section.title] = hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+  return digests
@@ -0,0 +1,165 @@
+"""
+README 区块模块
+生成的 README 按章节包裹在标记注释中，标记记录该区块的输入哈希与内容哈希；
+重新生成时只重新渲染（或重新请求大模型生成）输入发生变化的区块，
+其余区块与区块之间手写的内容原样保留
+"""
+
+import hashlib
+import logging
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .lowmem import iter_json
+
+logger = logging.getLogger(__name__)
+
+BEGIN_FORMAT = '<!-- readme-generator:begin {name} inputs={inputs} content={content} -->\n'
+END_FORMAT = '<!-- readme-generator:end {name} -->\n'
+
+SECTION_RE = re.compile(
+    r'^<!-- readme-generator:begin (\S+) inputs=([0-9a-f]+) content=([0-9a-f]+) -->\n'
+    r'(.*?)'
+    r'^<!-- readme-generator:end \1 -->\n?', re.M | re.S)
+
+# 哈希的十六进制长度
+DIGEST_LENGTH = 16
+
+
+def inputs_digest(*values: Any) -> str:
+  """计算任意可 JSON 序列化的值的短哈希（逐块编码，不构造完整的 JSON 字符串）"""
+  h = hashlib.sha256()
+  for value in values:
+    for chunk in iter_json(value):
+      h.update(chunk.encode('utf-8'))
+    h.update(b'\0')
+  return h.hexdigest()[:DIGEST_LENGTH]
+
+
+def content_digest(body: str) -> str:
+  return hashlib.sha256(body.encode('utf-8')).hexdigest()[:DIGEST_LENGTH]
+
+
+class Section:
+  """README 中的一个生成区块"""
+
+  __slots__ = ('name', 'inputs', 'content', 'body', 'raw')
+
+  def __init__(self, name: str, inputs: str, content: str, body: str, raw: str):
+    self.name = name
+    self.inputs = inputs
+    self.content = content
+    self.body = body
+    self.raw = raw
+
+  @property
+  def edited(self) -> bool:
+    """区块内容是否被手动修改过（内容为空表示要求重新生成）"""
+    return bool(self.body.strip()) and content_digest(self.body) != self.content
+
+
+Item = Union[str, Section]
+
+
+def parse_sections(text: str) -> List[Item]:
+  """拆分 README：生成的区块为 Section，区块之间手写的内容为字符串"""
+  items: List[Item] = []
+  pos = 0
+  for match in SECTION_RE.finditer(text):
+    if match.start() > pos:
+      items.append(text[pos:match.start()])
+    name, inputs, content, body = match.groups()
+    items.append(Section(name, inputs, content, body, match.group(0)))
+    pos = match.end()
+  if pos < len(text):
+    items.append(text[pos:])
+  return items
+
+
+def has_sections(text: str) -> bool:
+  return SECTION_RE.search(text) is not None
+
+
+def wrap_section(name: str, inputs: str, body: str) -> str:
+  """用标记注释包裹区块内容；内容为空白时返回空字符串（不输出该区块）"""
+  body = body.strip('\n')
+  if not body.strip():
+    return ''
+  body += '\n'
+  return (BEGIN_FORMAT.format(name=name, inputs=inputs, content=content_digest(body)) + body +
+          END_FORMAT.format(name=name))
+
+
+def stale_sections(items: Sequence[Item], plan: Sequence[Tuple[str, str]]) -> List[str]:
+  """返回需要重新生成的区块名称：README 中不存在或输入哈希已变化的区块
+
+  被手动修改过的区块即使输入变化也保留，只记录警告；
+  删除区块的内容（保留标记）即可让它重新生成。
+  """
+  existing = {item.name: item for item in items if isinstance(item, Section)}
+  stale = []
+  for name, inputs in plan:
+    section = existing.get(name)
+    if section is None:
+      stale.append(name)
+    elif section.inputs != inputs:
+      if section.edited:
+        logger.warning(f"区块 {name} 已被手动修改，保留修改而不重新生成（清空该区块的内容可重新生成）")
+      else:
+        stale.append(name)
+  return stale
+
+
+def splice_sections(items: Sequence[Item], plan: Sequence[Tuple[str, str]],
+                    rendered: Dict[str, str]) -> Iterator[str]:
+  """把重新生成的区块拼接回现有的 README，逐块返回文本
+
+  plan 为当前应有的区块 [(名称, 输入哈希)]，按文档顺序排列；rendered 为重新生成的区块内容。
+  未重新生成的区块原样保留；不再存在的区块被删除；新出现的区块插入到
+  plan 中前一个已有区块之后（没有时插入到第一个区块之前）。区块之外的内容原样保留。
+  items 中没有任何区块时按 plan 顺序输出全部区块。
+  """
+  old = {item.name: item for item in items if isinstance(item, Section)}
+  inputs = dict(plan)
+
+  def _block(name: str) -> str:
+    if name in rendered:
+      return wrap_section(name, inputs[name], rendered[name])
+    return old[name].raw
+
+  if not old:
+    # 区块之间空一行
+    blocks = [block for block in (_block(name) for name, _ in plan) if block]
+    for i, block in enumerate(blocks):
+      yield block if i == len(blocks) - 1 else _separated(block)
+    return
+
+  # 新区块按 plan 中前一个已有的区块分组
+  inserts: Dict[Optional[str], List[str]] = {}
+  anchor: Optional[str] = None
+  for name, _ in plan:
+    if name in old:
+      anchor = name
+    else:
+      inserts.setdefault(anchor, []).append(name)
+
+  first = True
+  for item in items:
+    if isinstance(item, str):
+      yield item
+      continue
+    if first:
+      first = False
+      for name in inserts.get(None, ()):
+        yield _separated(_block(name))
+    if item.name in inputs:
+      yield _block(item.name)
+    for name in inserts.get(item.name, ()):
+      block = _block(name)
+      if block:
+        yield '\n' + block
+
+
+def _separated(block: str) -> str:
+  """区块后加一个空行，与后面的内容分隔"""
+  return block + '\n' if block else ''
@@ -0,0 +1,436 @@
+"""
+模板模块
+包含默认模板，并在进程内共享 Jinja2 Environment 与已编译模板（包括按区块拆分的模板）；
+编译结果写入磁盘上的字节码缓存，新进程无需重新编译模板
+"""
+
+import hashlib
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from jinja2 import (BaseLoader, DictLoader, Environment, FileSystemBytecodeCache,
+                    FileSystemLoader, Template, meta)
+
+logger = logging.getLogger(__name__)
+
+# 默认模板在加载器中的名称
+DEFAULT_TEMPLATE_NAME = '__default__.md'
+
+# 进程内共享的 Environment: {(模板目录, 字节码缓存目录): Environment}
+_ENV_CACHE: Dict[Tuple[Optional[str], Optional[str]], Environment] = {}
+
+# 进程内已编译模板的缓存: {(模板路径, mtime_ns, 字节码缓存目录): Template}；
+# 按区块拆分的模板的键以 'sections' 开头，值为 SectionTemplate 列表
+_TEMPLATE_CACHE: Dict[Tuple[Any, ...], Any] = {}
+
+# 模板中划分 README 区块的注释，例如 {# section: installation -#}
+SECTION_COMMENT_RE = re.compile(r'^\{#-?\s*section:\s*([\w-]+)\s*-?#\}\n?', re.M)
+
+# 第一个区块注释之前的部分，以及没有区块注释的整个模板
+HEADER_SECTION = 'header'
+WHOLE_SECTION = 'readme'
+
+# 每次提交都会变化的 Git 信息；模板使用 include/extends/import 而无法确定变量时，
+# 只有源码中直接出现这些名称才计入输入，否则每次提交都会使 README 过期
+VOLATILE_VARIABLES = frozenset({'head_sha', 'git_branch'})
+
+
+def _bytecode_cache_dir(cache_dir: Optional[Path], enabled: bool) -> Optional[str]:
+  """解析字节码缓存目录；未指定时使用 Jinja2 默认的临时目录"""
+  if not enabled:
+    return None
+  if cache_dir:
+    return os.path.abspath(cache_dir)
+  return ''
+
+
+def get_environment(template_dir: Optional[Path] = None,
+                    cache_dir: Optional[Path] = None,
+                    bytecode_cache: bool = True) -> Environment:
+  """获取共享的 Environment
+
+  template_dir 为 None 时返回加载默认模板的 Environment。
+  """
+  bytecode_dir = _bytecode_cache_dir(cache_dir, bytecode_cache)
+  key = (os.path.abspath(template_dir) if template_dir else None, bytecode_dir)
+  env = _ENV_CACHE.get(key)
+  if env is not None:
+    return env
+
+  loader: BaseLoader
+  if template_dir is None:
+    loader = DictLoader({DEFAULT_TEMPLATE_NAME: DEFAULT_TEMPLATE})
+  else:
+    loader = FileSystemLoader(str(template_dir))
+
+  bcc = None
+  if bytecode_dir is not None:
+    if bytecode_dir:
+      os.makedirs(bytecode_dir, exist_ok=True)
+      bcc = FileSystemBytecodeCache(bytecode_dir)
+    else:
+      bcc = FileSystemBytecodeCache()
+
+  env = Environment(loader=loader, bytecode_cache=bcc)
+  _ENV_CACHE[key] = env
+  return env
+
+
+def load_template(template_path: Optional[Path] = None,
+                  cache_dir: Optional[Path] = None,
+                  bytecode_cache: bool = True) -> Template:
+  """加载模板，同一进程内相同路径与 mtime 的模板只编译一次
+
+  template_path 为 None 时加载默认模板。
+  """
+  if template_path is None:
+    key: Tuple[Any, ...] = (None, None, cache_dir, bytecode_cache)
+  else:
+    key = (os.path.abspath(template_path), os.stat(template_path).st_mtime_ns,
+           cache_dir, bytecode_cache)
+
+  template = _TEMPLATE_CACHE.get(key)
+  if template is None:
+    if template_path is None:
+      env = get_environment(None, cache_dir, bytecode_cache)
+      template = env.get_template(DEFAULT_TEMPLATE_NAME)
+    else:
+      template_path = Path(template_path)
+      env = get_environment(template_path.parent, cache_dir, bytecode_cache)
+      template = env.get_template(template_path.name)
+    _TEMPLATE_CACHE[key] = template
+  return template
+
+
+def _template_variables(env: Environment,
+                        source: str) -> Tuple[Optional[FrozenSet[str]], FrozenSet[str]]:
+  """返回 (模板引用的变量名, 变量集合为 None 时忽略的变量名)
+
+  模板中使用了 include/extends/import 时无法静态确定全部变量，变量集合为 None，
+  此时源码中没有出现的 VOLATILE_VARIABLES 被忽略。
+  """
+  ast = env.parse(source)
+  if any(True for _ in meta.find_referenced_templates(ast)):
+    ignored = frozenset(
+        name for name in VOLATILE_VARIABLES if not re.search(rf'\b{name}\b', source))
+    return None, ignored
+  return frozenset(meta.find_undeclared_variables(ast)), frozenset()
+
+
+def template_inputs(
+    template_path: Optional[Path] = None
+) -> Tuple[str, Optional[FrozenSet[str]], FrozenSet[str]]:
+  """返回模板源码的 SHA-256、模板引用的变量名及变量未知时忽略的变量名（见 _template_variables）"""
+  if template_path is None:
+    source = DEFAULT_TEMPLATE
+  else:
+    source = Path(template_path).read_text(encoding='utf-8')
+  digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+  return (digest,) + _template_variables(Environment(), source)
+
+
+class SectionTemplate:
+  """模板中的一个 README 区块"""
+
+  __slots__ = ('name', 'template', 'source_hash', 'variables', 'ignored', 'trailing_newline')
+
+  def __init__(self,
+               name: str,
+               template: Template,
+               source_hash: str,
+               variables: Optional[FrozenSet[str]],
+               trailing_newline: bool,
+               ignored: FrozenSet[str] = frozenset()):
+    self.name = name
+    self.template = template
+    self.source_hash = source_hash
+    self.variables = variables
+    self.ignored = ignored
+    # Jinja2 渲染时去掉模板源码末尾的一个换行，只有整个模板的末尾才应去掉
+    self.trailing_newline = trailing_newline
+
+  def render(self, **context: Any) -> str:
+    text = self.template.render(**context)
+    return text + '\n' if self.trailing_newline else text
+
+
+def split_template(source: str) -> List[Tuple[str, str]]:
+  """按区块注释拆分模板源码，返回 [(区块名称, 源码)]
+
+  第一个区块注释之前的部分为 header 区块；没有区块注释时整个模板为一个 readme 区块。
+  区块注释必须位于模板顶层（不在任何 if/for 块之内）。
+  """
+  matches = list(SECTION_COMMENT_RE.finditer(source))
+  if not matches:
+    return [(WHOLE_SECTION, source)]
+  pieces = [(HEADER_SECTION, source[:matches[0].start()])]
+  for i, match in enumerate(matches):
+    end = matches[i + 1].start() if i + 1 < len(matches) else len(source)
+    piece = source[match.end():end]
+    if match.group(0).rstrip().endswith('-#}'):
+      # 与整个模板渲染时一致：-#} 去掉注释之后的所有空白
+      piece = piece.lstrip()
+    pieces.append((match.group(1), piece))
+  return [(name, piece) for name, piece in pieces if piece]
+
+
+def load_section_templates(template_path: Optional[Path] = None,
+                           cache_dir: Optional[Path] = None,
+                           bytecode_cache: bool = True) -> List[SectionTemplate]:
+  """加载按区块拆分的模板，同一进程内相同路径与 mtime 的模板只编译一次"""
+  if template_path is None:
+    key: Tuple[Any, ...] = ('sections', None, None, cache_dir, bytecode_cache)
+    source = DEFAULT_TEMPLATE
+    env = get_environment(None, cache_dir, bytecode_cache)
+  else:
+    template_path = Path(template_path)
+    key = ('sections', os.path.abspath(template_path), os.stat(template_path).st_mtime_ns,
+           cache_dir, bytecode_cache)
+    source = None
+    env = get_environment(template_path.parent, cache_dir, bytecode_cache)
+
+  sections = _TEMPLATE_CACHE.get(key)
+  if sections is None:
+    if source is None:
+      source = template_path.read_text(encoding='utf-8')
+    pieces = split_template(source)
+    sections = []
+    for i, (name, piece) in enumerate(pieces):
+      variables, ignored = _template_variables(env, piece)
+      sections.append(
+          SectionTemplate(name, env.from_string(piece),
+                          hashlib.sha256(piece.encode('utf-8')).hexdigest(), variables,
+                          i < len(pieces) - 1 and piece.endswith('\n'), ignored))
+    _TEMPLATE_CACHE[key] = sections
+  return sections
+
+
+def compile_templates(template_paths: Iterable[Path] = (),
+                      cache_dir: Optional[Path] = None) -> List[str]:
+  """预编译模板到字节码缓存（始终包括默认模板），返回已编译的模板名称
+
+  template_paths 中的目录会编译其中的所有模板文件。
+  """
+  compiled = []
+  get_environment(None, cache_dir).get_template(DEFAULT_TEMPLATE_NAME)
+  compiled.append(DEFAULT_TEMPLATE_NAME)
+
+  for path in template_paths:
+    path = Path(path)
+    if path.is_dir():
+      env = get_environment(path, cache_dir)
+      for name in env.list_templates():
+        env.get_template(name)
+        compiled.append(str(path / name))
+    else:
+      env = get_environment(path.parent, cache_dir)
+      env.get_template(path.name)
+      compiled.append(str(path))
+
+  logger.info(f"已编译 {len(compiled)} 个模板")
+  return compiled
+
+
+DEFAULT_TEMPLATE = '''# {{ project_name }}
+
+{{ project_description }}
+
+{% if include_badges and badges %}
+{% for badge in badges %}
+{{ badge }}
+{% endfor %}
+
+{% endif %}
+{# section: toc -#}
+{% if include_toc %}
+## 目录
+
+- [安装](#安装)
+- [使用](#使用)
+{% if include_api_docs %}
+- [API 文档](#api-文档)
+{% endif %}
+{% if include_contributing %}
+- [贡献](#贡献)
+{% endif %}
+- [许可证](#许可证)
+
+{% endif %}
+{# section: features -#}
+## 特性
+
+- ✨ 功能特性 1
+- 🚀 功能特性 2
+- 📦 功能特性 3
+
+{# section: installation -#}
+{% if include_installation %}
+## 安装
+
+### 环境要求
+
+- Python {{ python_version }}
+
+### 安装方法
+
+```bash
+# 克隆仓库
+git clone {{ git_url }}
+cd {{ repository_name }}
+
+# 安装依赖
+pip install -r requirements.txt
+```
+
+{% endif %}
+{# section: usage -#}
+{% if include_usage %}
+## 使用
+
+### 基本用法
+
+```python
+# 添加使用示例
+import {{ project_name.lower().replace('-', '_') }}
+
+# 示例代码
+```
+
+### 命令行使用
+
+```bash
+python main.py --help
+```
+
+{% endif %}
+{# section: structure -#}
+{% if project_structure %}
+## 项目结构
+
+```
+{% for line in project_structure %}{{ line }}
+{% endfor %}```
+
+{% endif %}
+{# section: statistics -#}
+{% if include_statistics and statistics and statistics.total_files %}
+## 项目统计
+
+共 {{ '{:,}'.format(statistics.total_files) }} 个文件，{{ statistics.total_size }}
+{%- if statistics.total_lines %}，源代码 {{ '{:,}'.format(statistics.total_lines) }} 行{% endif %}。
+{%- if statistics.languages %}
+
+| 语言 | 文件数 | 代码行数 | 大小 | 占比 |
+|------|-------:|---------:|-----:|-----:|
+{%- for lang in statistics.languages %}
+| {{ lang.language }} | {{ '{:,}'.format(lang.files) }} | {{ '{:,}'.format(lang.lines) }} | {{ lang.size }} | {{ lang.percent }}% |
+{%- endfor %}
+{%- endif %}
+{%- if statistics.python and statistics.python.files %}
+
+| 指标 | 数量 |
+|------|-----:|
+| Python 文件 | {{ '{:,}'.format(statistics.python.files) }} |
+| 函数 | {{ '{:,}'.format(statistics.python.functions) }} |
+| 类 | {{ '{:,}'.format(statistics.python.classes) }} |
+| Python 代码行数 | {{ '{:,}'.format(statistics.python.lines) }} |
+{%- endif %}
+
+
+{% endif -%}
+{# section: dependencies -#}
+{% if dependencies %}
+## 依赖
+
+{% for dep in dependencies %}
+- {{ dep }}
+{% endfor %}
+
+{% endif %}
+{# section: custom -#}
+{% if custom_sections %}
+{% for section in custom_sections %}
+## {{ section.title }}
+
+{{ section.content }}
+
+{% endfor %}
+{% endif %}
+{# section: api -#}
+{% if include_api_docs %}
+## API 文档
+
+{% if api %}
+{% for module in api if module.classes or module.functions %}
+### `{{ module.name }}`
+{%- if module.summary %}
+
+{{ module.summary }}
+{%- endif %}
+{%- for cls in module.classes %}
+
+#### class `{{ cls.name }}{% if cls.bases %}({{ cls.bases | join(', ') }}){% endif %}`
+{%- if cls.summary %}
+
+{{ cls.summary }}
+{%- endif %}
+{%- if cls.methods %}
+{% for method in cls.methods %}
+- `{{ method.signature }}`{% if method.summary %} - {{ method.summary }}{% endif %}
+{%- endfor %}
+{%- endif %}
+{%- endfor %}
+{%- if module.functions %}
+
+#### 函数
+{% for func in module.functions %}
+- `{{ func.signature }}`{% if func.summary %} - {{ func.summary }}{% endif %}
+{%- endfor %}
+{%- endif %}
+
+{% endfor %}
+{% else %}
+详细的 API 文档请参考 [docs/](docs/) 目录。
+
+{% endif %}
+{% endif %}
+{# section: contributing -#}
+{% if include_contributing %}
+## 贡献
+
+欢迎贡献！请阅读 [CONTRIBUTING.md](CONTRIBUTING.md) 了解详情。
+
+### 开发环境设置
+
+```bash
+# 克隆仓库
+git clone {{ git_url }}
+cd {{ repository_name }}
+
+# 创建虚拟环境
+python -m venv venv
+source venv/bin/activate  # Windows: venv\\Scripts\\activate
+
+# 安装开发依赖
+pip install -r requirements-dev.txt
+```
+
+{% endif %}
+{# section: license -#}
+## 许可证
+
+本项目采用 {{ license }} 许可证 - 详见 [LICENSE](LICENSE) 文件。
+
+{# section: author -#}
+## 作者
+
+{{ author }}
+
+{# section: footer -#}
+---
+
+*本 README 由 [README Generator](https://github.com/your-username/readme-generator) 自动生成{% if generated_date %}于 {{ generated_date }}{% endif %}*
+'''
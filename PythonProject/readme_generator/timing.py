@@ -0,0 +1,300 @@
+"""
+耗时统计模块
+用 span() 包裹各阶段（目录遍历、清单解析、Git 检测、渲染、写入等）记录耗时，
+可输出汇总表或 Chrome trace 事件格式 (chrome://tracing、Perfetto 可直接打开)。
+启用内存统计时用 tracemalloc 记录每个阶段的内存分配峰值。
+未启用时 span() 返回共享的空上下文管理器，几乎没有额外开销
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar('T')
+
+# 设置后各进程把 trace 事件追加到该文件（run.sh 用它把多个命令合并到一个 trace）
+TRACE_ENV = 'README_GEN_TRACE'
+
+
+class _NullSpan:
+  """未启用时使用的空 span"""
+
+  __slots__ = ()
+
+  def __enter__(self) -> '_NullSpan':
+    return self
+
+  def __exit__(self, *exc_info):
+    return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+  """一个计时区间；退出时把耗时计入父区间的子区间耗时，用于计算自身耗时
+
+  启用内存统计时，进入区间时重置 tracemalloc 的峰值，退出时记录区间内的峰值；
+  被子区间重置前父区间已达到的峰值保存在 peak 中。
+  """
+
+  __slots__ = ('tracer', 'name', 'args', 'start', 'child_ns', 'memory_start', 'peak', '_token')
+
+  def __init__(self, tracer: 'Tracer', name: str, args: Dict[str, Any]):
+    self.tracer = tracer
+    self.name = name
+    self.args = args
+    self.start = 0
+    self.child_ns = 0
+    self.memory_start = 0
+    self.peak = 0
+    self._token = None
+
+  def __enter__(self) -> 'Span':
+    parents = _stack.get()
+    self._token = _stack.set(parents + (self,))
+    if self.tracer.memory:
+      current, peak = tracemalloc.get_traced_memory()
+      if parents:
+        parents[-1].peak = max(parents[-1].peak, peak)
+      if _reset_peak is not None:
+        _reset_peak()
+      self.memory_start = current
+    self.start = time.perf_counter_ns()
+    return self
+
+  def __exit__(self, *exc_info):
+    duration = time.perf_counter_ns() - self.start
+    _stack.reset(self._token)
+    parents = _stack.get()
+    if parents:
+      parents[-1].child_ns += duration
+    memory = None
+    if self.tracer.memory:
+      current, peak = tracemalloc.get_traced_memory()
+      peak = max(peak, self.peak)
+      if parents:
+        parents[-1].peak = max(parents[-1].peak, peak)
+      memory = (self.memory_start, current, peak)
+    self.tracer.record(self.name, self.start, duration, duration - self.child_ns, self.args,
+                       memory)
+    return None
+
+
+# tracemalloc.reset_peak 需要 Python 3.9+，更早的版本只能得到进程开始统计以来的峰值
+_reset_peak = getattr(tracemalloc, 'reset_peak', None)
+
+
+# 当前上下文（线程或 asyncio 任务）中打开的 span
+_stack: contextvars.ContextVar[Tuple[Span, ...]] = contextvars.ContextVar('readme_spans',
+                                                                           default=())
+
+
+class Tracer:
+  """收集 span 事件；memory 为 True 时同时记录 tracemalloc 统计的内存"""
+
+  def __init__(self, process_name: str = 'readme-gen', memory: bool = False):
+    self.process_name = process_name
+    self.memory = memory
+    self.pid = os.getpid()
+    # perf_counter 与墙钟时间的对应关系，使多个进程的 trace 对齐到同一时间轴
+    self.origin_ns = time.perf_counter_ns()
+    self.origin_wall_ns = time.time_ns()
+    # (名称, 开始 ns, 耗时 ns, 自身耗时 ns, 线程, 参数, 内存)
+    # 内存为 (开始时已分配, 结束时已分配, 峰值) 字节，未统计时为 None
+    self.events: List[Tuple[str, int, int, int, int, Dict[str, Any],
+                            Optional[Tuple[int, int, int]]]] = []
+    self._lock = threading.Lock()
+
+  def record(self, name: str, start: int, duration: int, self_duration: int,
+             args: Dict[str, Any], memory: Optional[Tuple[int, int, int]] = None):
+    event = (name, start, duration, self_duration, threading.get_ident(), args, memory)
+    with self._lock:
+      self.events.append(event)
+
+  def summary(self) -> List[Tuple[str, int, float, float]]:
+    """按名称汇总，返回 [(名称, 次数, 总耗时 ms, 自身耗时 ms)]，按首次出现的顺序排列"""
+    totals: Dict[str, List[float]] = {}
+    for name, start, duration, self_duration, *_ in sorted(self.events, key=lambda e: e[1]):
+      row = totals.setdefault(name, [0, 0.0, 0.0])
+      row[0] += 1
+      row[1] += duration / 1e6
+      row[2] += self_duration / 1e6
+    return [(name, int(row[0]), row[1], row[2]) for name, row in totals.items()]
+
+  def format_summary(self) -> str:
+    """汇总表文本；百分比相对于启用计时以来的总耗时"""
+    wall_ms = (time.perf_counter_ns() - self.origin_ns) / 1e6
+    rows = self.summary()
+    width = max([len(name) for name, *_ in rows] + [len('阶段')])
+    # 表头的中文字符占两列
+    lines = [f"{'阶段':<{width - 2}}  {'次数':>4}  {'总耗时 ms':>9}  {'自身 ms':>8}  {'占比':>4}"]
+    for name, count, total, own in rows:
+      share = total / wall_ms if wall_ms else 0.0
+      lines.append(f"{name:<{width}}  {count:>6}  {total:>12.2f}  {own:>10.2f}  {share:>6.1%}")
+    lines.append(f"{'总计':<{width - 2}}  {'':>6}  {wall_ms:>12.2f}")
+    return '\n'.join(lines) + '\n'
+
+  def memory_summary(self) -> List[Tuple[str, int, int, int]]:
+    """按名称汇总内存，返回 [(名称, 次数, 最大峰值, 保留的增量)]（字节），按首次出现的顺序排列
+
+    峰值为区间内 tracemalloc 统计的已分配内存的最大值（包括区间开始前已分配的内存），
+    保留的增量为区间结束与开始时已分配内存之差的总和。
+    """
+    totals: Dict[str, List[int]] = {}
+    for name, start, *_, memory in sorted(self.events, key=lambda e: e[1]):
+      if memory is None:
+        continue
+      begin, end, peak = memory
+      row = totals.setdefault(name, [0, 0, 0])
+      row[0] += 1
+      row[1] = max(row[1], peak)
+      row[2] += end - begin
+    return [(name, row[0], row[1], row[2]) for name, row in totals.items()]
+
+  def format_memory(self) -> str:
+    """内存汇总表文本 (MB)"""
+    rows = self.memory_summary()
+    width = max([len(name) for name, *_ in rows] + [len('阶段')])
+    lines = [f"{'阶段':<{width - 2}}  {'次数':>4}  {'峰值 MB':>8}  {'保留 MB':>8}"]
+    for name, count, peak, retained in rows:
+      lines.append(f"{name:<{width}}  {count:>6}  {peak / 1048576:>10.2f}  "
+                   f"{retained / 1048576:>+10.2f}")
+    if _reset_peak is None:
+      lines.append("注意: Python 3.8 不支持 tracemalloc.reset_peak，峰值为统计开始以来的最大值")
+    return '\n'.join(lines) + '\n'
+
+  def trace_events(self) -> List[Dict[str, Any]]:
+    """转换为 Chrome trace 事件（完整事件 ph=X，时间单位为微秒）"""
+    offset_ns = self.origin_wall_ns - self.origin_ns
+    events: List[Dict[str, Any]] = [{
+        'name': 'process_name',
+        'ph': 'M',
+        'pid': self.pid,
+        'args': {
+            'name': self.process_name
+        }
+    }]
+    for name, start, duration, _, tid, args, memory in self.events:
+      if memory is not None:
+        args = dict(args, memory_peak=memory[2], memory_retained=memory[1] - memory[0])
+      event = {
+          'name': name,
+          'cat': name.split('.', 1)[0],
+          'ph': 'X',
+          'ts': (start + offset_ns) / 1000,
+          'dur': duration / 1000,
+          'pid': self.pid,
+          'tid': tid
+      }
+      if args:
+        event['args'] = args
+      events.append(event)
+    return events
+
+  def write_trace(self, path: Union[str, Path], append: bool = False):
+    """写入 Chrome trace 文件；append 为 True 时与文件中已有的事件合并"""
+    events = []
+    if append:
+      try:
+        with open(path, 'r', encoding='utf-8') as f:
+          events = json.load(f).get('traceEvents', [])
+      except (OSError, ValueError, AttributeError):
+        events = []
+    events.extend(self.trace_events())
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+      json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False,
+                default=str)
+    os.replace(tmp_path, path)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable(process_name: str = 'readme-gen', memory: bool = False) -> Tracer:
+  """开始记录 span，返回收集事件的 Tracer；memory 为 True 时启动 tracemalloc"""
+  global _tracer
+  if memory and not tracemalloc.is_tracing():
+    tracemalloc.start()
+  _tracer = Tracer(process_name, memory)
+  return _tracer
+
+
+def disable() -> Optional[Tracer]:
+  """停止记录，返回之前的 Tracer（启动过 tracemalloc 时将其停止）"""
+  global _tracer
+  tracer, _tracer = _tracer, None
+  if tracer is not None and tracer.memory and tracemalloc.is_tracing():
+    tracemalloc.stop()
+  return tracer
+
+
+def current() -> Optional[Tracer]:
+  return _tracer
+
+
+def span(name: str, **args: Any):
+  """计时上下文管理器：with span('collect.tree'): ...
+
+  名称中第一个点之前的部分作为 trace 的分类；args 记录到 trace 事件中。
+  """
+  tracer = _tracer
+  if tracer is None:
+    return _NULL_SPAN
+  return Span(tracer, name, args)
+
+
+def timed_iter(name: str, iterable: Iterable[T], **args: Any) -> Iterator[T]:
+  """逐项计时的迭代器，只累计产生各项所用的时间（不含调用方处理各项的时间）
+
+  用于流式渲染：渲染与写入交替进行，渲染耗时记为一个 span，开始时间为第一次取值。
+  """
+  tracer = _tracer
+  if tracer is None:
+    yield from iterable
+    return
+  iterator = iter(iterable)
+  first = None
+  total = 0
+  count = 0
+  try:
+    while True:
+      start = time.perf_counter_ns()
+      if first is None:
+        first = start
+      try:
+        item = next(iterator)
+      except StopIteration:
+        total += time.perf_counter_ns() - start
+        break
+      total += time.perf_counter_ns() - start
+      count += 1
+      yield item
+  finally:
+    if first is not None:
+      parents = _stack.get()
+      if parents:
+        parents[-1].child_ns += total
+      tracer.record(name, first, total, total, dict(args, chunks=count))
+
+
+def finish(timings: bool = False, trace: Optional[Union[str, Path]] = None,
+           append: bool = False, memory_report: bool = False):
+  """停止记录并输出：timings 为 True 时向标准错误输出汇总表，trace 为 trace 文件路径，
+  memory_report 为 True 时输出各阶段的内存峰值"""
+  tracer = disable()
+  if tracer is None:
+    return
+  if timings:
+    sys.stderr.write(tracer.format_summary())
+  if memory_report:
+    sys.stderr.write(tracer.format_memory())
+  if trace:
+    tracer.write_trace(trace, append)
@@ -3,11 +3,20 @@
 包含项目分析、徽章生成等辅助功能
 """
 
+import json
 import logging
 import os
-import re
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+from .cache import AnalysisCache
+from .linecount import LineCounter
+from .lowmem import SpillList, TextLines
+from .manifest import ProjectManifest
+from .walker import DirectoryTree, format_size, walk_tree
 
 logger = logging.getLogger(__name__)
 
@@ -16,125 +25,274 @@ def setup_logging(verbose: bool = False):
   """设置日志配置"""
   log_level = logging.DEBUG if verbose else logging.INFO
 
-  # 配置 rich 处理器
-  try:
-    from rich.logging import RichHandler
-    logging.basicConfig(level=log_level,
-                        format="%(message)s",
-                        datefmt="[%X]",
-                        handlers=[RichHandler(rich_tracebacks=True)])
-  except ImportError:
-    # 如果没有 rich，使用标准处理器
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+  # 交互式终端使用 rich 处理器；rich 导入较慢，非终端输出时不导入
+  if sys.stderr.isatty():
+    try:
+      from rich.logging import RichHandler
+      logging.basicConfig(level=log_level,
+                          format="%(message)s",
+                          datefmt="[%X]",
+                          handlers=[RichHandler(rich_tracebacks=True)])
+      return
+    except ImportError:
+      pass
+
+  # 如果没有 rich，使用标准处理器
+  logging.basicConfig(
+      level=log_level,
+      format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+# 扩展名与编程语言的对应关系（与 run.sh 的 analyze_languages 一致，并补充常见扩展名）
+LANGUAGE_EXTENSIONS = {
+    '.py': 'Python',
+    '.pyi': 'Python',
+    '.js': 'JavaScript',
+    '.mjs': 'JavaScript',
+    '.cjs': 'JavaScript',
+    '.jsx': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.tsx': 'TypeScript',
+    '.java': 'Java',
+    '.cpp': 'C++',
+    '.cc': 'C++',
+    '.cxx': 'C++',
+    '.hpp': 'C++',
+    '.c': 'C',
+    '.h': 'C/C++/Objective-C Header',
+    '.go': 'Go',
+    '.php': 'PHP',
+    '.rb': 'Ruby',
+    '.rs': 'Rust',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin',
+    '.kts': 'Kotlin',
+    '.scala': 'Scala',
+    '.sh': 'Shell Script',
+    '.bash': 'Shell Script',
+    '.ps1': 'PowerShell',
+    '.m': 'Objective-C',
+    '.mm': 'Objective-C++',
+    '.cs': 'C#',
+}
+
+class StatisticsCollector:
+  """文件类型与编程语言统计
+
+  由目录遍历在同一次遍历中调用：每个目录使用一个 batch() 收集文件，
+  目录确定不被折叠后再 merge() 到总的统计中（merge 是线程安全的）。
+  源代码文件在 finish() 中由 LineCounter 统计行数（跳过二进制文件）。
+  指定 spill_threshold 时源代码文件列表超出该字节数后溢出到临时文件（低内存模式）。
+  """
+
+  def __init__(self,
+               line_counter: Optional[LineCounter] = None,
+               spill_threshold: Optional[int] = None):
+    self.line_counter = line_counter
+    # {扩展名: [文件数, 字节数]}，无扩展名的文件使用空字符串
+    self.extensions: Dict[str, List[int]] = {}
+    # 需要统计行数的源代码文件: [(路径, 扩展名, 大小, mtime_ns)]
+    self.sources: Union[List[Tuple[str, str, int, int]], SpillList] = (
+        [] if spill_threshold is None else SpillList(spill_threshold))
+    self._lock = threading.Lock()
+    self._lines: Optional[Dict[str, int]] = None
+    self._binary_files = 0
+
+  def batch(self) -> 'StatisticsCollector':
+    return StatisticsCollector()
+
+  def add(self, entry: os.DirEntry):
+    """记录一个文件条目"""
+    ext = os.path.splitext(entry.name)[1].lower()
+    try:
+      st = entry.stat()
+    except OSError:
+      return
+    size = st.st_size
+    counts = self.extensions.get(ext)
+    if counts is None:
+      counts = self.extensions[ext] = [0, 0]
+    counts[0] += 1
+    counts[1] += size
+    if ext in LANGUAGE_EXTENSIONS:
+      self.sources.append((entry.path, ext, size, st.st_mtime_ns))
+
+  def merge(self, other: 'StatisticsCollector'):
+    """合并另一个收集器（通常是一个目录的 batch）的结果"""
+    with self._lock:
+      for ext, (files, size) in other.extensions.items():
+        counts = self.extensions.get(ext)
+        if counts is None:
+          self.extensions[ext] = [files, size]
+        else:
+          counts[0] += files
+          counts[1] += size
+      self.sources.extend(other.sources)
+
+  def finish(self) -> Dict[str, int]:
+    """统计源代码文件的行数，返回 {扩展名: 行数}"""
+    if self._lines is None:
+      counter = self.line_counter or LineCounter(os.curdir)
+      counts = counter.iter_counts(
+          (path, size, mtime_ns) for path, _, size, mtime_ns in self.sources)
+      lines: Dict[str, int] = {}
+      for path, count in counts:
+        if count is None:
+          self._binary_files += 1
+          continue
+        ext = os.path.splitext(path)[1].lower()
+        lines[ext] = lines.get(ext, 0) + count
+      self._lines = lines
+    return self._lines
+
+  def result(self) -> Dict[str, Any]:
+    """返回供模板与徽章使用的统计结果"""
+    lines = self.finish()
+
+    extensions = [{
+        'extension': ext or '(无扩展名)',
+        'files': files,
+        'bytes': size,
+        'size': format_size(size),
+        'lines': lines.get(ext, 0)
+    } for ext, (files, size) in self.extensions.items()]
+    extensions.sort(key=lambda item: (-item['files'], item['extension']))
+
+    languages: Dict[str, Dict[str, Any]] = {}
+    for ext, (files, size) in self.extensions.items():
+      language = LANGUAGE_EXTENSIONS.get(ext)
+      if language is None:
+        continue
+      item = languages.setdefault(language, {
+          'language': language,
+          'files': 0,
+          'bytes': 0,
+          'lines': 0
+      })
+      item['files'] += files
+      item['bytes'] += size
+      item['lines'] += lines.get(ext, 0)
+    language_bytes = sum(item['bytes'] for item in languages.values())
+    for item in languages.values():
+      item['size'] = format_size(item['bytes'])
+      item['percent'] = round(item['bytes'] * 100 / language_bytes,
+                              1) if language_bytes else 0.0
+    language_list = sorted(languages.values(),
+                           key=lambda item: (-item['bytes'], item['language']))
+
+    total_bytes = sum(size for _, size in self.extensions.values())
+    return {
+        'total_files': sum(files for files, _ in self.extensions.values()),
+        'total_bytes': total_bytes,
+        'total_size': format_size(total_bytes),
+        'total_lines': sum(lines.values()),
+        'source_files': len(self.sources),
+        'binary_files': self._binary_files,
+        'extensions': extensions,
+        'languages': language_list
+    }
 
 
 class ProjectAnalyzer:
   """项目分析器"""
 
-  def __init__(self, project_root: Path, exclude_files: List[str] = None):
+  def __init__(self,
+               project_root: Path,
+               exclude_files: List[str] = None,
+               walk_workers: int = 0,
+               cache: Optional[AnalysisCache] = None,
+               max_depth: int = 3,
+               max_entries: Optional[int] = None,
+               collapse_patterns: List[str] = None,
+               exclude_paths: List[str] = None):
     self.project_root = project_root
     self.exclude_files = exclude_files or []
-
-  def get_structure(self, max_depth: int = 3) -> str:
+    # 按路径排除的文件或目录（以 project_root 开头，例如生成的 README 与缓存目录）
+    self.exclude_paths = exclude_paths or []
+    self.walk_workers = walk_workers
+    self.cache = cache
+    # 结构树的最大深度、每个目录的条目上限（None 表示不限制）及折叠的生成目录
+    self.max_depth = max_depth
+    self.max_entries = max_entries
+    self.collapse_patterns = collapse_patterns or []
+
+  def scan(self,
+           max_depth: Optional[int] = None,
+           statistics: Optional[StatisticsCollector] = None) -> DirectoryTree:
+    """遍历项目目录，结果可在结构树、入口点等收集器之间共享
+
+    传入 statistics 时在同一次遍历中收集文件统计（此时不使用目录列表缓存）。
+    """
+    root = str(self.project_root)
+    if max_depth is None:
+      max_depth = self.max_depth
+    if self.cache is None or statistics is not None:
+      return walk_tree(root,
+                       self.exclude_files,
+                       max_depth,
+                       self.walk_workers,
+                       max_entries=self.max_entries,
+                       collapse=self.collapse_patterns,
+                       stats=statistics,
+                       exclude_paths=self.exclude_paths)
+
+    # 目录 mtime 未变化时复用缓存的列表，只需 stat 不需 scandir
+    key = json.dumps([
+        os.path.abspath(root), root,
+        sorted(self.exclude_files), max_depth, self.max_entries,
+        sorted(self.collapse_patterns),
+        sorted(self.exclude_paths)
+    ])
+    previous = self.cache.get('tree', key) or {}
+    current = {}
+    tree = walk_tree(root, self.exclude_files, max_depth, self.walk_workers,
+                     previous, current, self.max_entries, self.collapse_patterns,
+                     exclude_paths=self.exclude_paths)
+    if current != previous:
+      self.cache.put('tree', key, current)
+    return tree
+
+  def get_structure(self,
+                    max_depth: Optional[int] = None,
+                    tree: Optional[DirectoryTree] = None) -> str:
     """获取项目结构树"""
-
-    def _build_tree(path: Path,
-                    prefix: str = "",
-                    depth: int = 0) -> List[str]:
-      if depth > max_depth:
-        return []
-
-      items = []
-      try:
-        children = sorted(
-            [p for p in path.iterdir() if not self._should_exclude(p)])
-
-        for i, child in enumerate(children):
-          is_last = i == len(children) - 1
-          current_prefix = "└── " if is_last else "├── "
-          items.append(f"{prefix}{current_prefix}{child.name}")
-
-          if child.is_dir() and depth < max_depth:
-            extension_prefix = "    " if is_last else "│   "
-            items.extend(
-                _build_tree(child, prefix + extension_prefix, depth + 1))
-      except PermissionError:
-        pass
-
-      return items
-
-    tree_lines = [self.project_root.name + "/"]
-    tree_lines.extend(_build_tree(self.project_root))
-    return "\n".join(tree_lines)
-
-  def get_dependencies(self) -> List[str]:
-    """获取项目依赖"""
-    dependencies = []
-
-    # 从 requirements.txt 读取
-    req_file = self.project_root / 'requirements.txt'
-    if req_file.exists():
-      try:
-        with open(req_file, 'r', encoding='utf-8') as f:
-          for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-              dependencies.append(line)
-      except Exception as e:
-        logger.warning(f"读取 requirements.txt 失败: {e}")
-
-    # 从 setup.py 读取
-    setup_py = self.project_root / 'setup.py'
-    if setup_py.exists():
-      try:
-        with open(setup_py, 'r', encoding='utf-8') as f:
-          content = f.read()
-          # 简单的正则匹配
-          matches = re.findall(r'install_requires\s*=\s*\[([^\]]+)\]',
-                               content, re.DOTALL)
-          if matches:
-            deps_str = matches[0]
-            deps = re.findall(r'["\']([^"\']+)["\']', deps_str)
-            dependencies.extend(deps)
-      except Exception as e:
-        logger.warning(f"读取 setup.py 依赖失败: {e}")
-
-    # 从 pyproject.toml 读取
-    pyproject = self.project_root / 'pyproject.toml'
-    if pyproject.exists():
-      try:
-        import toml
-        with open(pyproject, 'r', encoding='utf-8') as f:
-          data = toml.load(f)
-          # Poetry 格式
-          if 'tool' in data and 'poetry' in data['tool']:
-            poetry_deps = data['tool']['poetry'].get('dependencies', {})
-            for name, version in poetry_deps.items():
-              if name != 'python':
-                if isinstance(version, str):
-                  dependencies.append(f"{name}{version}")
-                else:
-                  dependencies.append(name)
-
-          # PEP 621 格式
-          if 'project' in data:
-            project_deps = data['project'].get('dependencies', [])
-            dependencies.extend(project_deps)
-
-      except ImportError:
-        logger.warning("需要安装 toml 包来解析 pyproject.toml")
-      except Exception as e:
-        logger.warning(f"读取 pyproject.toml 依赖失败: {e}")
-
-    return list(set(dependencies))  # 去重
-
-  def get_entry_points(self) -> List[str]:
+    return str(self.get_structure_lines(max_depth, tree))
+
+  def get_structure_lines(self,
+                          max_depth: Optional[int] = None,
+                          tree: Optional[DirectoryTree] = None,
+                          spill_threshold: Optional[int] = None) -> TextLines:
+    """获取按行保存的项目结构树，超出 spill_threshold 字节后溢出到临时文件"""
+    if tree is None:
+      tree = self.scan(max_depth)
+    tree_lines = TextLines(spill_threshold)
+    tree_lines.append(self.project_root.name + "/")
+    tree_lines.extend(tree.iter_render())
+    return tree_lines
+
+  def get_statistics(self) -> Dict[str, Any]:
+    """获取文件类型与编程语言统计"""
+    statistics = StatisticsCollector()
+    self.scan(statistics=statistics)
+    return statistics.result()
+
+  def get_dependencies(self,
+                       manifest: Optional[ProjectManifest] = None) -> List[str]:
+    """获取项目依赖（各依赖文件的解析结果按文件指纹缓存）"""
+    if manifest is None:
+      manifest = ProjectManifest.load(self.project_root)
+    return manifest.get_dependencies(self.cache)
+
+  def get_entry_points(self, tree: Optional[DirectoryTree] = None) -> List[str]:
     """获取入口点文件"""
     entry_points = []
     common_entries = ['main.py', 'app.py', '__main__.py', 'cli.py', 'run.py']
 
+    # 根目录条目超出上限时 tree 中的名称不完整，回退到逐个检查
+    if tree is not None and tree.complete:
+      root_names = set(tree.names())
+      return [entry for entry in common_entries if entry in root_names]
+
     for entry in common_entries:
       entry_path = self.project_root / entry
       if entry_path.exists():
@@ -186,9 +344,35 @@ class BadgeGenerator:
           f"![Last Commit](https://img.shields.io/github/last-commit/{github_username}/{repository_name})"
       )
 
+    # 统计徽章
+    statistics = project_info.get('statistics')
+    if statistics and statistics.get('languages'):
+      top_language = statistics['languages'][0]['language']
+      badges.append(
+          f"![Top Language](https://img.shields.io/badge/language-{_badge_text(top_language)}-blue.svg)"
+      )
+      if statistics.get('total_lines'):
+        badges.append(
+            f"![Lines of Code](https://img.shields.io/badge/lines%20of%20code-{_format_count(statistics['total_lines'])}-informational.svg)"
+        )
+
     return badges
 
 
+def _badge_text(text: str) -> str:
+  """转义 shields.io 徽章文本：- 与 _ 需要重复，其余字符按 URL 编码"""
+  return quote(text.replace('-', '--').replace('_', '__'), safe='')
+
+
+def _format_count(count: int) -> str:
+  """格式化数量，例如 12.3k"""
+  if count >= 1_000_000:
+    return f"{count / 1_000_000:.1f}M"
+  if count >= 1_000:
+    return f"{count / 1_000:.1f}k"
+  return str(count)
+
+
 class TemplateManager:
   """模板管理器"""
 
@@ -206,6 +390,8 @@ python_version: "3.8+"
 project_root: "."
 output_path: "README.md"
 template_path: ""
+template_cache_dir: ""  # 模板字节码缓存目录 (留空使用 Jinja2 默认的临时目录)
+template_bytecode_cache: true
 
 # 功能开关
 include_badges: true
@@ -215,6 +401,11 @@ include_usage: true
 include_api_docs: false
 include_contributing: true
 include_changelog: false
+include_statistics: false  # 文件类型与编程语言统计 (需要遍历所有文件，开启后不使用目录列表缓存)
+
+# 输出配置
+deterministic_output: false  # 相同输入生成相同字节 (生成时间取自 SOURCE_DATE_EPOCH)
+incremental_sections: false  # 按章节增量生成，只更新输入变化的章节并保留章节之外手写的内容
 
 # Git 配置
 git_auto_detect: true
@@ -226,6 +417,26 @@ custom_sections: []
   # - title: "自定义章节"
   #   content: "章节内容"
 
+# 项目结构
+structure_max_depth: 3  # 结构树的最大深度
+structure_max_entries: 50  # 每个目录最多列出的条目数，其余条目汇总为一行 (0 表示不限制)
+structure_collapse:  # 折叠为一行的生成目录 (支持通配符)
+  - "node_modules"
+  - "__pycache__"
+  - "*.egg-info"
+  - "build"
+  - "dist"
+  - ".tox"
+  - ".nox"
+  - ".venv"
+  - "venv"
+  - ".mypy_cache"
+  - ".pytest_cache"
+  - ".ruff_cache"
+  - "htmlcov"
+  - ".readme_cache"
+  - "site-packages"
+
 # 排除文件
 exclude_files:
   - ".git"
@@ -233,6 +444,26 @@ exclude_files:
   - ".vscode"
   - "node_modules"
   - ".pytest_cache"
+  - ".readme_cache"
+
+# 性能配置
+walk_workers: 0  # 并行遍历目录的线程数 (0 表示串行)
+api_workers: 0  # 解析 API 文档的进程数 (0 表示 CPU 核心数)
+line_count_workers: 0  # 统计行数的线程数 (0 表示 CPU 核心数)
+cache_dir: ""  # 分析缓存目录，例如 ".readme_cache" (留空表示不缓存)
+cache_max_mb: 64  # 分析缓存大小上限 (MB)
+max_memory_mb: 0  # 低内存模式的内存上限 (MB)，大型数据超出后溢出到临时文件 (0 表示不限制)
+
+# 大模型 (Ollama) 配置，用于 readme-gen llm 生成双语 README
+ollama_model: "qwen3:8b"
+ollama_host: ""  # 留空时使用 OLLAMA_HOST 环境变量或 http://127.0.0.1:11434
+llm_concurrency: 2  # 同时生成的语言数 (服务端需设置 OLLAMA_NUM_PARALLEL)
+llm_timeout: 600  # 单次生成的超时时间 (秒)
+llm_retries: 2  # 请求失败时的重试次数 (指数退避)
+llm_token_budget: 3000  # 提示词的 token 预算，超出时压缩分析报告 (应小于模型的上下文长度，0 表示不限制)
+llm_cache_dir: ""  # 生成结果缓存目录 (留空使用 ~/.cache/readme-generator/llm)
+llm_cache_ttl_days: 30  # 缓存过期天数 (0 表示不过期)
+llm_cache_max_mb: 64  # 生成结果缓存大小上限 (MB)
 """
 
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -241,6 +472,11 @@ exclude_files:
     logger.info(f"默认配置文件已创建: {output_path}")
 
 
+def is_subpath(path: str, parent: str) -> bool:
+  """path 是否为 parent 本身或其中的路径（均为绝对路径；按路径分量比较，/a/bc 不在 /a/b 中）"""
+  return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
 def validate_project_structure(project_root: Path) -> List[str]:
   """验证项目结构并返回建议"""
   suggestions = []
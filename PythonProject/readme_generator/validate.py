@@ -0,0 +1,293 @@
+"""
+生成内容验证模块
+移植 run.sh 的 post_process_readme 与 validate_readme_content，
+并提供流式验证：在模型输出的同时检查标题缺失、重复输出与思考过程泄漏，
+尽早中止不合格的生成；按二级标题拆分章节，以便只重新生成不合格的章节
+"""
+
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+# 内容的最小长度（与 run.sh 的 validate_readme_content 一致）
+MIN_CONTENT_LENGTH = 100
+
+# 输出开头允许出现的非 Markdown 内容长度，超过后仍没有标题则中止
+HEADING_WINDOW = 600
+
+# 单个 <think> 块的最大长度，超过视为思考过程失控
+MAX_THINK_CHARS = 8000
+
+# 输出的最大长度，超过视为失控
+MAX_OUTPUT_CHARS = 60000
+
+# 同一行（至少 MIN_REPEAT_LINE 个字符）出现超过 REPEAT_LIMIT 次视为重复输出，
+# 同一标题出现超过 HEADING_REPEAT_LIMIT 次视为从头重新输出
+MIN_REPEAT_LINE = 20
+REPEAT_LIMIT = 3
+HEADING_REPEAT_LIMIT = 2
+
+# 行内循环：最后 LOOP_TAIL 个字符在最近 LOOP_WINDOW 个字符中出现 LOOP_LIMIT 次以上
+LOOP_TAIL = 80
+LOOP_WINDOW = 2000
+LOOP_LIMIT = 3
+
+# validate_readme_content：开头几行中出现即视为思考过程
+THINKING_RE = re.compile(r'(好的，|我现在|让我来|我将|根据您的要求|基于以上分析|处理用户的请求|生成一个符合要求)')
+
+# post_process_readme：超过 150 个字符且包含这些关键词的非标题行视为思考过程段落
+THINKING_PARAGRAPH_RE = re.compile(
+    r'根据.*分析|基于.*信息|首先.*需要|接下来.*是|这个.*项目|用户.*要求|生成.*README|处理.*请求|'
+    r'确保.*功能|可能.*涉及|需要.*包括|项目.*结构|依赖.*管理|贡献.*指南|许可证.*信息')
+THINKING_PARAGRAPH_LENGTH = 150
+
+# 章节中以这些内容开头的行视为思考过程或元评论
+THINKING_LINE_RE = re.compile(
+    r'^(好的[，,]|我现在需要|让我来|我将|我会|我需要|根据您的要求|首先，我需要|现在，将所有信息|'
+    r'Okay, |Let me |I will |I need to |I should |Wait, |Here is the README)')
+
+_HEADING_RE = re.compile(r'^#{1,6}\s')
+_TITLE_RE = re.compile(r'^#\s')
+_BLANK_LINES_RE = re.compile(r'\n{4,}')
+_TRIVIAL_LINE_RE = re.compile(r'^[\s|:\-=*_`~#>+.─│├└┌┐┘┬┴┼]*$')
+
+
+def post_process(content: str) -> str:
+  """移除思考过程（对应 run.sh 的 post_process_readme）
+
+  从第一个一级标题开始保留，删除以超长的思考过程行开头的段落，
+  并把连续的空行合并为最多两个。
+  """
+  lines = content.split('\n')
+  for i, line in enumerate(lines):
+    if _TITLE_RE.match(line):
+      lines = lines[i:]
+      break
+
+  result = []
+  in_thinking = False
+  for line in lines:
+    if (len(line) > THINKING_PARAGRAPH_LENGTH and not line.startswith('#') and
+        THINKING_PARAGRAPH_RE.search(line)):
+      in_thinking = True
+      continue
+    if line.startswith('#') or not line:
+      in_thinking = False
+    if not in_thinking:
+      result.append(line)
+  return _BLANK_LINES_RE.sub('\n\n\n', '\n'.join(result))
+
+
+def validate_content(content: str, min_length: int = MIN_CONTENT_LENGTH) -> List[str]:
+  """验证 README 内容（对应 run.sh 的 validate_readme_content），返回问题列表
+
+  单独验证标题与简介部分时 min_length 为 0，不检查长度。
+  """
+  problems = []
+  lines = content.split('\n')
+  if not _TITLE_RE.match(lines[0]):
+    problems.append("第一行不是标题格式")
+  if any(THINKING_RE.search(line) for line in lines[:5]):
+    problems.append("包含思考过程文字")
+  if any(len(line) > 200 and not line.startswith('#') for line in lines[:10]):
+    problems.append("开头存在可能是思考过程的长行")
+  if len(content) < min_length:
+    problems.append("内容过短")
+  return problems
+
+
+def section_problems(text: str) -> List[str]:
+  """检查单个章节，返回问题列表（代码块中的内容不检查）"""
+  problems = []
+  in_code = False
+  for line in text.split('\n'):
+    if line.lstrip().startswith('```'):
+      in_code = not in_code
+      continue
+    if in_code:
+      continue
+    if '<think>' in line or '</think>' in line:
+      problems.append("包含 <think> 标签")
+    elif THINKING_LINE_RE.match(line.strip()):
+      problems.append(f"包含思考过程: {line.strip()[:40]}")
+    elif (len(line) > THINKING_PARAGRAPH_LENGTH and not line.startswith('#') and
+          THINKING_PARAGRAPH_RE.search(line)):
+      problems.append(f"包含思考过程段落: {line[:40]}")
+  return problems
+
+
+def strip_thinking(text: str) -> str:
+  """删除章节中的思考过程行与 <think> 标签（重新生成章节仍失败时的兜底处理）"""
+  lines = []
+  in_code = False
+  for line in text.split('\n'):
+    if line.lstrip().startswith('```'):
+      in_code = not in_code
+    elif not in_code:
+      line = line.replace('<think>', '').replace('</think>', '')
+      if THINKING_LINE_RE.match(line.strip()):
+        continue
+    lines.append(line)
+  return post_process('\n'.join(lines)) if _TITLE_RE.match(text) else '\n'.join(lines)
+
+
+def split_sections(content: str) -> List[Tuple[str, str]]:
+  """按二级标题拆分 README，返回 [(标题行, 章节全文)]
+
+  第一个二级标题之前的内容（一级标题与简介）作为标题为空字符串的章节；
+  代码块中的 ## 不视为标题。
+  """
+  sections: List[Tuple[str, List[str]]] = [('', [])]
+  in_code = False
+  for line in content.split('\n'):
+    if line.lstrip().startswith('```'):
+      in_code = not in_code
+    if not in_code and line.startswith('## '):
+      sections.append((line.strip(), []))
+    sections[-1][1].append(line)
+  return [(heading, '\n'.join(lines).strip('\n'))
+          for heading, lines in sections
+          if heading or any(line.strip() for line in lines)]
+
+
+def _partial_suffix(data: str, tag: str) -> int:
+  """data 末尾与 tag 开头重合的最大长度（小于 tag 的长度）"""
+  for size in range(min(len(tag) - 1, len(data)), 0, -1):
+    if data.endswith(tag[:size]):
+      return size
+  return 0
+
+
+def join_sections(sections: List[Tuple[str, str]]) -> str:
+  return '\n\n'.join(text for _, text in sections)
+
+
+class StreamValidator:
+  """流式验证器
+
+  feed() 接收模型输出的增量文本，发现问题时返回问题描述（应中止生成），否则返回 None。
+  <think> 块不计入可见内容；require_title 为 True 时要求输出以一级标题开始，
+  否则（续写或重写单个章节）只要求出现任意级别的标题。
+  """
+
+  def __init__(self, require_title: bool = True):
+    self.require_title = require_title
+    # 原始输出与去掉 <think> 块之后的输出
+    self._raw: List[str] = []
+    self._visible: List[str] = []
+    self._visible_len = 0
+    # 尚未处理的可能被拆开的标签、当前未完成的行、用于检测循环的最近输出
+    self._pending = ''
+    self._line = ''
+    self._window = ''
+    self._in_think = False
+    self._think_len = 0
+    self._in_code = False
+    self._has_heading = False
+    self._lines: Counter = Counter()
+    self._headings: Counter = Counter()
+    self._since_loop_check = 0
+
+  @property
+  def text(self) -> str:
+    """模型的原始输出"""
+    return ''.join(self._raw)
+
+  @property
+  def visible(self) -> str:
+    """去掉 <think> 块之后的输出"""
+    return ''.join(self._visible)
+
+  def feed(self, chunk: str) -> Optional[str]:
+    self._raw.append(chunk)
+    data = self._pending + chunk
+    self._pending = ''
+    while data:
+      tag = '</think>' if self._in_think else '<think>'
+      pos = data.find(tag)
+      if pos < 0:
+        # 末尾可能是被拆开的标签，留到下一块再处理
+        keep = _partial_suffix(data, tag)
+        if keep:
+          self._pending = data[-keep:]
+          data = data[:-keep]
+        if self._in_think:
+          self._think_len += len(data)
+          return "思考过程过长" if self._think_len > MAX_THINK_CHARS else None
+        return self._feed_visible(data)
+
+      if self._in_think:
+        self._in_think = False
+      else:
+        problem = self._feed_visible(data[:pos])
+        if problem:
+          return problem
+        if self._has_heading:
+          return "正文中出现 <think> 思考过程"
+        self._in_think = True
+        self._think_len = 0
+      data = data[pos + len(tag):]
+    return None
+
+  def _feed_visible(self, text: str) -> Optional[str]:
+    if not text:
+      return None
+    self._visible.append(text)
+    self._visible_len += len(text)
+    if self._visible_len > MAX_OUTPUT_CHARS:
+      return "输出过长"
+
+    # 检查本次新完成的行
+    lines = (self._line + text).split('\n')
+    self._line = lines.pop()
+    for line in lines:
+      problem = self._check_line(line)
+      if problem:
+        return problem
+
+    if not self._has_heading and self._visible_len > HEADING_WINDOW:
+      return "输出开头没有 Markdown 标题"
+
+    self._window = (self._window + text)[-LOOP_WINDOW:]
+    self._since_loop_check += len(text)
+    if self._since_loop_check >= LOOP_TAIL:
+      self._since_loop_check = 0
+      tail = self._window[-LOOP_TAIL:]
+      if (len(self._window) >= LOOP_TAIL * (LOOP_LIMIT + 1) and tail.strip() and
+          self._window.count(tail) > LOOP_LIMIT):
+        return "重复输出"
+    return None
+
+  def _check_line(self, line: str) -> Optional[str]:
+    stripped = line.strip()
+    if stripped.startswith('```'):
+      # 包裹整个输出的 ```markdown 不是代码块
+      if self._has_heading or stripped not in ('```markdown', '```md'):
+        self._in_code = not self._in_code
+      return None
+    if _HEADING_RE.match(stripped) and not self._in_code:
+      if not self._has_heading and self.require_title and not _TITLE_RE.match(
+          stripped):
+        return "第一个标题不是一级标题"
+      self._has_heading = True
+      self._headings[stripped] += 1
+      if self._headings[stripped] > HEADING_REPEAT_LIMIT:
+        return f"标题重复: {stripped[:40]}"
+      return None
+    if len(stripped) >= MIN_REPEAT_LINE and not _TRIVIAL_LINE_RE.match(stripped):
+      self._lines[stripped] += 1
+      if self._lines[stripped] > REPEAT_LIMIT:
+        return f"重复输出: {stripped[:40]}"
+    return None
+
+  def finish(self) -> Optional[str]:
+    """输出结束时的检查"""
+    if self._in_think:
+      return "思考过程未结束"
+    problem = self._feed_visible(self._pending) or self._check_line(self._line)
+    self._pending = self._line = ''
+    if problem:
+      return problem
+    if not self._has_heading:
+      return "输出中没有 Markdown 标题"
+    return None
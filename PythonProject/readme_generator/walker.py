@@ -0,0 +1,463 @@
+"""
+目录遍历模块
+基于 os.scandir 的目录树遍历，复用 DirEntry 缓存的类型信息，
+避免为每个条目额外构造 Path 和调用 stat；
+可选使用线程池并行遍历子目录。
+每个目录只保留按名称排序的前若干个条目，其余条目只计数，
+只包含生成内容的目录折叠为一行；
+可在同一次遍历中把所有文件交给统计收集器
+"""
+
+import fnmatch
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Collection, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+# Path 对象在同一父目录下按名称排序；Windows 上不区分大小写
+_sort_key = os.path.normcase
+
+
+def scan_directory(path: str, exclude: Collection[str] = ()) -> List[os.DirEntry]:
+  """列出目录下未被排除的条目，按名称排序"""
+  with os.scandir(path) as it:
+    entries = [entry for entry in it if entry.name not in exclude]
+  entries.sort(key=lambda entry: _sort_key(entry.name))
+  return entries
+
+
+def scan_limited(path: str,
+                 exclude: Collection[str] = (),
+                 limit: Optional[int] = None,
+                 on_file: Optional[Callable[[os.DirEntry], None]] = None,
+                 omitted_dirs: Optional[List[str]] = None
+                ) -> Tuple[List[os.DirEntry], Optional[Dict[str, int]], bool]:
+  """列出目录下按名称排序的前 limit 个条目
+
+  返回 (条目, 省略条目的统计, 是否包含生成目录标记文件)。
+  超出 limit 的条目只在 scandir 迭代中计数（文件大小需要一次 stat），不保留；
+  内存中最多同时保留 limit + max(limit, 1024) 个条目。limit 为 None 时不限制。
+  on_file 对每个文件条目（包括被省略的）调用一次；
+  omitted_dirs 不为 None 时记录被省略的子目录路径。
+  """
+  if limit is None:
+    entries = scan_directory(path, exclude)
+    if on_file is not None:
+      for entry in entries:
+        if not entry_is_dir(entry):
+          on_file(entry)
+    has_marker = any(entry.name in GENERATED_MARKERS for entry in entries)
+    return entries, None, has_marker
+
+  kept: List[os.DirEntry] = []
+  omitted = new_summary()
+  has_marker = False
+  key = lambda entry: _sort_key(entry.name)
+  # 攒够一批再排序截断，使每个条目平均只参与一两次排序
+  batch = limit + max(limit, 1024)
+  with os.scandir(path) as it:
+    for entry in it:
+      if entry.name in exclude:
+        continue
+      if entry.name in GENERATED_MARKERS:
+        has_marker = True
+      if on_file is not None and not entry_is_dir(entry):
+        on_file(entry)
+      if limit == 0:
+        _count_entry(omitted, entry, omitted_dirs)
+        continue
+      kept.append(entry)
+      if len(kept) >= batch:
+        kept.sort(key=key)
+        for dropped in kept[limit:]:
+          _count_entry(omitted, dropped, omitted_dirs)
+        del kept[limit:]
+
+  kept.sort(key=key)
+  for dropped in kept[limit:]:
+    _count_entry(omitted, dropped, omitted_dirs)
+  del kept[limit:]
+  return kept, omitted if omitted['files'] or omitted['dirs'] else None, has_marker
+
+
+def new_summary() -> Dict[str, int]:
+  """省略条目的统计: 文件数、目录数、文件总字节数"""
+  return {'files': 0, 'dirs': 0, 'bytes': 0}
+
+
+def _count_entry(summary: Dict[str, int],
+                 entry: os.DirEntry,
+                 omitted_dirs: Optional[List[str]] = None):
+  if entry_is_dir(entry):
+    summary['dirs'] += 1
+    if omitted_dirs is not None:
+      omitted_dirs.append(entry.path)
+    return
+  summary['files'] += 1
+  try:
+    summary['bytes'] += entry.stat().st_size
+  except OSError:
+    pass
+
+
+def format_size(size: int) -> str:
+  """格式化字节数，例如 3.1 GB"""
+  value = float(size)
+  for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+    if value < 1024 or unit == 'TB':
+      return f"{int(value)} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+    value /= 1024
+  return f"{size} B"
+
+
+def format_summary(summary: Dict[str, int]) -> str:
+  """格式化省略条目的统计，例如 "49,812 个文件、3 个目录，3.1 GB" """
+  parts = []
+  if summary['files']:
+    parts.append(f"{summary['files']:,} 个文件")
+  if summary['dirs']:
+    parts.append(f"{summary['dirs']:,} 个目录")
+  text = '、'.join(parts) or '空'
+  if summary['bytes']:
+    text += f"，{format_size(summary['bytes'])}"
+  return text
+
+
+def entry_is_dir(entry: os.DirEntry) -> bool:
+  """判断条目是否为目录（与 Path.is_dir 一致，跟随符号链接）"""
+  try:
+    return entry.is_dir()
+  except OSError:
+    return False
+
+
+class CachedEntry:
+  """从缓存恢复的目录条目，提供与 os.DirEntry 相同的常用接口"""
+
+  __slots__ = ('name', 'path', '_is_dir')
+
+  def __init__(self, name: str, path: str, is_dir: bool):
+    self.name = name
+    self.path = path
+    self._is_dir = is_dir
+
+  def is_dir(self) -> bool:
+    return self._is_dir
+
+  def is_file(self) -> bool:
+    return not self._is_dir
+
+  def is_symlink(self) -> bool:
+    return os.path.islink(self.path)
+
+  def stat(self) -> os.stat_result:
+    return os.stat(self.path)
+
+
+# 目录列表缓存:
+# {目录路径: [目录 mtime_ns, [[名称, 是否目录], ...], 省略条目的统计, 是否折叠]}
+# 省略条目的大小只在目录 mtime 变化时重新统计
+Listings = Dict[str, list]
+
+# 默认折叠的生成目录（名称支持通配符）
+DEFAULT_COLLAPSE_PATTERNS = [
+    'node_modules', '__pycache__', '*.egg-info', 'build', 'dist', '.tox', '.nox',
+    '.venv', 'venv', '.mypy_cache', '.pytest_cache', '.ruff_cache', 'htmlcov',
+    '.readme_cache', 'site-packages'
+]
+
+# 目录中出现这些文件时，认为整个目录都是生成的内容（缓存目录标记、虚拟环境）
+GENERATED_MARKERS = frozenset({'CACHEDIR.TAG', 'pyvenv.cfg'})
+
+# 扫描结果: (条目, 是否目录, 省略条目的统计, 是否折叠)
+ScanResult = Tuple[List[Any], List[bool], Optional[Dict[str, int]], bool]
+
+
+class DirectoryTree:
+  """一次目录遍历的结果，供结构树、入口点、统计等收集器共享"""
+
+  __slots__ = ('name', 'path', 'entries', 'children', 'omitted', 'collapsed')
+
+  def __init__(self, name: str, path: str):
+    self.name = name
+    self.path = path
+    # 已排序、已过滤的目录条目（超出每个目录条目上限的部分不在其中）
+    self.entries: List[os.DirEntry] = []
+    # 已遍历的子目录（超出 max_depth 的目录不在其中）
+    self.children: Dict[str, 'DirectoryTree'] = {}
+    # 超出条目上限而省略的条目统计，没有省略时为 None
+    self.omitted: Optional[Dict[str, int]] = None
+    # 只包含生成内容的目录被折叠，所有条目都计入 omitted
+    self.collapsed = False
+
+  @property
+  def complete(self) -> bool:
+    """entries 是否包含了目录下的全部条目"""
+    return self.omitted is None
+
+  def names(self) -> List[str]:
+    """当前目录下的条目名称"""
+    return [entry.name for entry in self.entries]
+
+  def iter_files(self) -> Iterator[os.DirEntry]:
+    """按树的顺序遍历所有已扫描的文件条目"""
+    for entry in self.entries:
+      child = self.children.get(entry.name)
+      if child is not None:
+        yield from child.iter_files()
+      elif not entry_is_dir(entry):
+        yield entry
+
+  def render(self) -> List[str]:
+    """渲染目录树文本行（不含根目录行）"""
+    return list(self.iter_render())
+
+  def iter_render(self, prefix: str = "") -> Iterator[str]:
+    """逐行生成目录树文本（不含根目录行）"""
+    last_index = len(self.entries) - (0 if self.omitted else 1)
+    for i, entry in enumerate(self.entries):
+      is_last = i == last_index
+      child = self.children.get(entry.name)
+      name = entry.name
+      if child is not None and child.collapsed:
+        name += f"/ (已折叠: {format_summary(child.omitted or new_summary())})"
+      yield f"{prefix}{'└── ' if is_last else '├── '}{name}"
+
+      if child is not None and not child.collapsed:
+        yield from child.iter_render(prefix + ("    " if is_last else "│   "))
+
+    if self.omitted:
+      yield f"{prefix}└── … 另有 {format_summary(self.omitted)}"
+
+
+def _scan_node(path: str,
+               exclude: Collection[str],
+               previous: Optional[Listings] = None,
+               current: Optional[Listings] = None,
+               max_entries: Optional[int] = None,
+               collapse: bool = False,
+               on_file: Optional[Callable[[os.DirEntry], None]] = None,
+               omitted_dirs: Optional[List[str]] = None) -> ScanResult:
+  """扫描单个目录，返回条目、是否目录、省略条目的统计及是否折叠；无权限时视为空目录
+
+  collapse 为 True（名称匹配折叠模式）或目录中包含生成目录标记文件时折叠目录，
+  此时只计数不保留条目。
+  传入 previous/current 时，目录 mtime 未变化则直接复用上次的列表，
+  只需一次 stat，无需 scandir。on_file 与 omitted_dirs 见 scan_limited。
+  """
+  mtime = None
+  if current is not None:
+    try:
+      mtime = os.stat(path).st_mtime_ns
+    except OSError:
+      pass
+    cached = previous.get(path) if previous else None
+    if cached is not None and mtime is not None and cached[0] == mtime and \
+        len(cached) == 4:
+      current[path] = cached
+      entries = [
+          CachedEntry(name, os.path.join(path, name), is_dir)
+          for name, is_dir in cached[1]
+      ]
+      return entries, [is_dir for _, is_dir in cached[1]], cached[2], cached[3]
+
+  try:
+    entries, omitted, has_marker = scan_limited(path, exclude,
+                                                0 if collapse else max_entries,
+                                                on_file, omitted_dirs)
+  except PermissionError:
+    entries, omitted, has_marker = [], None, False
+  if has_marker and not collapse:
+    collapse = True
+    omitted = omitted or new_summary()
+    for entry in entries:
+      _count_entry(omitted, entry)
+    entries = []
+  dir_flags = [entry_is_dir(entry) for entry in entries]
+
+  if current is not None and mtime is not None:
+    current[path] = [
+        mtime, [[entry.name, is_dir] for entry, is_dir in zip(entries, dir_flags)],
+        omitted, collapse
+    ]
+  return entries, dir_flags, omitted, collapse
+
+
+def _attach(node: DirectoryTree, result: ScanResult,
+            descend: bool) -> List[DirectoryTree]:
+  """记录扫描结果，返回需要继续遍历的子目录节点"""
+  entries, dir_flags, node.omitted, node.collapsed = result
+  node.entries = entries
+  if not descend or node.collapsed:
+    return []
+  pending = []
+  for entry, is_dir in zip(entries, dir_flags):
+    if is_dir:
+      child = DirectoryTree(entry.name, entry.path)
+      node.children[entry.name] = child
+      pending.append(child)
+  return pending
+
+
+def _matches(name: str, patterns: Collection[str]) -> bool:
+  return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _group_paths(paths: Collection[str]) -> Dict[str, FrozenSet[str]]:
+  """把路径按所在目录分组: {规范化的目录路径: 名称集合}"""
+  groups: Dict[str, set] = {}
+  for path in paths:
+    parent, name = os.path.split(os.path.normpath(path))
+    groups.setdefault(parent or os.curdir, set()).add(name)
+  return {parent: frozenset(names) for parent, names in groups.items()}
+
+
+def _directory_exclude(path: str, exclude: FrozenSet[str],
+                       excluded_names: Dict[str, FrozenSet[str]]) -> FrozenSet[str]:
+  """目录 path 中需要排除的名称：全局排除的名称加上按路径排除的条目"""
+  if not excluded_names:
+    return exclude
+  names = excluded_names.get(os.path.normpath(path))
+  return exclude | names if names else exclude
+
+
+def _collect_subtree(path: str, exclude: FrozenSet[str],
+                     collapse: Collection[str], stats,
+                     excluded_names: Optional[Dict[str, FrozenSet[str]]] = None):
+  """将 path 下（不限深度）所有文件交给统计收集器
+
+  不排序、不构造树节点；跳过排除的条目、折叠的目录、包含生成目录标记的目录，
+  并且不跟随目录的符号链接。
+  """
+  stack = [path]
+  while stack:
+    dir_path = stack.pop()
+    dir_exclude = _directory_exclude(dir_path, exclude, excluded_names)
+    batch = stats.batch()
+    subdirs = []
+    has_marker = False
+    try:
+      with os.scandir(dir_path) as it:
+        for entry in it:
+          name = entry.name
+          if name in dir_exclude:
+            continue
+          if name in GENERATED_MARKERS:
+            has_marker = True
+          try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+          except OSError:
+            continue
+          if not is_dir:
+            batch.add(entry)
+          elif not _matches(name, collapse):
+            subdirs.append(entry.path)
+    except OSError:
+      continue
+    if not has_marker:
+      stats.merge(batch)
+      stack.extend(subdirs)
+
+
+def walk_tree(root: str,
+              exclude: Collection[str] = (),
+              max_depth: int = 3,
+              workers: int = 0,
+              previous: Optional[Listings] = None,
+              current: Optional[Listings] = None,
+              max_entries: Optional[int] = None,
+              collapse: Collection[str] = (),
+              stats=None,
+              exclude_paths: Collection[str] = ()) -> DirectoryTree:
+  """遍历目录树
+
+  workers 大于 1 时使用有界线程池并行扫描子目录；
+  每个目录内的条目顺序与串行遍历完全一致。
+  previous 为上次遍历记录的目录列表，current 用于记录本次遍历的目录列表。
+  max_entries 为每个目录保留的条目数上限（None 表示不限制），
+  名称匹配 collapse 中模式的子目录被折叠。
+
+  stats 为统计收集器（提供 batch()、merge(batch)，batch 提供 add(entry)）时，
+  在同一次遍历中把所有文件交给收集器：超出条目上限或 max_depth 的部分只统计、
+  不进入目录树；折叠的目录不参与统计。统计需要访问每个文件，因此不使用目录列表缓存。
+  exclude_paths 中的文件或目录（路径以 root 开头）既不进入目录树也不参与统计。
+  """
+  exclude = frozenset(exclude)
+  excluded_names = _group_paths(exclude_paths)
+  collapse = tuple(collapse)
+  tree = DirectoryTree(os.path.basename(os.path.abspath(root)), root)
+  if stats is not None:
+    previous = current = None
+
+  # 通过符号链接到达的目录（及其子目录）不参与统计，避免重复计数；
+  # 并行遍历时多个线程同时读写该列表，由锁保护
+  linked_roots: List[str] = []
+  linked_lock = threading.Lock()
+
+  def _via_symlink(node: DirectoryTree, depth: int) -> bool:
+    if depth == 0:
+      return False
+    with linked_lock:
+      if any(node.path.startswith(prefix) for prefix in linked_roots):
+        return True
+    if os.path.islink(node.path):
+      with linked_lock:
+        linked_roots.append(node.path + os.sep)
+      return True
+    return False
+
+  def _scan(node: DirectoryTree, depth: int) -> ScanResult:
+    collapsed = depth > 0 and _matches(node.name, collapse)
+    node_exclude = _directory_exclude(node.path, exclude, excluded_names)
+    if stats is None or collapsed or _via_symlink(node, depth):
+      return _scan_node(node.path, node_exclude, previous, current, max_entries,
+                        collapsed)
+
+    batch = stats.batch()
+    skipped: List[str] = []
+    result = _scan_node(node.path, node_exclude, None, None, max_entries, False,
+                        batch.add, skipped)
+    entries, dir_flags, _, collapsed = result
+    if not collapsed:
+      if depth >= max_depth:
+        skipped.extend(
+            entry.path for entry, is_dir in zip(entries, dir_flags) if is_dir)
+      for path in skipped:
+        if not _matches(os.path.basename(path),
+                        collapse) and not os.path.islink(path):
+          _collect_subtree(path, exclude, collapse, batch, excluded_names)
+      stats.merge(batch)
+    return result
+
+  if workers <= 1:
+
+    def _walk(node: DirectoryTree, depth: int):
+      for child in _attach(node, _scan(node, depth), depth < max_depth):
+        _walk(child, depth + 1)
+
+    _walk(tree, 0)
+    return tree
+
+  with ThreadPoolExecutor(max_workers=workers,
+                          thread_name_prefix='readme-walk') as pool:
+    pending = {pool.submit(_scan, tree, 0): (tree, 0)}
+    while pending:
+      done, _ = wait(pending, return_when=FIRST_COMPLETED)
+      for future in done:
+        node, depth = pending.pop(future)
+        for child in _attach(node, future.result(), depth < max_depth):
+          future = pool.submit(_scan, child, depth + 1)
+          pending[future] = (child, depth + 1)
+
+  return tree
+
+
+def build_tree_lines(root: str,
+                     exclude: Collection[str] = (),
+                     max_depth: int = 3,
+                     workers: int = 0,
+                     max_entries: Optional[int] = None,
+                     collapse: Collection[str] = ()) -> List[str]:
+  """构建目录树文本行（不含根目录行）"""
+  return walk_tree(root, exclude, max_depth, workers, max_entries=max_entries,
+                   collapse=collapse).render()
@@ -0,0 +1,217 @@
+"""
+监视模块
+监视项目目录的变化，防抖后增量重新生成 README。
+安装了 watchdog 时使用系统文件事件（Linux 上为 inotify），否则退回到轮询
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+  from watchdog.events import FileSystemEventHandler
+  from watchdog.observers import Observer
+  WATCHDOG_AVAILABLE = True
+except ImportError:
+  WATCHDOG_AVAILABLE = False
+
+from .core import ReadmeGenerator
+from .gitinfo import GitRepository
+from .manifest import manifest_fingerprint
+from .utils import is_subpath
+
+logger = logging.getLogger(__name__)
+
+# 变化事件: (事件类型, 路径)，事件类型为 created / deleted / modified
+Change = Tuple[str, str]
+
+
+class _EventSource:
+  """基于 watchdog 的事件源"""
+
+  def __init__(self, root: str, extra_paths: List[str]):
+    self._queue: 'queue.Queue[Change]' = queue.Queue()
+    self._observer = Observer()
+    handler = FileSystemEventHandler()
+    handler.on_any_event = self._on_event
+    self._observer.schedule(handler, root, recursive=True)
+    root = os.path.abspath(root)
+    for path in extra_paths:
+      parent = os.path.dirname(os.path.abspath(path))
+      if not is_subpath(parent, root):
+        self._observer.schedule(handler, parent, recursive=False)
+    self._observer.start()
+
+  def _on_event(self, event):
+    # 目录的 modified 事件只表示其中条目有变化，条目本身会产生独立的事件
+    if event.is_directory and event.event_type == 'modified':
+      return
+    if event.event_type == 'moved':
+      self._queue.put(('deleted', event.src_path))
+      self._queue.put(('created', event.dest_path))
+    elif event.event_type in ('created', 'deleted', 'modified'):
+      self._queue.put((event.event_type, event.src_path))
+
+  def poll(self, timeout: float) -> List[Change]:
+    """等待事件，最多等待 timeout 秒"""
+    changes = []
+    try:
+      changes.append(self._queue.get(timeout=timeout))
+      while True:
+        changes.append(self._queue.get_nowait())
+    except queue.Empty:
+      pass
+    return changes
+
+  def close(self):
+    self._observer.stop()
+    self._observer.join()
+
+
+class _PollingSource:
+  """轮询事件源
+
+  只对上一次遍历到的目录、清单文件、Git 文件和模板执行 stat：
+  目录 mtime 变化表示其中有条目新增或删除，文件 mtime/size 变化表示内容被修改。
+  """
+
+  def __init__(self, generator: ReadmeGenerator, interval: float):
+    self._generator = generator
+    self._interval = interval
+    self._snapshot = self._take_snapshot()
+
+  def _watched_files(self) -> List[str]:
+    config = self._generator.config
+    root = config.project_root
+    files = [str(root / name) for name, _, _ in manifest_fingerprint(root)]
+    try:
+      repo = GitRepository.discover(root)
+    except (OSError, ValueError):
+      repo = None
+    if repo is not None:
+      files += repo.state_files()
+    if config.template_path and config.template_path.is_file():
+      files.append(str(config.template_path))
+    return files
+
+  def _watched_dirs(self) -> List[str]:
+    tree = self._generator.last_tree
+    if tree is None:
+      return [str(self._generator.config.project_root)]
+    dirs = []
+    stack = [tree]
+    while stack:
+      node = stack.pop()
+      dirs.append(node.path)
+      stack.extend(node.children.values())
+    return dirs
+
+  def _take_snapshot(self) -> Dict[str, Tuple[str, Optional[tuple]]]:
+    snapshot = {}
+    for path in self._watched_dirs():
+      try:
+        snapshot[path] = ('dir', os.stat(path).st_mtime_ns)
+      except OSError:
+        snapshot[path] = ('dir', None)
+    for path in self._watched_files():
+      try:
+        st = os.stat(path)
+        snapshot[path] = ('file', (st.st_mtime_ns, st.st_size))
+      except OSError:
+        snapshot[path] = ('file', None)
+    return snapshot
+
+  def poll(self, timeout: float) -> List[Change]:
+    """等待一个轮询周期并返回检测到的变化"""
+    time.sleep(min(timeout, self._interval))
+    previous, self._snapshot = self._snapshot, self._take_snapshot()
+
+    changes = []
+    for path, (kind, value) in self._snapshot.items():
+      old = previous.get(path)
+      if old is not None and old[1] == value:
+        continue
+      if kind == 'dir':
+        # 目录条目有增删，具体条目未知，以目录自身的创建事件表示
+        changes.append(('created', path))
+      elif value is None:
+        changes.append(('deleted', path))
+      elif old is None or old[1] is None:
+        changes.append(('created', path))
+      else:
+        changes.append(('modified', path))
+    for path in previous.keys() - self._snapshot.keys():
+      changes.append(('deleted', path))
+    return changes
+
+  def refresh(self):
+    """重新生成后更新需要轮询的目录列表"""
+    self._snapshot = self._take_snapshot()
+
+  def close(self):
+    pass
+
+
+class ProjectWatcher:
+  """监视项目目录并在变化后增量重新生成 README"""
+
+  def __init__(self,
+               generator: ReadmeGenerator,
+               debounce: float = 0.5,
+               poll_interval: float = 1.0,
+               use_events: bool = True):
+    self.generator = generator
+    self.debounce = debounce
+    self.poll_interval = poll_interval
+    self.use_events = use_events and WATCHDOG_AVAILABLE
+
+  def _open_source(self):
+    config = self.generator.config
+    if self.use_events:
+      extra = [str(config.template_path)] if config.template_path and \
+          config.template_path.is_file() else []
+      logger.info("使用 watchdog 文件系统事件监视项目")
+      return _EventSource(str(config.project_root), extra)
+    if WATCHDOG_AVAILABLE:
+      logger.info(f"使用轮询监视项目 (间隔 {self.poll_interval}s)")
+    else:
+      logger.info(f"未安装 watchdog，使用轮询监视项目 (间隔 {self.poll_interval}s)；"
+                  "安装 readme-generator[watch] 可改用文件系统事件")
+    return _PollingSource(self.generator, self.poll_interval)
+
+  def run(self, stop_event: Optional[threading.Event] = None):
+    """开始监视，直到 stop_event 被设置或收到 KeyboardInterrupt"""
+    stop_event = stop_event or threading.Event()
+
+    self.generator.regenerate()
+    source = self._open_source()
+    logger.info(f"正在监视: {self.generator.config.project_root}")
+
+    try:
+      while not stop_event.is_set():
+        changes = source.poll(self.poll_interval)
+        if not changes:
+          continue
+
+        # 防抖：持续收集事件，直到安静 debounce 秒
+        while not stop_event.is_set():
+          more = source.poll(self.debounce)
+          if not more:
+            break
+          changes.extend(more)
+
+        try:
+          if self.generator.regenerate(changes):
+            logger.info(f"检测到 {len(changes)} 个变化，README 已更新")
+        except Exception as e:
+          logger.error(f"重新生成失败: {e}")
+
+        if isinstance(source, _PollingSource):
+          source.refresh()
+    except KeyboardInterrupt:
+      pass
+    finally:
+      source.close()
@@ -31,6 +31,14 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        # 仅在直接解析 .git 目录失败时使用
+        "git": ["gitpython>=3.1.0"],
+        # 运行 tests/ 下的测试
+        "test": ["pytest>=7.0"],
+        # 监视模式使用文件系统事件，未安装时退回到轮询
+        "watch": ["watchdog>=2"],
+    },
     entry_points={
         "console_scripts": [
             "readme-gen=main:main",
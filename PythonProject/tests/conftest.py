@@ -0,0 +1,88 @@
+"""
+测试公共配置
+把项目目录加入模块搜索路径，并提供生成临时项目与配置的夹具
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from readme_generator.config import Config  # noqa: E402
+
+
+def write_files(root: Path, files: Dict[str, str]):
+  """按 {相对路径: 内容} 写入文件"""
+  for rel, content in files.items():
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+
+
+def git(root: Path, *args: str) -> str:
+  """在 root 中运行 git 命令，返回标准输出"""
+  env = dict(os.environ,
+             GIT_AUTHOR_NAME='Test',
+             GIT_AUTHOR_EMAIL='test@example.com',
+             GIT_COMMITTER_NAME='Test',
+             GIT_COMMITTER_EMAIL='test@example.com',
+             GIT_CONFIG_GLOBAL=os.devnull,
+             GIT_CONFIG_NOSYSTEM='1')
+  return subprocess.run(['git', *args], cwd=root, env=env, check=True, capture_output=True,
+                        text=True).stdout.strip()
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+  """包含清单与少量源文件的临时项目"""
+  root = tmp_path / 'project'
+  write_files(
+      root, {
+          'setup.py': ('from setuptools import setup\n\n'
+                       'setup(name="demo", description="示例项目", install_requires=["requests>=2.0"])\n'),
+          'main.py': 'def main():\n  pass\n',
+          'demo/__init__.py': '"""示例包"""\n',
+          'demo/core.py': 'def add(a, b):\n  return a + b\n'
+      })
+  return root
+
+
+@pytest.fixture
+def make_config(project: Path):
+  """生成以临时项目为根目录的配置，关键字参数覆盖默认值"""
+
+  def _make(**overrides: Any) -> Config:
+    data = {
+        'project_root': str(project),
+        'output_path': str(project / 'README.md'),
+        'git_auto_detect': False
+    }
+    data.update(overrides)
+    return Config(data)
+
+  return _make
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path: Path, monkeypatch):
+  """在临时目录中运行，避免读取或写入仓库中的文件"""
+  monkeypatch.chdir(tmp_path)
+  monkeypatch.setenv('XDG_CACHE_HOME', os.path.join(str(tmp_path), 'xdg-cache'))
+
+
+@pytest.fixture
+def git_project(project: Path) -> Path:
+  """已初始化为 Git 仓库并提交一次的临时项目"""
+  if shutil.which('git') is None:
+    pytest.skip('需要 git 命令')
+  git(project, 'init', '-q', '-b', 'main')
+  git(project, 'add', '-A')
+  git(project, 'commit', '-q', '-m', 'initial')
+  return project
@@ -0,0 +1,58 @@
+"""
+API 文档提取测试
+"""
+
+import ast
+
+import pytest
+from conftest import write_files
+
+from readme_generator import api_docs
+from readme_generator.api_docs import PARALLEL_THRESHOLD, ApiExtractor, _format_expr, format_signature
+from readme_generator.core import ReadmeGenerator
+
+
+@pytest.mark.parametrize('source', [
+    'Optional[Dict[str, List[int]]]', 'os.PathLike', "'text'", '...', 'Tuple[int, ...]', '(1,)',
+    '()', 'int | None', '-1', '[1, 2]', "{'a': 1, **extra}", '{1, 2}', 'factory(1, x=2, **kw)',
+    'Callable[[int], str]', 'None', "b'data'", '1.5'
+])
+def test_format_expr_matches_unparse(source):
+  # Python 3.8 上没有 ast.unparse，简化的格式化结果应与其一致
+  node = ast.parse(source, mode='eval').body
+  assert _format_expr(node) == ast.unparse(node)
+
+
+def test_format_signature_without_unparse(monkeypatch):
+  monkeypatch.delattr(ast, 'unparse')
+  func = ast.parse('async def fetch(url: str, *, retries: Optional[int] = 3, **kw) -> bytes: ...'
+                  ).body[0]
+  assert format_signature(func) == \
+      'async fetch(url: str, *, retries: Optional[int] = 3, **kw) -> bytes'
+
+
+def test_extract_covers_modules_beyond_structure_limits(project, make_config):
+  files = {f"mod_{i:02d}.py": f"def f{i}():\n  pass\n" for i in range(60)}
+  files.update({
+      'pkg/a/b/c/deep.py': 'def deep():\n  pass\n',
+      'venv/lib/site.py': 'def site():\n  pass\n',
+      'env/pyvenv.cfg': 'home = /usr/bin\n',
+      'env/lib/vendored.py': 'def vendored():\n  pass\n',
+      'build/lib/copy.py': 'def copy():\n  pass\n'
+  })
+  write_files(project, files)
+  generator = ReadmeGenerator(
+      make_config(include_api_docs=True, structure_max_depth=2, structure_max_entries=50))
+  modules = {module['name'] for module in generator._collect_project_info()['api']}
+  # 结构树的深度与条目上限不影响 API 文档；虚拟环境与构建产物不解析
+  assert modules == {f"mod_{i:02d}" for i in range(60)} | {
+      'demo', 'demo.core', 'main', 'setup', 'pkg.a.b.c.deep'
+  }
+
+
+def test_run_serially_inside_worker(monkeypatch):
+  extractor = ApiExtractor('.', workers=4)
+  tasks = [('missing.py', 'missing.py', 'missing', None)] * PARALLEL_THRESHOLD
+  monkeypatch.setattr(api_docs.multiprocessing, 'parent_process', lambda: object())
+  monkeypatch.setattr(api_docs, 'ProcessPoolExecutor', None)
+  assert len(list(extractor._run(tasks))) == PARALLEL_THRESHOLD
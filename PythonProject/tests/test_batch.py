@@ -0,0 +1,73 @@
+"""
+批量生成测试
+"""
+
+import os
+from pathlib import Path
+
+from click.testing import CliRunner
+from conftest import write_files
+from main import main
+
+from readme_generator import batch
+from readme_generator.batch import _project_config, generate_many
+from readme_generator.config import Config
+
+_original_generate_one = batch._generate_one
+
+
+def test_project_config_keeps_empty_template_path(tmp_path):
+  config = _project_config(Config().to_dict(), tmp_path / 'a')
+  assert config.template_path is None
+  assert config.output_path == tmp_path / 'a' / 'README.md'
+
+
+def test_project_config_keeps_custom_template_path(tmp_path):
+  template = tmp_path / 'custom.md.j2'
+  config = _project_config(Config({'template_path': str(template)}).to_dict(), Path('a'))
+  assert config.template_path == template
+
+
+def _crash_or_generate(base, project):
+  # 在工作进程中直接退出，模拟崩溃（段错误、被 OOM 终止等）
+  if project.endswith('crash'):
+    os._exit(1)
+  return _original_generate_one(base, project)
+
+
+def test_generate_many_recovers_from_broken_pool(tmp_path, monkeypatch):
+  projects = []
+  for name in ('a', 'crash', 'b', 'c'):
+    root = tmp_path / name
+    write_files(root, {'setup.py': f'from setuptools import setup\nsetup(name="{name}")\n'})
+    projects.append(root)
+  monkeypatch.setattr(batch, '_generate_one', _crash_or_generate)
+
+  results = generate_many(projects, Config({'git_auto_detect': False}), workers=2)
+  status = {Path(result['project']).name: result['success'] for result in results}
+  assert status == {'a': True, 'crash': False, 'b': True, 'c': True}
+  assert 'BrokenProcessPool' in results[1]['error']
+  assert (tmp_path / 'c' / 'README.md').is_file()
+
+
+def test_group_options_forwarded_to_batch(tmp_path):
+  project = tmp_path / 'a'
+  write_files(project, {'setup.py': 'from setuptools import setup\nsetup(name="a")\n'})
+  config_file = tmp_path / 'config.yaml'
+  config_file.write_text('git_auto_detect: false\n', encoding='utf-8')
+
+  result = CliRunner().invoke(
+      main, ['--config', str(config_file), '--output', 'DOCS.md', 'batch',
+             str(project)])
+  assert result.exit_code == 0, result.output
+  assert (project / 'DOCS.md').is_file()
+
+
+def test_group_options_rejected_for_other_subcommands(tmp_path):
+  result = CliRunner().invoke(main, ['--dry-run', 'batch', str(tmp_path)])
+  assert result.exit_code == 2
+  assert '--dry-run' in result.output
+
+  result = CliRunner().invoke(main, ['--output', 'x.md', 'analyze', str(tmp_path)])
+  assert result.exit_code == 2
+  assert '--output' in result.output
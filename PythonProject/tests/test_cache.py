@@ -0,0 +1,35 @@
+"""
+分析缓存测试
+"""
+
+import os
+
+from readme_generator.cache import AnalysisCache
+
+
+def _usage(cache_dir):
+  return sum(entry.stat().st_size for entry in os.scandir(cache_dir))
+
+
+def test_put_lists_cache_directory_once(tmp_path, monkeypatch):
+  cache = AnalysisCache(tmp_path / 'cache', max_bytes=1024 * 1024)
+  calls = []
+  entries = cache._entries
+  monkeypatch.setattr(cache, '_entries', lambda: calls.append(1) or entries())
+  for i in range(200):
+    cache.put('lines', f"file-{i}", {'lines': i})
+  # 覆盖已有条目时只累计大小的变化
+  cache.put('lines', 'file-0', {'lines': 'x' * 100})
+  assert len(calls) == 1
+  assert cache._total == _usage(tmp_path / 'cache')
+
+
+def test_put_evicts_least_recently_used_when_over_limit(tmp_path):
+  cache = AnalysisCache(tmp_path / 'cache', max_bytes=2000)
+  for i in range(40):
+    cache.put('lines', f"file-{i}", {'payload': 'x' * 100})
+    os.utime(cache._entry_path('lines', f"file-{i}"), ns=(i * 10**9, i * 10**9))
+  assert _usage(tmp_path / 'cache') <= 2000
+  assert cache._total == _usage(tmp_path / 'cache')
+  assert cache.get('lines', 'file-39') is not None
+  assert cache.get('lines', 'file-0') is None
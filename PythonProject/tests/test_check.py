@@ -0,0 +1,70 @@
+"""
+--check 回归测试：生成 README 后立即检查必须判定为最新
+"""
+
+import json
+
+from click.testing import CliRunner
+
+from main import main
+from readme_generator.core import ReadmeGenerator
+
+
+def test_check_after_generate(project, make_config):
+  config = make_config(include_statistics=True, cache_dir=str(project / '.readme_cache'))
+  ReadmeGenerator(config).generate()
+  assert ReadmeGenerator(config).check()
+
+
+def test_statistics_exclude_generated_files(project, make_config):
+  config = make_config(include_statistics=True, cache_dir=str(project / '.readme_cache'))
+  ReadmeGenerator(config).generate()
+  statistics = ReadmeGenerator(config)._collect_project_info()['statistics']
+  extensions = {item['extension'] for item in statistics['extensions']}
+  # README.md 与缓存目录中的 JSON 文件都不计入统计
+  assert '.md' not in extensions
+  assert '.json' not in extensions
+
+
+def test_statistics_include_python_metrics(project, make_config):
+  (project / 'demo' / 'models.py').write_text(
+      'class Model:\n  def save(self):\n    pass\n\n\ndef _helper():\n  pass\n', encoding='utf-8')
+  config = make_config(include_statistics=True, include_api_docs=False)
+  generator = ReadmeGenerator(config)
+  python = generator._collect_project_info()['statistics']['python']
+  # setup.py、main.py 与 demo 包中的 3 个模块；函数包括方法与私有函数
+  assert python['files'] == python['modules'] == 5
+  assert python['functions'] == 4 and python['classes'] == 1
+  assert python['lines'] > 0
+  content = generator.preview()
+  assert '| 函数 | 4 |' in content and '| 类 | 1 |' in content
+
+
+def test_cli_check_exit_code(project, make_config, tmp_path):
+  config_file = tmp_path / 'config.yaml'
+  # JSON 也是合法的 YAML
+  config_file.write_text(json.dumps(
+      make_config(include_statistics=True, cache_dir=str(project / '.readme_cache')).to_dict()),
+                         encoding='utf-8')
+  runner = CliRunner()
+  result = runner.invoke(main, ['--config', str(config_file)])
+  assert result.exit_code == 0, result.output
+  result = runner.invoke(main, ['--config', str(config_file), '--check'])
+  assert result.exit_code == 0, result.output
+
+  (project / 'demo' / 'extra.py').write_text('VALUE = 1\n', encoding='utf-8')
+  result = runner.invoke(main, ['--config', str(config_file), '--check'])
+  assert result.exit_code == 1
+
+
+def test_check_with_relative_paths(project, make_config, monkeypatch):
+  monkeypatch.chdir(project)
+  config = make_config(project_root='.',
+                       output_path='README.md',
+                       cache_dir='.readme_cache',
+                       include_statistics=True,
+                       walk_workers=4)
+  ReadmeGenerator(config).generate()
+  assert ReadmeGenerator(config).check()
+  structure = str(ReadmeGenerator(config)._collect_project_info()['project_structure'])
+  assert 'README.md' not in structure
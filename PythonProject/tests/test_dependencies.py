@@ -0,0 +1,156 @@
+"""
+依赖解析测试
+覆盖 setup.py 的静态求值、requirements 文件的 -r 引用、锁文件的流式解析与 Poetry 版本约束的转换
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from conftest import write_files
+from readme_generator.dependencies import (iter_pipfile_lock, iter_toml_lock, parse_lock,
+                                           parse_requirements, parse_setup_metadata,
+                                           parse_setup_py, poetry_requirement)
+from readme_generator.manifest import ProjectManifest
+
+SETUP_PY = '''
+from setuptools import setup
+
+NAME = "demo-tool"
+base = ["requests>=2.0"]
+base += ["click"]
+extras = dict(install_requires=base + ["toml"])
+
+with open("requirements-extra.txt") as fh:
+    more = fh.read().splitlines()
+
+setup(
+    long_description="Long text",
+    name=NAME,
+    description="A demo " + "tool",
+    version=get_version(),
+    **extras,
+)
+'''
+
+
+def test_setup_py_is_evaluated_statically():
+  requirements, includes = parse_setup_py(SETUP_PY)
+  assert requirements == ['requests>=2.0', 'click', 'toml']
+  assert includes == []
+  requirements, includes = parse_setup_py('with open("requirements.txt") as f:\n'
+                                          '  reqs = f.read().splitlines()\n'
+                                          'setup(install_requires=reqs)\n')
+  assert requirements == [] and includes == ['requirements.txt']
+  assert parse_setup_py('setup(') == ([], [])
+
+
+def test_setup_py_metadata_uses_setup_arguments():
+  assert parse_setup_metadata(SETUP_PY) == {'name': 'demo-tool', 'description': 'A demo tool'}
+  # 其他参数中的同名子串（long_description、package_name）不会被误认
+  assert parse_setup_metadata('package_name = "wrong"\nsetup(name="right")\n') == {
+      'name': 'right'
+  }
+  assert parse_setup_metadata('setup(name=compute())\n') == {}
+
+
+def test_manifest_metadata_from_setup_py(tmp_path):
+  write_files(tmp_path, {
+      'setup.py': SETUP_PY,
+      'setup.cfg': '[metadata]\nname = from-cfg\ndescription = 来自 setup.cfg\n'
+  })
+  manifest = ProjectManifest.load(tmp_path)
+  assert manifest.name == 'demo-tool'
+  assert manifest.description == 'A demo tool'
+  write_files(tmp_path, {'setup.py': 'setup(name=compute())\n'})
+  manifest = ProjectManifest.load(tmp_path)
+  assert manifest.name == 'from-cfg'
+  assert manifest.description == '来自 setup.cfg'
+
+
+def test_requirements_options_and_comments(tmp_path):
+  path = tmp_path / 'requirements.txt'
+  path.write_text(
+      '# 注释\n'
+      '--index-url https://example.com/simple\n'
+      '-r base.txt\n'
+      '-c constraints.txt\n'
+      '-e git+https://example.com/repo.git#egg=editable-pkg\n'
+      'hashed==1.0 --hash=sha256:abc \\\n'
+      '    --hash=sha256:def\n'
+      'marked>=1.0; platform_release != " -custom"  # 行尾注释\n',
+      encoding='utf-8')
+  requirements, includes = parse_requirements(path)
+  assert includes == ['base.txt']
+  assert requirements == [
+      'editable-pkg', 'hashed==1.0', 'marked>=1.0; platform_release != " -custom"'
+  ]
+
+
+def test_requirement_includes_detect_cycles(project: Path, caplog):
+  write_files(project, {
+      'requirements.txt': '-r requirements-dev.txt\nrequests>=2.0\n',
+      'requirements-dev.txt': '-r requirements.txt\n-r requirements-test.txt\nblack\n',
+      'requirements-test.txt': '-r requirements-dev.txt\npytest\n'
+  })
+  (project / 'setup.py').unlink()
+  dependencies = ProjectManifest.load(project).get_dependencies()
+  assert dependencies == ['black', 'pytest', 'requests>=2.0']
+  assert '循环引用' in caplog.text
+
+
+def test_toml_lock_is_streamed(tmp_path):
+  path = tmp_path / 'poetry.lock'
+  path.write_text(
+      '[[package]]\nname = "Requests"\nversion = "2.31.0"\n\n'
+      '[package.dependencies]\nidna = ">=2.5"\n\n'
+      '[[package]]\nname = "idna"\nversion = "3.6"\n\n'
+      '[metadata]\nlock-version = "2.0"\n',
+      encoding='utf-8')
+  assert list(iter_toml_lock(path)) == [('Requests', '2.31.0'), ('idna', '3.6')]
+  assert parse_lock(path) == {'requests': '2.31.0', 'idna': '3.6'}
+
+
+def test_pipfile_lock_line_by_line_and_compact(tmp_path):
+  data = {
+      '_meta': {'hash': {'sha256': '{not a brace}'}},
+      'default': {'Flask': {'version': '==3.0.0', 'hashes': []}},
+      'develop': {'pytest': {'version': '==8.0.0'}}
+  }
+  path = tmp_path / 'Pipfile.lock'
+  path.write_text(json.dumps(data, indent=4), encoding='utf-8')
+  assert list(iter_pipfile_lock(path)) == [('Flask', '3.0.0')]
+  path.write_text(json.dumps(data), encoding='utf-8')
+  assert parse_lock(path) == {'flask': '3.0.0'}
+
+
+@pytest.mark.parametrize('spec, expected', [
+    ('^1.0', 'pkg>=1.0,<2.0'),
+    ('^0.2.3', 'pkg>=0.2.3,<0.3.0'),
+    ('^0.0.3', 'pkg>=0.0.3,<0.0.4'),
+    ('~1.2', 'pkg>=1.2,<1.3'),
+    ('~1.2.3', 'pkg>=1.2.3,<1.3.0'),
+    ('~=1.4', 'pkg~=1.4'),
+    ('*', 'pkg'),
+    ('1.2.3', 'pkg==1.2.3'),
+    ('1.2.*', 'pkg==1.2.*'),
+    ('>=1.0, <3', 'pkg>=1.0,<3'),
+    ('^1 || ^2', 'pkg'),
+    ({'version': '^2.1', 'extras': ['socks']}, 'pkg[socks]>=2.1,<3.0'),
+    ({'git': 'https://example.com/pkg.git'}, 'pkg'),
+])
+def test_poetry_requirement(spec, expected):
+  assert poetry_requirement('pkg', spec) == expected
+
+
+def test_poetry_dependencies_with_lock(tmp_path):
+  write_files(tmp_path, {
+      'pyproject.toml': ('[tool.poetry]\nname = "demo"\n\n'
+                         '[tool.poetry.dependencies]\npython = "^3.8"\n'
+                         'requests = "^2.28"\nanything = "*"\n'),
+      'poetry.lock': '[[package]]\nname = "requests"\nversion = "2.31.0"\n'
+  })
+  assert ProjectManifest.load(tmp_path).get_dependencies() == [
+      'anything', 'requests>=2.28,<3.0 (锁定 2.31.0)'
+  ]
@@ -0,0 +1,38 @@
+"""
+输入指纹测试
+"""
+
+from conftest import git, write_files
+
+from readme_generator.core import ReadmeGenerator
+
+
+def _commit(root):
+  (root / 'main.py').write_text('def main():\n  return 1\n', encoding='utf-8')
+  git(root, 'commit', '-q', '-am', 'change')
+
+
+def test_new_commit_keeps_readme_fresh_with_include(git_project, make_config):
+  write_files(git_project, {
+      'templates/readme.md': '{% include "part.md" %}\n',
+      'templates/part.md': '# {{ project_name }}\n'
+  })
+  config = make_config(git_auto_detect=True,
+                       template_path=str(git_project / 'templates' / 'readme.md'))
+  ReadmeGenerator(config).generate()
+  _commit(git_project)
+  # 模板没有引用 head_sha / git_branch，新的提交不应使 README 过期
+  assert ReadmeGenerator(config).check()
+
+
+def test_new_commit_makes_readme_stale_when_referenced(git_project, make_config):
+  write_files(git_project, {
+      'templates/readme.md': '{% include "part.md" %}\n构建自 {{ head_sha }}\n',
+      'templates/part.md': '# {{ project_name }}\n'
+  })
+  config = make_config(git_auto_detect=True,
+                       template_path=str(git_project / 'templates' / 'readme.md'))
+  ReadmeGenerator(config).generate()
+  assert ReadmeGenerator(config).check()
+  _commit(git_project)
+  assert not ReadmeGenerator(config).check()
@@ -0,0 +1,63 @@
+"""
+Git 信息测试：与真实 git 命令的结果比较
+"""
+
+import pytest
+from conftest import git
+
+from readme_generator.gitinfo import GitRepository, find_git_dir, parse_github_url, read_git_info
+
+
+def test_branch_and_head(git_project):
+  info = read_git_info(git_project / 'demo')
+  assert info['git_branch'] == 'main'
+  assert info['head_sha'] == git(git_project, 'rev-parse', 'HEAD')
+  assert info['default_branch'] == 'main'
+
+
+def test_packed_refs(git_project):
+  git(git_project, 'pack-refs', '--all')
+  assert not (git_project / '.git' / 'refs' / 'heads' / 'main').exists()
+  assert read_git_info(git_project)['head_sha'] == git(git_project, 'rev-parse', 'HEAD')
+
+
+def test_detached_head(git_project):
+  sha = git(git_project, 'rev-parse', 'HEAD')
+  git(git_project, 'checkout', '-q', '--detach')
+  info = read_git_info(git_project)
+  assert 'git_branch' not in info
+  assert info['head_sha'] == sha
+
+
+def test_remote_and_default_branch(git_project):
+  git(git_project, 'remote', 'add', 'upstream', 'https://example.com/other.git')
+  git(git_project, 'remote', 'add', 'origin', 'git@github.com:octo/demo.git')
+  git(git_project, 'symbolic-ref', 'refs/remotes/origin/HEAD', 'refs/remotes/origin/develop')
+  info = read_git_info(git_project)
+  assert info['github_username'] == 'octo'
+  assert info['repository_name'] == 'demo'
+  assert info['default_branch'] == 'develop'
+
+
+def test_worktree(git_project, tmp_path):
+  worktree = tmp_path / 'worktree'
+  git(git_project, 'worktree', 'add', '-q', '-b', 'feature', str(worktree))
+  git_dir, common_dir = find_git_dir(worktree)
+  assert common_dir == str(git_project / '.git')
+  repo = GitRepository(git_dir, common_dir)
+  assert repo.branch == 'feature'
+  assert repo.head_sha == git(worktree, 'rev-parse', 'HEAD')
+
+
+def test_no_repository(tmp_path):
+  if find_git_dir(tmp_path) is not None:
+    pytest.skip('临时目录位于 Git 仓库中')
+  assert read_git_info(tmp_path) is None
+
+
+@pytest.mark.parametrize('url', [
+    'git@github.com:octo/demo.git', 'ssh://git@github.com/octo/demo.git',
+    'https://github.com/octo/demo', 'https://github.com/octo/demo.git/'
+])
+def test_parse_github_url(url):
+  assert parse_github_url(url)['git_url'] == 'https://github.com/octo/demo'
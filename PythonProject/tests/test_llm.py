@@ -0,0 +1,201 @@
+"""
+Ollama 客户端与双语生成器测试
+在本机启动模拟 Ollama 的 HTTP 服务，按测试设定的脚本返回响应
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+pytest.importorskip('requests')
+
+from readme_generator.cache import ResponseCache  # noqa: E402
+from readme_generator.llm import BilingualGenerator, OllamaClient, OllamaError  # noqa: E402
+
+README = ('# Demo\n\nA demo project used by the generator tests.\n\n'
+          '## Install\n\n```bash\npip install demo\n```\n\n'
+          '## Usage\n\nRun `python main.py` in the project directory to start.\n\n'
+          '## License\n\nMIT\n')
+
+
+def ndjson(text: str, size: int = 16, done: bool = True) -> List[Dict[str, Any]]:
+  """把文本拆成流式响应的各行"""
+  lines: List[Dict[str, Any]] = [{
+      'response': text[i:i + size],
+      'done': False
+  } for i in range(0, len(text), size)]
+  if done:
+    lines.append({'response': '', 'done': True, 'eval_count': len(lines)})
+  return lines
+
+
+class _Handler(BaseHTTPRequestHandler):
+  protocol_version = 'HTTP/1.1'
+
+  def log_message(self, *args):
+    pass
+
+  def do_POST(self):
+    payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+    with self.server.lock:
+      self.server.requests.append(payload)
+    status, body = self.server.respond(payload)
+    if body is None:
+      # 分块响应发送到一半时断开连接
+      self.send_response(status)
+      self.send_header('Content-Type', 'application/x-ndjson')
+      self.send_header('Transfer-Encoding', 'chunked')
+      self.end_headers()
+      data = json.dumps({'response': 'partial', 'done': False}).encode() + b'\n'
+      self.wfile.write(b'%x\r\n' % len(data) + data + b'\r\n')
+      self.wfile.flush()
+      self.close_connection = True
+      return
+    if isinstance(body, list):
+      data = b''.join((line if isinstance(line, str) else json.dumps(line)).encode() + b'\n'
+                      for line in body)
+    elif isinstance(body, dict):
+      data = json.dumps(body).encode()
+    else:
+      data = body.encode()
+    self.send_response(status)
+    self.send_header('Content-Length', str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+
+
+class FakeOllama:
+  """模拟的 Ollama 服务；respond(请求体) 返回 (状态码, 响应体)
+
+  响应体为字典时作为 JSON 返回，为列表时作为 NDJSON 逐行返回，为 None 时中途断开连接。
+  """
+
+  def __init__(self):
+    self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    self.server.daemon_threads = True
+    self.server.lock = threading.Lock()
+    self.server.requests = []
+    self.server.respond = lambda payload: (200, {'response': '', 'done': True})
+    self.host = f"http://127.0.0.1:{self.server.server_address[1]}"
+    self._thread = threading.Thread(target=self.server.serve_forever,
+                                    kwargs={'poll_interval': 0.05},
+                                    daemon=True)
+    self._thread.start()
+
+  @property
+  def requests(self) -> List[Dict[str, Any]]:
+    return self.server.requests
+
+  def script(self, respond: Callable[[Dict[str, Any]], Any]):
+    self.server.respond = respond
+
+  def sequence(self, *responses: Any):
+    """依次返回给定的响应，最后一个响应重复使用"""
+    queue = list(responses)
+    self.script(lambda payload: queue.pop(0) if len(queue) > 1 else queue[0])
+
+  def client(self, **kwargs: Any) -> OllamaClient:
+    kwargs.setdefault('backoff', 0)
+    return OllamaClient(model='test-model', host=self.host, timeout=10, **kwargs)
+
+  def close(self):
+    self.server.shutdown()
+    self.server.server_close()
+
+
+@pytest.fixture
+def ollama():
+  server = FakeOllama()
+  yield server
+  server.close()
+
+
+def test_generate_retries_transient_status(ollama):
+  ollama.sequence((503, 'model is loading'), (200, {'response': 'ok', 'done': True}))
+  with ollama.client(retries=2) as client:
+    assert client.generate('hello') == 'ok'
+  assert len(ollama.requests) == 2
+  assert ollama.requests[0]['model'] == 'test-model'
+  assert ollama.requests[0]['stream'] is False
+
+
+def test_generate_gives_up_after_retries(ollama):
+  ollama.sequence((503, 'busy'))
+  with ollama.client(retries=2) as client, pytest.raises(OllamaError, match='已重试 2 次'):
+    client.generate('hello')
+  assert len(ollama.requests) == 3
+
+
+def test_generate_does_not_retry_client_errors(ollama):
+  ollama.sequence((404, 'model not found'))
+  with ollama.client(retries=2) as client, pytest.raises(OllamaError, match='HTTP 404'):
+    client.generate('hello')
+  assert len(ollama.requests) == 1
+
+
+def test_generate_wraps_malformed_json(ollama):
+  ollama.sequence((200, 'not json'))
+  with ollama.client() as client, pytest.raises(OllamaError, match='无法解析'):
+    client.generate('hello')
+
+
+def test_stream_yields_chunks(ollama):
+  ollama.sequence((200, ndjson(README)))
+  with ollama.client() as client:
+    assert ''.join(client.stream('hello', {'temperature': 0})) == README
+  assert ollama.requests[0]['stream'] is True
+  assert ollama.requests[0]['options'] == {'temperature': 0}
+
+
+@pytest.mark.parametrize('body, message', [
+    ([{'response': '# Demo', 'done': False}, '{"response": "trunc'], '无法解析'),
+    ([{'error': 'out of memory'}], 'out of memory'),
+    (ndjson(README, done=False), '生成完成前结束'),
+    (None, '读取 Ollama 流式响应失败'),
+])
+def test_stream_errors_raise_ollama_error(ollama, body, message):
+  ollama.sequence((200, body))
+  with ollama.client() as client, pytest.raises(OllamaError, match=message):
+    for _ in client.stream('hello'):
+      pass
+
+
+def _respond_with_loop(payload: Dict[str, Any]):
+  """完整生成时在 Usage 章节陷入重复输出，续写时返回剩余的章节"""
+  prompt = payload['prompt']
+  if 'Continue the README' in prompt:
+    return 200, ndjson('Here you go.\n\n## Install\n\nduplicate\n\n' +
+                       README[README.index('## Usage'):])
+  looping = README[:README.index('## Usage')] + '## Usage\n\n' + (
+      'This line repeats again and again forever.\n' * 50)
+  return 200, ndjson(looping)
+
+
+def test_generator_continues_after_aborted_stream(ollama):
+  ollama.script(_respond_with_loop)
+  with ollama.client() as client:
+    contents = BilingualGenerator(client, concurrency=1).generate('分析报告', ['english'])
+  content = contents['english']
+  assert content == README.strip()
+  prompts = [request['prompt'] for request in ollama.requests]
+  assert len(prompts) == 2
+  assert 'Continue the README' in prompts[1]
+  # 续写提示词中只包含中止之前已完成的章节
+  assert '## Install' in prompts[1] and 'repeats again' not in prompts[1]
+
+
+def test_generator_uses_response_cache(ollama, tmp_path):
+  ollama.sequence((200, ndjson(README)))
+  cache = ResponseCache(tmp_path / 'llm-cache')
+  with ollama.client() as client:
+    first = BilingualGenerator(client, cache=cache).generate('分析报告', ['english'])
+    assert len(ollama.requests) == 1
+    second = BilingualGenerator(client, cache=cache).generate('分析报告', ['english'])
+    assert second == first
+    assert len(ollama.requests) == 1
+    # refresh 时忽略缓存重新生成
+    BilingualGenerator(client, cache=cache, refresh=True).generate('分析报告', ['english'])
+    assert len(ollama.requests) == 2
@@ -0,0 +1,37 @@
+"""
+输出文件写入测试
+"""
+
+import os
+
+from readme_generator import output
+from readme_generator.output import write_output
+
+
+def test_write_output_skips_identical_content(tmp_path):
+  path = tmp_path / 'README.md'
+  assert write_output(path, ['# 标题\n', '内容\n'])
+  mtime = path.stat().st_mtime_ns
+  assert not write_output(path, '# 标题\n内容\n')
+  assert path.stat().st_mtime_ns == mtime
+  assert write_output(path, '# 标题\n')
+  assert path.read_text(encoding='utf-8') == '# 标题\n'
+  assert os.listdir(tmp_path) == ['README.md']
+
+
+def test_write_output_keeps_mode(tmp_path):
+  path = tmp_path / 'README.md'
+  path.write_text('旧内容\n', encoding='utf-8')
+  path.chmod(0o640)
+  write_output(path, '新内容\n')
+  assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_write_output_does_not_touch_umask(tmp_path, monkeypatch):
+  def _fail(mask):
+    raise AssertionError('write_output 不应修改进程的 umask')
+
+  monkeypatch.setattr(os, 'umask', _fail)
+  path = tmp_path / 'README.md'
+  write_output(path, '新文件\n')
+  assert path.stat().st_mode & 0o777 == 0o666 & ~output._UMASK
@@ -0,0 +1,134 @@
+"""
+README 区块测试：拼接、保留手写内容与手动修改的区块
+"""
+
+import re
+
+import pytest
+
+from readme_generator.core import ReadmeGenerator
+from readme_generator.llm import mark_sections, section_heading, section_name, update_readme
+from readme_generator.prompts import report_digests
+from readme_generator.sections import (Section, parse_sections, splice_sections, stale_sections,
+                                       wrap_section)
+
+
+def _readme(*blocks):
+  return ''.join(blocks)
+
+
+def test_parse_and_splice_round_trip():
+  text = _readme('手写的开头\n', wrap_section('intro', 'a' * 16, '介绍\n'), '\n中间的说明\n',
+                 wrap_section('usage', 'b' * 16, '用法\n'), '结尾\n')
+  items = parse_sections(text)
+  assert [item.name for item in items if isinstance(item, Section)] == ['intro', 'usage']
+  plan = [('intro', 'a' * 16), ('usage', 'b' * 16)]
+  assert stale_sections(items, plan) == []
+  assert ''.join(splice_sections(items, plan, {})) == text
+
+
+def test_splice_replaces_stale_section_and_keeps_hand_written_text():
+  text = _readme('手写的开头\n', wrap_section('intro', 'a' * 16, '介绍\n'), '\n中间的说明\n',
+                 wrap_section('usage', 'b' * 16, '用法\n'))
+  items = parse_sections(text)
+  plan = [('intro', 'a' * 16), ('usage', 'c' * 16)]
+  assert stale_sections(items, plan) == ['usage']
+
+  result = ''.join(splice_sections(items, plan, {'usage': '新的用法\n'}))
+  assert result.startswith('手写的开头\n')
+  assert '\n中间的说明\n' in result
+  assert '新的用法' in result and '\n用法\n' not in result
+  assert 'inputs=' + 'c' * 16 in result
+
+
+def test_splice_inserts_new_and_drops_removed_sections():
+  text = _readme(wrap_section('intro', 'a' * 16, '介绍\n'), wrap_section('old', 'b' * 16, '旧\n'))
+  items = parse_sections(text)
+  plan = [('intro', 'a' * 16), ('api', 'd' * 16)]
+  result = ''.join(splice_sections(items, plan, {'api': '接口\n'}))
+  names = [item.name for item in parse_sections(result) if isinstance(item, Section)]
+  assert names == ['intro', 'api']
+
+
+def test_edited_section_is_kept():
+  text = wrap_section('intro', 'a' * 16, '介绍\n').replace('介绍', '手动修改的介绍')
+  items = parse_sections(text)
+  plan = [('intro', 'e' * 16)]
+  assert items[0].edited
+  assert stale_sections(items, plan) == []
+  assert ''.join(splice_sections(items, plan, {})) == text
+
+
+def test_generator_keeps_hand_written_text(project, make_config):
+  config = make_config(incremental_sections=True)
+  ReadmeGenerator(config).generate()
+  readme = project / 'README.md'
+  text = readme.read_text(encoding='utf-8')
+  readme.write_text('> 手写的提示\n\n' + text, encoding='utf-8')
+
+  (project / 'demo' / 'extra.py').write_text('VALUE = 1\n', encoding='utf-8')
+  ReadmeGenerator(config).generate()
+  updated = readme.read_text(encoding='utf-8')
+  assert updated.startswith('> 手写的提示\n')
+  assert 'extra.py' in updated
+
+
+def test_generator_refuses_to_overwrite_unmarked_readme(project, make_config):
+  readme = project / 'README.md'
+  readme.write_text('# 手写的 README\n\n重要的说明\n', encoding='utf-8')
+  config = make_config(incremental_sections=True)
+  with pytest.raises(ValueError):
+    ReadmeGenerator(config).generate()
+  assert readme.read_text(encoding='utf-8') == '# 手写的 README\n\n重要的说明\n'
+
+  ReadmeGenerator(config).generate(full=True)
+  assert '重要的说明' not in readme.read_text(encoding='utf-8')
+
+
+def test_generator_converts_previously_generated_readme(project, make_config):
+  ReadmeGenerator(make_config()).generate()
+  # 之前由本工具生成（有输入指纹、没有区块标记）的 README 可以直接转换
+  ReadmeGenerator(make_config(incremental_sections=True)).generate()
+  assert '<!-- readme-generator:begin' in (project / 'README.md').read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('heading', [
+    '', '## Usage', '### config_file', '## `parse_args`', '##  Two  spaces', '## 100% done',
+    '## a --> b', '## 安装\t说明'
+])
+def test_section_name_round_trip(heading):
+  name = section_name('english', heading)
+  assert not any(char.isspace() for char in name)
+  assert section_heading(name) == ('english', heading)
+
+
+def test_legacy_section_names_still_resolve():
+  assert section_heading('english:Quick_Start') == ('english', '## Quick Start')
+  assert section_heading('chinese:#') == ('chinese', '')
+
+
+class _StubGenerator:
+  """只记录请求重新生成的章节的生成器"""
+
+  class client:
+    model = 'test-model'
+
+  def __init__(self):
+    self.targets = []
+
+  def regenerate_sections(self, analysis, targets):
+    self.targets.extend(targets)
+    return [f"{heading}\n\n重新生成的内容" for _, heading in targets]
+
+
+def test_update_readme_keeps_exact_headings():
+  content = '# Demo\n\n简介\n\n## `parse_args`\n\n旧的内容\n\n## config_file\n\n配置\n'
+  marked = mark_sections('english', content, report_digests('旧的分析报告'), 'test-model')
+  # 模拟该区块的输入发生变化
+  name = section_name('english', '## `parse_args`')
+  marked = re.sub(rf'(begin {re.escape(name)} inputs=)[0-9a-f]+', r'\g<1>' + '0' * 16, marked)
+  generator = _StubGenerator()
+  updated = update_readme(marked, '旧的分析报告', generator)
+  assert generator.targets == [('english', '## `parse_args`')]
+  assert '## `parse_args`\n\n重新生成的内容' in updated
+  assert name in updated and '## config_file' in updated
@@ -0,0 +1,48 @@
+"""
+模板渲染测试
+"""
+
+import re
+
+from jinja2 import Environment
+
+from conftest import write_files
+from readme_generator.core import ReadmeGenerator
+from readme_generator.templates import DEFAULT_TEMPLATE
+
+CUSTOM_TEMPLATE = '''# {{ project_name }}
+
+{{ project_structure }}
+lines={{ project_structure.split('\\n')|length }} chars={{ project_structure|length }}
+{{ '结构: ' + project_structure.splitlines()[0] }}
+'''
+
+
+def test_custom_template_receives_structure_as_string(project, make_config):
+  write_files(project, {'templates/readme.md': CUSTOM_TEMPLATE})
+  generator = ReadmeGenerator(make_config(template_path=str(project / 'templates' / 'readme.md')))
+  structure = generator.project_analyzer.get_structure()
+  content = generator.preview()
+  assert f"\n{structure}\n" in content
+  assert f"lines={len(structure.split(chr(10)))} chars={len(structure)}" in content
+  assert '结构: project/' in content
+
+
+def test_disabled_statistics_leave_no_trace_in_default_template():
+  # 关闭统计时的输出应与没有统计区块的模板完全一致
+  without = re.sub(r'\{# section: statistics -#\}.*?(?=\{# section: dependencies)', '',
+                   DEFAULT_TEMPLATE, flags=re.S)
+  assert without != DEFAULT_TEMPLATE
+  context = {
+      'project_name': 'demo',
+      'project_structure': ['demo/', '└── main.py'],
+      'dependencies': ['requests'],
+      'include_statistics': False,
+      'statistics': {'total_files': 3, 'total_size': '1 KB'}
+  }
+  env = Environment()
+  assert env.from_string(DEFAULT_TEMPLATE).render(**context) == \
+      env.from_string(without).render(**context)
+  context['include_statistics'] = True
+  content = env.from_string(DEFAULT_TEMPLATE).render(**context)
+  assert '```\n\n\n\n## 项目统计\n\n共 3 个文件，1 KB。\n\n\n\n## 依赖' in content
@@ -0,0 +1,133 @@
+"""
+目录遍历测试
+覆盖并行与串行遍历的一致性、每个目录的条目上限、生成目录的折叠与同一次遍历中的统计
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from conftest import write_files
+from readme_generator.utils import StatisticsCollector, TemplateManager
+from readme_generator.walker import DEFAULT_COLLAPSE_PATTERNS, walk_tree
+
+COLLAPSE = ('node_modules', '__pycache__')
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+  root = tmp_path / 'tree'
+  files = {
+      'README.md': '# 示例\n',
+      'setup.py': 'from setuptools import setup\n',
+      'pkg/__init__.py': '',
+      'pkg/core.py': 'x = 1\n',
+      'pkg/sub/deep/deeper/leaf.py': 'y = 2\n',
+      'node_modules/left-pad/index.js': 'module.exports = 1;\n',
+      'node_modules/left-pad/package.json': '{}\n',
+      'build-cache/CACHEDIR.TAG': 'Signature: 8a477f597d28d172789f06886806bc55\n',
+      'build-cache/blob.bin': 'x' * 100,
+      'docs/guide.md': '# 指南\n'
+  }
+  files.update({f"data/file_{i:02d}.txt": 'a' * i for i in range(30)})
+  write_files(root, files)
+  return root
+
+
+def _walk(root: Path, **kwargs):
+  kwargs.setdefault('max_depth', 3)
+  kwargs.setdefault('collapse', COLLAPSE)
+  return walk_tree(str(root), **kwargs)
+
+
+def _stats(root: Path, **kwargs):
+  stats = StatisticsCollector()
+  _walk(root, stats=stats, **kwargs)
+  return ({ext: tuple(counts) for ext, counts in stats.extensions.items()},
+          sorted(path for path, *_ in stats.sources))
+
+
+@pytest.mark.parametrize('max_entries', [None, 5])
+def test_threaded_walk_matches_serial(tree, max_entries):
+  serial = _walk(tree, max_entries=max_entries)
+  threaded = _walk(tree, workers=4, max_entries=max_entries)
+  assert threaded.render() == serial.render()
+  assert [entry.path for entry in threaded.iter_files()] == \
+      [entry.path for entry in serial.iter_files()]
+
+
+def test_max_entries_summarizes_omitted_entries(tree):
+  data = _walk(tree, max_entries=5).children['data']
+  assert data.names() == [f"file_{i:02d}.txt" for i in range(5)]
+  assert data.omitted == {'files': 25, 'dirs': 0, 'bytes': sum(range(5, 30))}
+  assert not data.complete
+  lines = data.render()
+  assert lines[-1].startswith('└── … 另有 25 个文件')
+  assert all(line.startswith('├── ') for line in lines[:-1])
+
+
+def test_generated_directories_are_collapsed(tree):
+  root = _walk(tree)
+  lines = root.render()
+  assert any(line.endswith('node_modules/ (已折叠: 1 个目录)') for line in lines)
+  assert any(line.startswith('├── build-cache/ (已折叠: 2 个文件') for line in lines)
+  assert not any('index.js' in line or 'blob.bin' in line for line in lines)
+  assert root.children['node_modules'].collapsed
+  assert root.children['build-cache'].entries == []
+
+
+def test_max_depth_limits_tree(tree):
+  root = _walk(tree, max_depth=1)
+  assert 'sub' in root.children['pkg'].names()
+  assert root.children['pkg'].children == {}
+
+
+def test_exclude_paths_skip_single_entries(tree):
+  root = _walk(tree, exclude_paths=[str(tree / 'README.md'), str(tree / 'data')])
+  assert 'README.md' not in root.names()
+  assert 'data' not in root.names()
+  assert 'setup.py' in root.names()
+
+
+def test_listing_cache_reuses_unchanged_directories(tree):
+  listings = {}
+  first = _walk(tree, max_entries=5, current=listings)
+  again = {}
+  second = _walk(tree, max_entries=5, previous=listings, current=again)
+  assert second.render() == first.render()
+  assert again == listings
+
+
+@pytest.mark.parametrize('workers', [0, 4])
+def test_stats_cover_files_beyond_tree_limits(tree, workers):
+  extensions, sources = _stats(tree, max_depth=1, max_entries=5, workers=workers)
+  # 超出条目上限与 max_depth 的文件只参与统计，折叠的目录不参与统计
+  assert extensions['.txt'] == (30, sum(range(30)))
+  assert str(tree / 'pkg' / 'sub' / 'deep' / 'deeper' / 'leaf.py') in sources
+  assert '.js' not in extensions and '.bin' not in extensions
+  assert extensions == _stats(tree)[0]
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason='需要符号链接')
+def test_stats_do_not_follow_directory_symlinks(tree):
+  expected = _stats(tree, workers=4)
+  try:
+    os.symlink(tree / 'pkg', tree / 'pkg-link', target_is_directory=True)
+  except OSError:
+    pytest.skip('无法创建符号链接')
+  assert _stats(tree) == expected
+  assert _stats(tree, workers=4) == expected
+  # 符号链接的目录仍然出现在结构树中
+  assert 'pkg-link' in _walk(tree, workers=4).names()
+
+
+@pytest.mark.parametrize('sample', ['config.yaml', 'generated'])
+def test_sample_configs_list_default_collapse_patterns(tmp_path, sample):
+  yaml = pytest.importorskip('yaml')
+  path = Path(__file__).resolve().parent.parent / 'config.yaml'
+  if sample == 'generated':
+    path = tmp_path / 'config.yaml'
+    TemplateManager.create_default_config(str(path))
+  data = yaml.safe_load(path.read_text(encoding='utf-8'))
+  assert data['structure_collapse'] == DEFAULT_COLLAPSE_PATTERNS
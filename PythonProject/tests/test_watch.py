@@ -0,0 +1,58 @@
+"""
+监视模式的失效规则测试
+"""
+
+import logging
+import os
+
+import pytest
+
+from readme_generator import watch
+from readme_generator.core import ReadmeGenerator
+from readme_generator.utils import is_subpath
+
+
+def test_generated_files_are_ignored(project, make_config):
+  generator = ReadmeGenerator(make_config(cache_dir=str(project / '.readme_cache')))
+  generator.generate()
+  readme = str(project / 'README.md')
+  tmp = str(project / '.README.md.k3j2x9.tmp')
+  changes = [('created', tmp), ('modified', tmp), ('deleted', tmp), ('created', readme),
+             ('deleted', readme), ('modified', readme),
+             ('created', str(project / '.readme_cache' / 'tree' / 'ab.json'))]
+  assert generator.invalidate(changes) == set()
+
+
+def test_project_changes_are_not_ignored(project, make_config):
+  generator = ReadmeGenerator(make_config(cache_dir=str(project / '.readme_cache')))
+  generator.generate()
+  # 名称以输出文件或缓存目录开头的其他文件仍然有效
+  assert generator.invalidate([('created', str(project / 'README.md.bak'))]) == {'tree'}
+  assert generator.invalidate([('created', str(project / '.readme_cache2' / 'x.py'))
+                              ]) == {'tree', 'api'}
+
+
+@pytest.mark.parametrize('available, use_events, message', [
+    (True, True, '使用 watchdog 文件系统事件监视项目'),
+    (True, False, '使用轮询监视项目'),
+    (False, True, '未安装 watchdog，使用轮询监视项目'),
+])
+def test_watcher_logs_backend(project, make_config, monkeypatch, caplog, available, use_events,
+                              message):
+  monkeypatch.setattr(watch, 'WATCHDOG_AVAILABLE', available)
+  monkeypatch.setattr(watch, '_EventSource', lambda root, extra: 'events')
+  watcher = watch.ProjectWatcher(ReadmeGenerator(make_config()), use_events=use_events)
+  with caplog.at_level(logging.INFO, logger=watch.__name__):
+    source = watcher._open_source()
+  assert (source == 'events') == (available and use_events)
+  assert caplog.records[-1].getMessage().startswith(message)
+  assert ('readme-generator[watch]' in caplog.text) == (not available)
+
+
+def test_is_subpath():
+  root = os.path.join(os.sep, 'work', 'project')
+  assert is_subpath(root, root)
+  assert is_subpath(os.path.join(root, 'templates'), root)
+  assert is_subpath(os.path.join(root, 'templates'), root + os.sep)
+  assert not is_subpath(root + '-templates', root)
+  assert not is_subpath(os.path.dirname(root), root)
@@ -16,6 +16,12 @@ OLLAMA_MODEL="qwen3:8b"
 OUTPUT_FILE=""
 LANGUAGE="english" # 默认英文在前
 FORCE=false        # 默认不强制重新生成
+LLM_CACHE_ARGS=()  # 生成结果缓存选项 (--no-cache / --refresh)
+TIMING_ARGS=()     # 耗时统计选项 (--timings)
+
+# Python 工具入口（readme-gen analyze / llm）
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+README_GEN="$SCRIPT_DIR/PythonProject/main.py"
 
 # 颜色定义
 RED='\033[0;31m'
@@ -111,6 +117,10 @@ show_help() {
   echo "  -o, --output   指定输出文件路径 (默认: <目标文件夹>/README.md)"
   echo "  -l, --lang     指定默认显示语言 (english/chinese, 默认: english)"
   echo "  -f, --force    强制重新生成，忽略现有 README 文件"
+  echo "      --no-cache 不使用生成结果缓存"
+  echo "      --refresh  忽略已缓存的生成结果，重新请求 Ollama 并更新缓存"
+  echo "      --timings  输出各阶段 (分析、生成) 的耗时汇总"
+  echo "      --trace    将各阶段耗时写入 Chrome trace 文件 (多个阶段合并到同一文件)"
   echo ""
   echo "注意: 无论选择哪种语言，都会生成包含中英文双语版本的 README 文件"
   echo "      指定的语言将作为默认显示在前面的版本"
@@ -183,6 +193,25 @@ parse_arguments() {
       FORCE=true
       shift
       ;;
+    --no-cache | --refresh)
+      LLM_CACHE_ARGS+=("$1")
+      shift
+      ;;
+    --timings)
+      TIMING_ARGS+=("$1")
+      shift
+      ;;
+    --trace)
+      if [[ -z "$2" ]]; then
+        log_error "选项 --trace 需要参数"
+        exit 1
+      fi
+      # 各个 Python 命令把事件追加到同一个 trace 文件
+      rm -f "$2"
+      README_GEN_TRACE="$(cd "$(dirname "$2")" && pwd)/$(basename "$2")"
+      export README_GEN_TRACE
+      shift 2
+      ;;
     -*)
       log_error "未知选项: $1"
       show_help
@@ -502,37 +531,11 @@ analyze_languages() {
   rm -f "$temp_files" 2>/dev/null || true
 }
 
-# 分析项目信息
-analyze_project() {
+# 分析项目信息的备用方法（没有 python3 时使用 shell 命令收集）
+analyze_project_fallback() {
   local dir="$1"
-  local project_name
-  project_name=$(basename "$dir")
-
-  # 将日志输出重定向到 stderr，确保只有文件路径输出到 stdout
-  {
-    log_info "分析项目: $project_name"
-    log_info "路径: $dir"
-  } >&2
-
-  # 临时禁用自动清理，防止文件被过早删除
-  CLEANUP_ENABLED=false
-
-  # 创建分析报告（使用安全的临时文件）
-  local temp_analysis_file
-  temp_analysis_file=$(create_temp_file "project_analysis" ".txt")
-
-  # 调试信息：显示临时文件路径
-  {
-    log_info "临时分析文件: $temp_analysis_file"
-  } >&2
-
-  # 确保临时文件创建成功
-  if [[ ! -f "$temp_analysis_file" ]]; then
-    {
-      log_error "无法创建临时分析文件: $temp_analysis_file"
-    } >&2
-    return 1
-  fi
+  local project_name="$2"
+  local output_file="$3"
 
   # 分别获取各部分内容，使用更安全的方式
   local directory_structure file_types important_files languages
@@ -575,10 +578,60 @@ analyze_project() {
     printf "%s\n\n" "$file_types"
     printf "%s\n\n" "$important_files"
     printf "%s\n\n" "$languages"
-  } >"$temp_analysis_file" 2>/dev/null; then
+  } >"$output_file" 2>/dev/null; then
     {
       log_error "写入分析报告失败"
     } >&2
+    return 1
+  fi
+}
+
+# 分析项目信息
+analyze_project() {
+  local dir="$1"
+  local project_name
+  project_name=$(basename "$dir")
+
+  # 将日志输出重定向到 stderr，确保只有文件路径输出到 stdout
+  {
+    log_info "分析项目: $project_name"
+    log_info "路径: $dir"
+  } >&2
+
+  # 临时禁用自动清理，防止文件被过早删除
+  CLEANUP_ENABLED=false
+
+  # 创建分析报告（使用安全的临时文件）
+  local temp_analysis_file
+  temp_analysis_file=$(create_temp_file "project_analysis" ".txt")
+
+  # 调试信息：显示临时文件路径
+  {
+    log_info "临时分析文件: $temp_analysis_file"
+  } >&2
+
+  # 确保临时文件创建成功
+  if [[ ! -f "$temp_analysis_file" ]]; then
+    {
+      log_error "无法创建临时分析文件: $temp_analysis_file"
+    } >&2
+    return 1
+  fi
+
+  # 优先使用 Python 分析工具：一次遍历生成全部内容，不调用 find/tree/sort 等命令
+  if command -v python3 >/dev/null 2>&1 && [[ -f "$README_GEN" ]]; then
+    {
+      log_info "使用 readme-gen analyze 收集项目信息..."
+    } >&2
+    if ! python3 "$README_GEN" "${TIMING_ARGS[@]}" analyze "$dir" -o "$temp_analysis_file" >&2; then
+      {
+        log_warn "readme-gen analyze 执行失败，使用备用方法"
+      } >&2
+      : >"$temp_analysis_file"
+    fi
+  fi
+
+  if [[ ! -s "$temp_analysis_file" ]] && ! analyze_project_fallback "$dir" "$project_name" "$temp_analysis_file"; then
     rm -f "$temp_analysis_file" 2>/dev/null || true
     return 1
   fi
@@ -858,6 +911,12 @@ check_existing_readme() {
     if [[ -f "$readme_path" && -r "$readme_path" ]]; then
       log_warn "发现现有 README 文件: $readme_file"
 
+      # 由本工具生成、带有章节标记的 README：增量更新，只重新生成变化的章节
+      if grep -q '^<!-- readme-generator:begin ' "$readme_path" 2>/dev/null; then
+        log_info "README 带有章节标记，将只重新生成分析结果有变化的章节"
+        return 1 # 需要增量更新
+      fi
+
       # 检查文件大小（字节数）
       local file_size
       file_size=$(wc -c <"$readme_path" 2>/dev/null || echo 0)
@@ -1060,6 +1119,25 @@ generate_readme() {
 
   log_info "使用 Ollama 生成双语 README..."
 
+  # 优先使用 Python 客户端：两种语言并发生成，共用保持连接的 HTTP 连接池；
+  # 现有 README 带有章节标记时只重新生成变化的章节，强制模式下完整重新生成
+  if command -v python3 >/dev/null 2>&1 && [[ -f "$README_GEN" ]]; then
+    local llm_args=("${LLM_CACHE_ARGS[@]}")
+    if [[ "$FORCE" == "true" ]]; then
+      llm_args+=(--full)
+    fi
+    if python3 "$README_GEN" "${TIMING_ARGS[@]}" llm "$TARGET_DIR" \
+      --analysis "$analysis_file" \
+      --model "$OLLAMA_MODEL" \
+      --lang "$LANGUAGE" \
+      --output "$OUTPUT_FILE" \
+      "${llm_args[@]}"; then
+      log_success "双语 README 文件已生成: $OUTPUT_FILE"
+      return 0
+    fi
+    log_warn "readme-gen llm 执行失败，使用 ollama 命令逐个生成"
+  fi
+
   local chinese_content english_content final_content
 
   if [[ "$LANGUAGE" == "chinese" ]]; then